@@ -1,23 +1,43 @@
 import os
 import io
 import base64
+import binascii
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import uvicorn
 import structlog
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.formparsers import MultiPartParser
+from starlette.routing import Match
 from pydantic import BaseModel, Field
 import numpy as np
 from PIL import Image
 import cv2
 
-from paddleocr import PaddleOCR, PPStructureV3
-from utils.image_processor import ImageProcessor
-from utils.text_analyzer import TechnicalTextAnalyzer
+import config
+import inference
+from inference import model_registry, decode_image_with_info
+from utils.inference_executor import InferenceExecutor, ExecutorSaturatedError
+from utils.worker_pool import OCRWorkerPool
+from utils.result_cache import ResultCache, create_redis_client
+from utils.job_queue import JobQueue, JobRunner, COMPLETED
+from utils import document_loader
+from utils.image_processor import DESKEW_MODES, ENHANCEMENT_PRESETS
+from utils.image_decoder import ImageTooLargeError
+from utils.roi import ROI_MODES, parse_rois
+from utils.text_analyzer import SPEC_MODES
+from utils.uploads import ImageData, UploadTooLargeError, map_upload, release
+from utils.metrics import CONTENT_TYPE, MetricFamily, MetricsRegistry
+from utils.ocr_backends import available_backends
 
 # Configure structured logging
 structlog.configure(
@@ -58,39 +78,209 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize OCR models
-ocr_models = {}
-image_processor = ImageProcessor()
-text_analyzer = TechnicalTextAnalyzer()
-
-def get_ocr_model(language: str = "en", use_gpu: bool = False) -> PaddleOCR:
-    """Get or create OCR model for specified language."""
-    key = f"{language}_{use_gpu}"
-    if key not in ocr_models:
-        logger.info("Initializing OCR model", language=language, use_gpu=use_gpu)
-        ocr_models[key] = PaddleOCR(
-            use_angle_cls=True,
-            lang=language,
-            use_gpu=use_gpu,
-            show_log=False,
-            use_doc_orientation_classify=True,
-            use_doc_unwarping=True,
-            use_textline_orientation=True
-        )
-    return ocr_models[key]
-
-def get_structure_model(use_gpu: bool = False) -> PPStructureV3:
-    """Get or create PP-StructureV3 model for document parsing."""
-    key = f"structure_{use_gpu}"
-    if key not in ocr_models:
-        logger.info("Initializing PP-StructureV3 model", use_gpu=use_gpu)
-        ocr_models[key] = PPStructureV3(
-            use_doc_orientation_classify=True,
-            use_doc_unwarping=True,
-            use_gpu=use_gpu,
-            show_log=False
+MAX_UPLOAD_BYTES = config.MAX_UPLOAD_MB * 2**20
+MAX_REQUEST_BYTES = config.MAX_REQUEST_MB * 2**20
+UPLOAD_SPOOL_BYTES = config.UPLOAD_SPOOL_MB * 2**20
+
+# Uploaded files roll over from memory to a temporary file above this size.
+# Starlette 0.27 (pinned through FastAPI) calls the setting max_file_size;
+# later releases renamed it to spool_max_size.
+SPOOL_SIZE_ATTRIBUTE = "spool_max_size" if hasattr(MultiPartParser, "spool_max_size") else "max_file_size"
+setattr(MultiPartParser, SPOOL_SIZE_ATTRIBUTE, UPLOAD_SPOOL_BYTES)
+
+class RequestSizeLimitMiddleware:
+    """Reject request bodies larger than ``max_bytes`` with 413.
+
+    A declared Content-Length is checked before the body is read; chunked
+    bodies are counted as they stream in and cut off at the limit.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.max_bytes:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body is above the {self.max_bytes} byte limit"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(RequestSizeLimitMiddleware, max_bytes=MAX_REQUEST_BYTES)
+
+# Prometheus metrics, served on /metrics
+metrics_registry = MetricsRegistry()
+stage_latency = metrics_registry.histogram(
+    "ocr_stage_duration_seconds",
+    "Seconds per pipeline stage: decode, regions, enhance, ocr (detection and recognition), "
+    "structure, spec_extraction and serialize",
+    ("stage", "endpoint", "language", "preset", "backend")
+)
+request_latency = metrics_registry.histogram(
+    "ocr_http_request_duration_seconds",
+    "Seconds from receiving a request to sending the last byte of its response",
+    ("endpoint", "method", "status")
+)
+requests_in_flight = metrics_registry.gauge(
+    "ocr_http_requests_in_flight", "Requests being handled", ("endpoint",)
+)
+image_pixels = metrics_registry.histogram(
+    "ocr_image_pixels",
+    "Pixels of each decoded image or page",
+    ("endpoint",),
+    buckets=(2.5e5, 5e5, 1e6, 2e6, 4e6, 8e6, 16e6, 32e6, 64e6, 128e6)
+)
+upload_bytes = metrics_registry.histogram(
+    "ocr_upload_bytes",
+    "Bytes of each uploaded file",
+    ("endpoint",),
+    buckets=(2**14, 2**16, 2**18, 2**20, 2**22, 2**24, 2**26, 2**28)
+)
+
+class MetricsMiddleware:
+    """Track in-flight requests and time each one, labelled by route template.
+
+    Labels use the route's path template (``/jobs/{job_id}``), so they stay
+    few whatever ids clients send; unknown paths are counted as "other".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = next(
+            (route.path for route in app.routes if route.matches(scope)[0] == Match.FULL), "other"
         )
-    return ocr_models[key]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            with requests_in_flight.track_in_progress(endpoint=endpoint):
+                await self.app(scope, receive, send_with_status)
+        finally:
+            request_latency.observe(
+                time.perf_counter() - start, endpoint=endpoint, method=scope["method"], status=str(status)
+            )
+
+# Added last so it runs first and also sees requests rejected for size
+app.add_middleware(MetricsMiddleware)
+
+inference_executor = InferenceExecutor(
+    # In process-pool mode executor threads only wait on workers, so keep
+    # at least one per worker process
+    max_workers=max(config.INFERENCE_WORKERS, config.WORKER_PROCESSES),
+    max_queue=config.INFERENCE_QUEUE_DEPTH,
+    retry_after=config.INFERENCE_RETRY_AFTER
+)
+
+result_cache = None
+if config.CACHE_ENABLED:
+    result_cache = ResultCache(
+        max_entries=config.CACHE_MAX_ENTRIES,
+        max_bytes=config.CACHE_MAX_MB * 2**20,
+        ttl_seconds=config.CACHE_TTL_SECONDS,
+        redis_client=create_redis_client(config.CACHE_REDIS_URL)
+    )
+
+worker_pool = None
+if config.WORKER_PROCESSES > 0:
+    worker_pool = OCRWorkerPool(
+        num_workers=config.WORKER_PROCESSES,
+        task_module="inference",
+        initializer="preload_models",
+        initargs=(config.WORKER_PRELOAD_LANGUAGES, False, config.WORKER_PRELOAD_STRUCTURE),
+        stats_function="model_stats"
+    )
+
+def collect_runtime_metrics() -> List[MetricFamily]:
+    """Queue, cache and model metrics read from their components' stats at scrape time."""
+    executor = inference_executor.stats()
+    families = [
+        MetricFamily("ocr_inference_queue_depth", "gauge", "Requests waiting for an inference worker",
+                     [({}, executor["queued"])]),
+        MetricFamily("ocr_inference_in_flight", "gauge", "Requests running on an inference worker",
+                     [({}, executor["in_flight"])]),
+        MetricFamily("ocr_inference_rejected_total", "counter", "Requests rejected because the queue was full",
+                     [({}, executor["rejected"])]),
+        MetricFamily("ocr_jobs", "gauge", "Asynchronous jobs by status",
+                     [({"status": status}, count) for status, count in job_queue.stats().items()]),
+    ]
+
+    if worker_pool is not None:
+        workers = worker_pool.stats()["workers"]
+        families.append(MetricFamily(
+            "ocr_worker_pending", "gauge", "Tasks sent to a worker process and not finished yet",
+            [({"worker": str(worker["worker_id"])}, worker["pending"]) for worker in workers]
+        ))
+
+    if result_cache is not None:
+        cache = result_cache.stats()
+        families += [
+            MetricFamily("ocr_cache_lookups_total", "counter", "Result cache lookups by outcome", [
+                ({"result": "local_hit"}, cache["local_hits"]),
+                ({"result": "shared_hit"}, cache["shared_hits"]),
+                ({"result": "miss"}, cache["misses"]),
+            ]),
+            MetricFamily("ocr_cache_hit_ratio", "gauge", "Share of result cache lookups that hit either tier",
+                         [({}, cache["hit_rate"])]),
+            MetricFamily("ocr_cache_bytes", "gauge", "Bytes held by the in-process cache tier",
+                         [({}, cache["bytes"])]),
+        ]
+
+    # Every process has its own model registry: this one ("api") and, with
+    # worker processes, each worker's as reported with its last finished task
+    registries = [("api", model_registry.stats())]
+    if worker_pool is not None:
+        registries += [(str(worker["worker_id"]), worker["stats"]) for worker in workers if worker["stats"]]
+    families += [
+        MetricFamily("ocr_model_load_seconds", "gauge", "Seconds each resident model took to load", [
+            ({"process": process, "model": key}, model["load_time"])
+            for process, models in registries for key, model in models["models"].items()
+        ]),
+        MetricFamily("ocr_model_resident_bytes", "gauge", "Estimated memory of resident models",
+                     [({"process": process}, models["resident_bytes"]) for process, models in registries]),
+        MetricFamily("ocr_model_lookups_total", "counter", "Model registry lookups by outcome", [
+            ({"process": process, "result": result}, models[field])
+            for process, models in registries for result, field in (("hit", "hits"), ("miss", "misses"))
+        ]),
+        MetricFamily("ocr_model_evictions_total", "counter", "Models evicted to stay under the memory budget",
+                     [({"process": process}, models["evictions"]) for process, models in registries]),
+    ]
+    return families
+
+metrics_registry.add_collector(collect_runtime_metrics)
+
+TILE_MODES = ("auto", "on", "off")
+# OCR engines installed on this node; requests may pick any of them
+AVAILABLE_BACKENDS = tuple(available_backends(config.ONNX_MODEL_DIR, allow_stub=config.STUB_BACKEND_ENABLED))
 
 # Pydantic models
 class OCRRequest(BaseModel):
@@ -103,15 +293,33 @@ class OCRResult(BaseModel):
     text: str = Field(..., description="Extracted text")
     confidence: float = Field(..., description="Average confidence score")
     bounding_boxes: List[Dict[str, Any]] = Field(..., description="Text bounding boxes with coordinates")
-    technical_specs: Optional[Dict[str, Any]] = Field(None, description="Extracted technical specifications")
+    technical_specs: Optional[Dict[str, Any]] = Field(None, description="Extracted technical specifications; in layout spec mode with the source box indices of each entry")
     processing_time: float = Field(..., description="Processing time in seconds")
+    cached: bool = Field(default=False, description="Whether the result was served from the result cache")
+    preprocessing: Optional[Dict[str, Any]] = Field(None, description="Enhancement steps that ran, with timings in ms")
+    decode: Optional[Dict[str, Any]] = Field(None, description="Decoder used, decode time in ms and peak decode buffer bytes")
+    regions: Optional[List[Dict[str, Any]]] = Field(None, description="Regions OCR'd in ROI mode, with their text; empty if none were found")
+    backend: Optional[str] = Field(None, description="OCR engine that produced the result")
 
 class StructureResult(BaseModel):
     markdown: str = Field(..., description="Document structure as markdown")
     layout_elements: List[Dict[str, Any]] = Field(..., description="Detected layout elements")
     tables: List[Dict[str, Any]] = Field(default_factory=list, description="Extracted tables")
+    decode: Optional[Dict[str, Any]] = Field(None, description="Decoder used, decode time in ms and peak decode buffer bytes")
     processing_time: float = Field(..., description="Processing time in seconds")
 
+class JobStatusResponse(BaseModel):
+    job_id: str = Field(..., description="Job identifier")
+    kind: str = Field(..., description="Job type: extract or structure")
+    status: str = Field(..., description="queued, running, completed, failed or cancelled")
+    priority: int = Field(..., description="Job priority; higher runs first")
+    progress: float = Field(..., description="Progress from 0.0 to 1.0")
+    message: Optional[str] = Field(None, description="Current processing step")
+    error: Optional[str] = Field(None, description="Failure reason")
+    created_at: float = Field(..., description="Submission time (unix seconds)")
+    started_at: Optional[float] = Field(None, description="Start time (unix seconds)")
+    finished_at: Optional[float] = Field(None, description="Completion time (unix seconds)")
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     models_loaded: List[str] = Field(..., description="Loaded OCR models")
@@ -119,12 +327,377 @@ class HealthResponse(BaseModel):
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        models_loaded=list(ocr_models.keys()),
+    """Health check endpoint. Returns 503 until start-up model warm-up has finished."""
+    if worker_pool is not None:
+        ready = worker_pool.ready
+        models_loaded = sorted({
+            key for worker in worker_pool.stats()["workers"] for key in (worker["preloaded"] or [])
+        })
+    else:
+        ready = model_registry.ready
+        models_loaded = model_registry.keys()
+
+    response = HealthResponse(
+        status="healthy" if ready else "warming_up",
+        models_loaded=models_loaded,
         version="1.0.0"
     )
+    if not ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
+
+@app.get("/stats")
+async def get_stats():
+    """Runtime statistics for the inference executor, model registry, result cache, jobs and worker processes."""
+    stats = {
+        "executor": inference_executor.stats(),
+        "models": model_registry.stats(),
+        "backends": {"default": inference.DEFAULT_BACKEND, "available": list(AVAILABLE_BACKENDS)}
+    }
+    if result_cache is not None:
+        stats["cache"] = result_cache.stats()
+    stats["jobs"] = await asyncio.to_thread(job_queue.stats)
+    if worker_pool is not None:
+        stats["worker_pool"] = worker_pool.stats()
+    return stats
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: per-stage latency, image sizes, queues, in-flight requests, cache and models."""
+    return Response(content=await asyncio.to_thread(metrics_registry.render), media_type=CONTENT_TYPE)
+
+def stage_labels(endpoint: str, options: Dict[str, Any]) -> Dict[str, str]:
+    """Metric labels of a request's stages; language, preset and backend are empty where they do not apply."""
+    preset = options.get("enhance_preset", "") if options.get("enhance_image", True) else "none"
+    return {
+        "endpoint": endpoint,
+        "language": options.get("language", ""),
+        "preset": preset,
+        "backend": options.get("backend") or ""
+    }
+
+def observe_stages(labels: Dict[str, str], timings: Dict[str, float]) -> None:
+    """Record stage timings (seconds by stage name) in the stage latency histogram."""
+    for stage, seconds in timings.items():
+        stage_latency.observe(seconds, stage=stage, **labels)
+
+def json_response(content: Any, labels: Dict[str, str]) -> Response:
+    """Serialize a response body once, timed as the "serialize" stage."""
+    with stage_latency.time(stage="serialize", **labels):
+        body = content.model_dump_json() if isinstance(content, BaseModel) else json.dumps(content)
+    return Response(content=body, media_type="application/json")
+
+async def map_upload_file(file: UploadFile) -> ImageData:
+    """Map an uploaded file for decoding, enforcing the per-file size cap."""
+    try:
+        return await asyncio.to_thread(map_upload, file.file, MAX_UPLOAD_BYTES, UPLOAD_SPOOL_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=f"{file.filename}: {e}")
+
+async def read_image_data(file: Optional[UploadFile], image_base64: Optional[str]) -> ImageData:
+    """
+    Get raw image data from an upload or a base64 string.
+
+    Large uploads come back memory-mapped from their spooled temporary file
+    rather than read into memory; callers hand the data to ``release`` once
+    it is no longer needed.
+    """
+    if file:
+        return await map_upload_file(file)
+    if image_base64:
+        try:
+            encoded = image_base64.encode("ascii")
+        except UnicodeEncodeError:
+            raise HTTPException(status_code=400, detail="image_base64 is not valid base64")
+        start = 0
+        if encoded.startswith(b"data:"):
+            # Skip the data URL prefix by slicing a view rather than copying the payload
+            start = encoded.find(b",") + 1
+            if not start:
+                raise HTTPException(status_code=400, detail="Malformed data URL: no comma before the image data")
+        if (len(encoded) - start) // 4 * 3 > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Image is above the {MAX_UPLOAD_BYTES} byte limit per file")
+        try:
+            return base64.b64decode(memoryview(encoded)[start:])
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="image_base64 is not valid base64")
+    raise HTTPException(status_code=400, detail="No image provided")
+
+def validate_choice(name: str, value: str, choices: Tuple[str, ...]) -> str:
+    """Reject form values outside a fixed set of options."""
+    if value not in choices:
+        raise HTTPException(status_code=400, detail=f"{name} must be one of: {', '.join(choices)}")
+    return value
+
+def parse_backend_field(backend: Optional[str]) -> str:
+    """The OCR engine a request asked for, or the deployment default; 400 if it is not available here."""
+    if not backend:
+        return inference.DEFAULT_BACKEND
+    return validate_choice("backend", backend, AVAILABLE_BACKENDS)
+
+def parse_rois_field(rois: Optional[str]) -> Optional[List[Any]]:
+    """Parse the JSON ``rois`` form field, rejecting malformed regions before any decoding."""
+    if not rois:
+        return None
+    try:
+        parsed = json.loads(rois)
+        parse_rois(parsed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rois: {e}")
+    return parsed
+
+def capacity_exceeded(error: ExecutorSaturatedError) -> HTTPException:
+    logger.warning("Inference executor saturated", retry_after=error.retry_after, **inference_executor.stats())
+    return HTTPException(
+        status_code=503,
+        detail="OCR service is at capacity, please retry later",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+async def run_inference(func, *args, **kwargs):
+    """Run blocking OCR work on the inference executor, shedding load when it is full."""
+    try:
+        return await inference_executor.run(func, *args, **kwargs)
+    except ExecutorSaturatedError as e:
+        raise capacity_exceeded(e)
+
+def stream_pages(image_data: ImageData, task_name: str, dpi: int, **options) -> StreamingResponse:
+    """
+    Process the pages of a PDF/TIFF in parallel and stream one NDJSON line per page.
+
+    Pages are rasterized only when a processing slot frees up, at most
+    ``config.PAGE_CONCURRENCY`` at a time, and each line is sent as soon as
+    its page finishes, so memory stays at a few pages. The last line is a
+    summary. ``options`` go to :func:`run_task`, including the ``endpoint``
+    metrics are recorded under.
+    """
+    start_time = time.time()
+    labels = stage_labels(options.get("endpoint", ""), options)
+
+    # Admit the request as a whole; its pages then bypass the queue limit
+    try:
+        inference_executor.ensure_capacity()
+    except ExecutorSaturatedError as e:
+        raise capacity_exceeded(e)
+
+    async def process(index: int, page: np.ndarray) -> Dict[str, Any]:
+        try:
+            result = await inference_executor.run_admitted(run_task, task_name, page, **options)
+            return {"page": index, "status": "success", "result": result}
+        except Exception as e:
+            logger.error("Page processing failed", page=index, error=str(e))
+            return {"page": index, "status": "failed", "error": str(e)}
+
+    async def generate():
+        pages = document_loader.iter_pages(image_data, dpi=dpi, max_pixels=config.MAX_IMAGE_PIXELS)
+        pending = set()
+        exhausted = False
+        processed = 0
+        failed = 0
+        try:
+            while True:
+                while not exhausted and len(pending) < config.PAGE_CONCURRENCY:
+                    try:
+                        rasterize_start = time.perf_counter()
+                        item = await asyncio.to_thread(next, pages, None)
+                        if item is not None:
+                            observe_stages(labels, {"decode": time.perf_counter() - rasterize_start})
+                    except Exception as e:
+                        logger.error("Page rasterization failed", error=str(e))
+                        yield (json.dumps({"page": processed, "status": "failed", "error": str(e)}) + "\n").encode()
+                        failed += 1
+                        item = None
+                    if item is None:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(process(*item)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    line = task.result()
+                    processed += 1
+                    failed += line["status"] == "failed"
+                    with stage_latency.time(stage="serialize", **labels):
+                        encoded = (json.dumps(line) + "\n").encode()
+                    yield encoded
+
+            summary = {"pages": processed, "failed": failed, "processing_time": time.time() - start_time}
+            logger.info("Document processing completed", task=task_name, **summary)
+            yield (json.dumps({"summary": summary}) + "\n").encode()
+        finally:
+            for task in pending:
+                task.cancel()
+            pages.close()
+            release(image_data)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+def run_task(task_name: str, img_array: np.ndarray, endpoint: str = "", **kwargs) -> Dict[str, Any]:
+    """
+    Run a pipeline task on a worker process if the pool is enabled, else in this thread.
+
+    The image size and the stage timings the task reports are recorded
+    under ``endpoint``; the timings are removed from the result.
+    """
+    image_pixels.observe(img_array.shape[0] * img_array.shape[1], endpoint=endpoint)
+    if worker_pool is not None:
+        result = worker_pool.run(task_name, img_array, **kwargs)
+    else:
+        result = inference.WORKER_TASKS[task_name](img_array, **kwargs)
+    observe_stages(stage_labels(endpoint, kwargs), result.pop("timings", {}))
+    return result
+
+def ocr_image(
+    image_data: ImageData,
+    language: str,
+    enhance_image: bool,
+    extract_technical_info: bool,
+    use_gpu: bool,
+    tile_mode: str = "auto",
+    enhance_preset: str = config.ENHANCE_PRESET,
+    deskew: str = "auto",
+    roi_mode: str = "off",
+    rois: Optional[List[Any]] = None,
+    spec_mode: str = config.SPEC_MODE,
+    dpi: Optional[int] = None,
+    endpoint: str = "/ocr/extract",
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """Decode and OCR a single image. Blocking; run on the inference executor."""
+    img_array, decode_info = decode_image_with_info(image_data, dpi=dpi)
+    logger.info("Image decoded", **decode_info)
+    options = dict(
+        language=language,
+        enhance_image=enhance_image,
+        extract_technical_info=extract_technical_info,
+        use_gpu=use_gpu,
+        tile_mode=tile_mode,
+        enhance_preset=enhance_preset,
+        deskew=deskew,
+        roi_mode=roi_mode,
+        rois=rois,
+        spec_mode=spec_mode,
+        backend=backend or inference.DEFAULT_BACKEND
+    )
+    observe_stages(stage_labels(endpoint, options), {"decode": decode_info["ms"] / 1000})
+    result = run_task("ocr", img_array, endpoint=endpoint, **options)
+    return {**result, "decode": decode_info, "backend": options["backend"]}
+
+def analyze_structure(
+    image_data: ImageData,
+    use_gpu: bool,
+    dpi: Optional[int] = None,
+    endpoint: str = "/ocr/structure"
+) -> Dict[str, Any]:
+    """Decode an image and run document structure analysis. Blocking; run on the inference executor."""
+    img_array, decode_info = decode_image_with_info(image_data, dpi=dpi)
+    logger.info("Image decoded", **decode_info)
+    observe_stages(stage_labels(endpoint, {}), {"decode": decode_info["ms"] / 1000})
+    return {**run_task("structure", img_array, endpoint=endpoint, use_gpu=use_gpu), "decode": decode_info}
+
+def process_batch(
+    files_data: List[Tuple[str, ImageData]],
+    language: str,
+    enhance_image: bool,
+    extract_technical_info: bool,
+    use_gpu: bool,
+    enhance_preset: str = config.ENHANCE_PRESET,
+    spec_mode: str = config.SPEC_MODE,
+    backend: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    OCR several images with batched inference, isolating per-file failures. Blocking; run on the inference executor.
+
+    Files are decoded one chunk of ``config.OCR_BATCH_SIZE`` at a time, right
+    before the chunk is OCR'd, so the decoded pixels held at once stay
+    bounded however many files the batch has.
+    """
+    options = dict(
+        language=language,
+        enhance_image=enhance_image,
+        extract_technical_info=extract_technical_info,
+        use_gpu=use_gpu,
+        enhance_preset=enhance_preset,
+        spec_mode=spec_mode,
+        backend=backend or inference.DEFAULT_BACKEND
+    )
+
+    filenames = [filename for filename, _ in files_data]
+    chunk_size = config.OCR_BATCH_SIZE
+    starts = range(0, len(files_data), chunk_size)
+    labels = stage_labels("/ocr/batch", options)
+
+    def decode_chunk(start: int) -> Tuple[List[Any], List[np.ndarray]]:
+        chunk_outcomes = []
+        for outcome in inference.decode_images_with_info([image_data for _, image_data in files_data[start:start + chunk_size]]):
+            if not isinstance(outcome, Exception):
+                img_array, decode_info = outcome
+                observe_stages(labels, {"decode": decode_info["ms"] / 1000})
+                image_pixels.observe(img_array.shape[0] * img_array.shape[1], endpoint="/ocr/batch")
+                outcome = img_array
+            chunk_outcomes.append(outcome)
+        return chunk_outcomes, [outcome for outcome in chunk_outcomes if not isinstance(outcome, Exception)]
+
+    def merge(chunk_outcomes: List[Any], ocr_results: List[Dict[str, Any]]) -> List[Any]:
+        # OCR results line up with the images that decoded
+        ocr_results = iter(ocr_results)
+        return [outcome if isinstance(outcome, Exception) else next(ocr_results) for outcome in chunk_outcomes]
+
+    outcomes: List[Any] = []
+    if worker_pool is not None:
+        # Spread chunks across the worker processes, decoding the next chunk
+        # only when a worker can take it
+        in_flight = deque()
+
+        def collect() -> None:
+            chunk_outcomes, image_count, future = in_flight.popleft()
+            try:
+                ocr_results = future.result() if future is not None else []
+            except Exception as e:
+                ocr_results = [{"error": str(e)} for _ in range(image_count)]
+            outcomes.extend(merge(chunk_outcomes, ocr_results))
+
+        for start in starts:
+            if len(in_flight) >= config.WORKER_PROCESSES:
+                collect()
+            chunk_outcomes, images = decode_chunk(start)
+            future = worker_pool.submit("ocr_batch", images, **options) if images else None
+            in_flight.append((chunk_outcomes, len(images), future))
+            del images
+        while in_flight:
+            collect()
+    else:
+        for start in starts:
+            chunk_outcomes, images = decode_chunk(start)
+            outcomes.extend(merge(chunk_outcomes, inference.ocr_batch(images, **options) if images else []))
+
+    results = []
+    for filename, outcome in zip(filenames, outcomes):
+        if isinstance(outcome, Exception) or "error" in outcome:
+            error = str(outcome) if isinstance(outcome, Exception) else outcome["error"]
+            logger.error("Batch processing failed for file", filename=filename, error=error)
+            results.append({
+                "filename": filename,
+                "error": error,
+                "status": "failed"
+            })
+            continue
+
+        observe_stages(labels, outcome.get("timings", {}))
+        results.append({
+            "filename": filename,
+            "text": outcome["text"],
+            "confidence": outcome["confidence"],
+            "technical_specs": outcome["technical_specs"],
+            "preprocessing": outcome.get("preprocessing"),
+            "backend": options["backend"],
+            "status": "success"
+        })
+
+    return results
 
 @app.post("/ocr/extract", response_model=OCRResult)
 async def extract_text(
@@ -133,186 +706,137 @@ async def extract_text(
     language: str = Form("en"),
     enhance_image: bool = Form(True),
     extract_technical_info: bool = Form(True),
-    use_gpu: bool = Form(False)
+    use_gpu: bool = Form(False),
+    tile_mode: str = Form("auto", description="Tiled OCR for large drawings: auto, on or off"),
+    enhance_preset: str = Form(config.ENHANCE_PRESET, description="Enhancement preset: none, fast, balanced, quality or auto"),
+    deskew: str = Form("auto", description="Skew correction: auto (decided by the auto preset), on or off"),
+    roi_mode: str = Form("off", description="OCR only title block and tables: off, auto (line-grid heuristic) or layout (layout model)"),
+    rois: Optional[str] = Form(None, description='Explicit regions as JSON, e.g. [[x_min, y_min, x_max, y_max]] in pixels or 0-1 fractions'),
+    spec_mode: str = Form(config.SPEC_MODE, description="Specification extraction: text (whole page) or layout (per cluster of nearby lines, with source boxes)"),
+    backend: Optional[str] = Form(None, description="OCR engine: paddle or onnx (stub where enabled); by default the deployment's OCR_BACKEND"),
+    dpi: int = Form(config.PDF_DPI, description="Rasterization DPI for PDF pages"),
+    stream: bool = Form(False, description="Stream per-page NDJSON even for single-page input")
 ):
-    """Extract text from uploaded image or base64 data."""
-    import time
+    """Extract text from an uploaded image or base64 data.
+
+    Multi-page PDF and TIFF input is answered with NDJSON, one line per page.
+    """
     start_time = time.time()
+    image_data = None
+    streaming = False
     
     try:
-        # Get image data
-        if file:
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-        elif image_base64:
-            # Remove data URL prefix if present
-            if image_base64.startswith('data:image'):
-                image_base64 = image_base64.split(',')[1]
-            image_data = base64.b64decode(image_base64)
-            image = Image.open(io.BytesIO(image_data))
-        else:
-            raise HTTPException(status_code=400, detail="No image provided")
-
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Convert PIL image to numpy array
-        img_array = np.array(image)
-        
-        # Apply image enhancement if requested
-        if enhance_image:
-            img_array = image_processor.enhance_technical_drawing(img_array)
-        
-        # Get OCR model
-        ocr = get_ocr_model(language=language, use_gpu=use_gpu)
-        
-        # Perform OCR
-        logger.info("Starting OCR processing", language=language, enhance_image=enhance_image)
-        result = ocr.predict(img_array)
-        
-        # Process results
-        extracted_text = []
-        bounding_boxes = []
-        confidences = []
-        
-        for res in result:
-            if hasattr(res, 'rec_texts') and hasattr(res, 'rec_scores') and hasattr(res, 'dt_polys'):
-                for text, score, poly in zip(res.rec_texts, res.rec_scores, res.dt_polys):
-                    if text.strip():  # Only include non-empty text
-                        extracted_text.append(text)
-                        confidences.append(float(score))
-                        
-                        # Convert polygon to bounding box
-                        x_coords = [point[0] for point in poly]
-                        y_coords = [point[1] for point in poly]
-                        bbox = {
-                            "text": text,
-                            "confidence": float(score),
-                            "coordinates": {
-                                "x_min": int(min(x_coords)),
-                                "y_min": int(min(y_coords)),
-                                "x_max": int(max(x_coords)),
-                                "y_max": int(max(y_coords))
-                            },
-                            "polygon": [[int(point[0]), int(point[1])] for point in poly]
-                        }
-                        bounding_boxes.append(bbox)
-        
-        # Calculate average confidence
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-        
-        # Join all text
-        full_text = " ".join(extracted_text)
-        
-        # Extract technical specifications if requested
-        technical_specs = None
-        if extract_technical_info and full_text:
-            technical_specs = text_analyzer.extract_technical_specifications(full_text)
+        image_data = await read_image_data(file, image_base64)
+        upload_bytes.observe(len(image_data), endpoint="/ocr/extract")
+        options = dict(
+            language=language,
+            enhance_image=enhance_image,
+            extract_technical_info=extract_technical_info,
+            tile_mode=validate_choice("tile_mode", tile_mode, TILE_MODES),
+            enhance_preset=validate_choice("enhance_preset", enhance_preset, ENHANCEMENT_PRESETS),
+            deskew=validate_choice("deskew", deskew, DESKEW_MODES),
+            roi_mode=validate_choice("roi_mode", roi_mode, ROI_MODES),
+            rois=parse_rois_field(rois),
+            spec_mode=validate_choice("spec_mode", spec_mode, SPEC_MODES),
+            backend=parse_backend_field(backend)
+        )
+
+        page_count = await asyncio.to_thread(document_loader.count_pages, image_data)
+        if page_count > 1 or stream:
+            # The stream releases the upload once its last page is done
+            streaming = True
+            return stream_pages(image_data, "ocr", dpi, endpoint="/ocr/extract", use_gpu=use_gpu, **options)
+
+        # Cache lookups hash the whole upload, so keep them off the event loop too
+        cache_key = None
+        if result_cache is not None:
+            cache_key = await asyncio.to_thread(ResultCache.make_key, image_data, dpi=dpi, **options)
+            cached_result = await asyncio.to_thread(result_cache.get, cache_key)
+            if cached_result is not None:
+                logger.info("OCR result served from cache", cache_key=cache_key)
+                return json_response(
+                    OCRResult(processing_time=time.time() - start_time, cached=True, **cached_result),
+                    stage_labels("/ocr/extract", options)
+                )
+
+        ocr_result = await run_inference(ocr_image, image_data, use_gpu=use_gpu, dpi=dpi, **options)
+
+        if result_cache is not None:
+            # Decode stats describe this request only
+            cacheable = {key: value for key, value in ocr_result.items() if key != "decode"}
+            await asyncio.to_thread(result_cache.set, cache_key, cacheable)
         
         processing_time = time.time() - start_time
         
         logger.info(
             "OCR processing completed",
-            text_length=len(full_text),
-            confidence=avg_confidence,
+            text_length=len(ocr_result["text"]),
+            confidence=ocr_result["confidence"],
             processing_time=processing_time
         )
         
-        return OCRResult(
-            text=full_text,
-            confidence=avg_confidence,
-            bounding_boxes=bounding_boxes,
-            technical_specs=technical_specs,
-            processing_time=processing_time
-        )
+        return json_response(OCRResult(processing_time=processing_time, **ocr_result), stage_labels("/ocr/extract", options))
         
+    except HTTPException:
+        raise
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error("OCR processing failed", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"OCR processing failed: {str(e)}")
+    finally:
+        if image_data is not None and not streaming:
+            release(image_data)
 
 @app.post("/ocr/structure", response_model=StructureResult)
 async def extract_structure(
     file: Optional[UploadFile] = File(None),
     image_base64: Optional[str] = Form(None),
-    use_gpu: bool = Form(False)
+    use_gpu: bool = Form(False),
+    dpi: int = Form(config.PDF_DPI, description="Rasterization DPI for PDF pages"),
+    stream: bool = Form(False, description="Stream per-page NDJSON even for single-page input")
 ):
-    """Extract document structure using PP-StructureV3."""
-    import time
+    """Extract document structure using PP-StructureV3.
+
+    Multi-page PDF and TIFF input is answered with NDJSON, one line per page.
+    """
     start_time = time.time()
+    image_data = None
+    streaming = False
     
     try:
-        # Get image data
-        if file:
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-        elif image_base64:
-            if image_base64.startswith('data:image'):
-                image_base64 = image_base64.split(',')[1]
-            image_data = base64.b64decode(image_base64)
-            image = Image.open(io.BytesIO(image_data))
-        else:
-            raise HTTPException(status_code=400, detail="No image provided")
-
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Convert PIL image to numpy array
-        img_array = np.array(image)
-        
-        # Get structure model
-        structure_model = get_structure_model(use_gpu=use_gpu)
-        
-        # Perform structure analysis
-        logger.info("Starting structure analysis")
-        result = structure_model.predict(img_array)
-        
-        # Process results
-        markdown_content = ""
-        layout_elements = []
-        tables = []
-        
-        for res in result:
-            if hasattr(res, 'save_to_markdown'):
-                # Save markdown to string
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as tmp:
-                    res.save_to_markdown(tmp.name)
-                    with open(tmp.name, 'r', encoding='utf-8') as f:
-                        markdown_content = f.read()
-                    os.unlink(tmp.name)
-            
-            # Extract layout information if available
-            if hasattr(res, 'layout_det_res') and res.layout_det_res:
-                layout_info = res.layout_det_res
-                if hasattr(layout_info, 'boxes'):
-                    for box in layout_info.boxes:
-                        element = {
-                            "type": box.get("label", "unknown"),
-                            "confidence": box.get("score", 0.0),
-                            "coordinates": box.get("coordinate", [])
-                        }
-                        layout_elements.append(element)
+        image_data = await read_image_data(file, image_base64)
+        upload_bytes.observe(len(image_data), endpoint="/ocr/structure")
+
+        page_count = await asyncio.to_thread(document_loader.count_pages, image_data)
+        if page_count > 1 or stream:
+            streaming = True
+            return stream_pages(image_data, "structure", dpi, endpoint="/ocr/structure", use_gpu=use_gpu)
+
+        structure_result = await run_inference(analyze_structure, image_data, use_gpu=use_gpu, dpi=dpi)
         
         processing_time = time.time() - start_time
         
         logger.info(
             "Structure analysis completed",
-            elements_found=len(layout_elements),
+            elements_found=len(structure_result["layout_elements"]),
             processing_time=processing_time
         )
         
-        return StructureResult(
-            markdown=markdown_content,
-            layout_elements=layout_elements,
-            tables=tables,
-            processing_time=processing_time
+        return json_response(
+            StructureResult(processing_time=processing_time, **structure_result), stage_labels("/ocr/structure", {})
         )
         
+    except HTTPException:
+        raise
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error("Structure analysis failed", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Structure analysis failed: {str(e)}")
+    finally:
+        if image_data is not None and not streaming:
+            release(image_data)
 
 @app.post("/ocr/batch")
 async def batch_process(
@@ -320,63 +844,168 @@ async def batch_process(
     language: str = Form("en"),
     enhance_image: bool = Form(True),
     extract_technical_info: bool = Form(True),
-    use_gpu: bool = Form(False)
+    use_gpu: bool = Form(False),
+    enhance_preset: str = Form(config.ENHANCE_PRESET, description="Enhancement preset: none, fast, balanced, quality or auto"),
+    spec_mode: str = Form(config.SPEC_MODE, description="Specification extraction: text (whole page) or layout (per cluster of nearby lines, with source boxes)"),
+    backend: Optional[str] = Form(None, description="OCR engine: paddle or onnx (stub where enabled); by default the deployment's OCR_BACKEND"),
 ):
-    """Process multiple images in batch."""
-    results = []
-    
-    for file in files:
-        try:
-            # Process each file
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            img_array = np.array(image)
-            
-            if enhance_image:
-                img_array = image_processor.enhance_technical_drawing(img_array)
-            
-            ocr = get_ocr_model(language=language, use_gpu=use_gpu)
-            result = ocr.predict(img_array)
-            
-            # Process results (simplified for batch)
-            extracted_text = []
-            confidences = []
-            
-            for res in result:
-                if hasattr(res, 'rec_texts') and hasattr(res, 'rec_scores'):
-                    for text, score in zip(res.rec_texts, res.rec_scores):
-                        if text.strip():
-                            extracted_text.append(text)
-                            confidences.append(float(score))
-            
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            full_text = " ".join(extracted_text)
-            
-            technical_specs = None
-            if extract_technical_info and full_text:
-                technical_specs = text_analyzer.extract_technical_specifications(full_text)
-            
-            results.append({
-                "filename": file.filename,
-                "text": full_text,
-                "confidence": avg_confidence,
-                "technical_specs": technical_specs,
-                "status": "success"
-            })
-            
-        except Exception as e:
-            logger.error("Batch processing failed for file", filename=file.filename, error=str(e))
-            results.append({
-                "filename": file.filename,
-                "error": str(e),
-                "status": "failed"
-            })
+    """Process multiple images in batch.
+
+    Uploads are mapped from their spooled temporary files and decoded chunk
+    by chunk, so memory use does not grow with the size of the batch.
+    """
+    validate_choice("enhance_preset", enhance_preset, ENHANCEMENT_PRESETS)
+    validate_choice("spec_mode", spec_mode, SPEC_MODES)
+    backend = parse_backend_field(backend)
+    files_data = []
+    try:
+        for file in files:
+            files_data.append((file.filename, await map_upload_file(file)))
+            upload_bytes.observe(len(files_data[-1][1]), endpoint="/ocr/batch")
+
+        # The whole batch occupies a single executor slot
+        results = await run_inference(
+            process_batch,
+            files_data,
+            language=language,
+            enhance_image=enhance_image,
+            extract_technical_info=extract_technical_info,
+            use_gpu=use_gpu,
+            enhance_preset=enhance_preset,
+            spec_mode=spec_mode,
+            backend=backend
+        )
+    finally:
+        for _, image_data in files_data:
+            release(image_data)
     
-    return {"results": results}
+    return json_response({"results": results}, stage_labels("/ocr/batch", {
+        "language": language, "enhance_image": enhance_image, "enhance_preset": enhance_preset, "backend": backend
+    }))
+
+def run_document_job(task_name: str, image_data: bytes, params: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Run a job over every page of its input, reporting progress per page.
+
+    Single images return the plain task result; multi-page documents return
+    ``{"pages": [...]}`` with one entry per page.
+    """
+    params = dict(params)
+    dpi = params.pop("dpi", None) or config.PDF_DPI
+    page_count = document_loader.count_pages(image_data)
+    labels = stage_labels("/jobs", params)
+
+    if page_count == 1:
+        progress(0.1, task_name)
+        img_array, decode_info = decode_image_with_info(image_data, dpi=dpi)
+        observe_stages(labels, {"decode": decode_info["ms"] / 1000})
+        return inference_executor.call_admitted(run_task, task_name, img_array, endpoint="/jobs", **params)
+
+    pages = []
+    decode_start = time.perf_counter()
+    for index, page in document_loader.iter_pages(image_data, dpi=dpi, max_pixels=config.MAX_IMAGE_PIXELS):
+        observe_stages(labels, {"decode": time.perf_counter() - decode_start})
+        progress(index / page_count, f"page {index + 1}/{page_count}")
+        result = inference_executor.call_admitted(run_task, task_name, page, endpoint="/jobs", **params)
+        pages.append({"page": index, **result})
+        decode_start = time.perf_counter()
+    return {"pages": pages}
+
+def run_extract_job(image_data: bytes, params: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Job handler for "extract" jobs."""
+    return run_document_job("ocr", image_data, params, progress)
+
+def run_structure_job(image_data: bytes, params: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Job handler for "structure" jobs."""
+    return run_document_job("structure", image_data, params, progress)
+
+job_queue = JobQueue(config.JOB_DB_PATH, max_attempts=config.JOB_MAX_ATTEMPTS)
+job_runner = JobRunner(
+    job_queue,
+    handlers={"extract": run_extract_job, "structure": run_structure_job},
+    num_workers=config.JOB_WORKERS,
+    retention_seconds=config.JOB_RETENTION_HOURS * 3600
+)
+
+async def get_job_or_404(job_id: str) -> Dict[str, Any]:
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def job_status_response(job: Dict[str, Any]) -> JobStatusResponse:
+    return JobStatusResponse(job_id=job.pop("id"), **{k: v for k, v in job.items() if k != "attempts"})
+
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job(
+    file: Optional[UploadFile] = File(None),
+    image_base64: Optional[str] = Form(None),
+    kind: str = Form("extract"),
+    priority: int = Form(0),
+    language: str = Form("en"),
+    enhance_image: bool = Form(True),
+    extract_technical_info: bool = Form(True),
+    use_gpu: bool = Form(False),
+    tile_mode: str = Form("auto", description="Tiled OCR for large drawings: auto, on or off"),
+    enhance_preset: str = Form(config.ENHANCE_PRESET, description="Enhancement preset: none, fast, balanced, quality or auto"),
+    deskew: str = Form("auto", description="Skew correction: auto (decided by the auto preset), on or off"),
+    roi_mode: str = Form("off", description="OCR only title block and tables: off, auto (line-grid heuristic) or layout (layout model)"),
+    rois: Optional[str] = Form(None, description='Explicit regions as JSON, e.g. [[x_min, y_min, x_max, y_max]] in pixels or 0-1 fractions'),
+    spec_mode: str = Form(config.SPEC_MODE, description="Specification extraction: text (whole page) or layout (per cluster of nearby lines, with source boxes)"),
+    backend: Optional[str] = Form(None, description="OCR engine: paddle or onnx (stub where enabled); by default the deployment's OCR_BACKEND"),
+    dpi: int = Form(config.PDF_DPI, description="Rasterization DPI for PDF pages")
+):
+    """Queue an extract or structure job and return its id immediately."""
+    if kind not in job_runner.handlers:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {kind}")
+
+    if kind == "structure":
+        params = {"use_gpu": use_gpu, "dpi": dpi}
+    else:
+        params = dict(
+            language=language,
+            enhance_image=enhance_image,
+            extract_technical_info=extract_technical_info,
+            use_gpu=use_gpu,
+            tile_mode=validate_choice("tile_mode", tile_mode, TILE_MODES),
+            enhance_preset=validate_choice("enhance_preset", enhance_preset, ENHANCEMENT_PRESETS),
+            deskew=validate_choice("deskew", deskew, DESKEW_MODES),
+            roi_mode=validate_choice("roi_mode", roi_mode, ROI_MODES),
+            rois=parse_rois_field(rois),
+            spec_mode=validate_choice("spec_mode", spec_mode, SPEC_MODES),
+            backend=parse_backend_field(backend),
+            dpi=dpi
+        )
+
+    image_data = await read_image_data(file, image_base64)
+    upload_bytes.observe(len(image_data), endpoint="/jobs")
+    try:
+        # A mapped upload is copied into SQLite straight from the page cache
+        job_id = await asyncio.to_thread(job_queue.submit, kind, image_data, params, priority)
+    finally:
+        release(image_data)
+    logger.info("OCR job submitted", job_id=job_id, kind=kind, priority=priority)
+    return job_status_response(await get_job_or_404(job_id))
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """Poll a job's status and progress."""
+    return job_status_response(await get_job_or_404(job_id))
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Stream a completed job's result as JSON."""
+    job = await get_job_or_404(job_id)
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return StreamingResponse(job_queue.iter_result(job_id), media_type="application/json")
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    await get_job_or_404(job_id)
+    await asyncio.to_thread(job_queue.cancel, job_id)
+    return job_status_response(await get_job_or_404(job_id))
 
 @app.get("/models/languages")
 async def get_supported_languages():
@@ -399,6 +1028,28 @@ async def get_supported_languages():
     }
     return {"supported_languages": languages}
 
+@app.on_event("startup")
+async def warm_up_models():
+    """Start model warm-up: in the worker processes if enabled, otherwise in a background thread."""
+    if worker_pool is not None:
+        worker_pool.start()
+    else:
+        threading.Thread(
+            target=inference.preload_models,
+            args=(config.PRELOAD_LANGUAGES, False, config.PRELOAD_STRUCTURE),
+            name="ocr-model-warmup",
+            daemon=True
+        ).start()
+    job_runner.start()
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Release inference worker threads, job runners and processes on shutdown."""
+    job_runner.stop()
+    inference_executor.shutdown(wait=False)
+    if worker_pool is not None:
+        worker_pool.shutdown()
+
 if __name__ == "__main__":
     # Configure logging
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1 @@
+"""Benchmarks for the OCR service. Run modules from ``services/ocr``, e.g. ``python -m benchmarks.enhancement_presets``."""
@@ -0,0 +1,102 @@
+"""
+Latency and accuracy of the enhancement presets on synthetic drawings.
+
+Latency is measured for each preset at several sheet sizes, on a clean
+render and on a noisy copy of it. Accuracy is
+the F1 score of the ink (text and line) pixels recovered by Otsu
+binarization of the enhanced image against the clean render, plus OCR
+character accuracy against the rendered labels when PaddleOCR is
+installed and ``--ocr`` is given.
+
+Usage (from services/ocr):
+    python -m benchmarks.enhancement_presets [--sizes 1600x1200,4960x3508] [--repeat 3] [--ocr]
+"""
+
+import argparse
+import difflib
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import degrade, render_drawing
+from utils.image_processor import ENHANCEMENT_PRESETS, ImageProcessor
+
+
+def ink_f1(clean_gray: np.ndarray, image_gray: np.ndarray) -> float:
+    """F1 of dark (ink) pixels after Otsu binarization, against the clean render."""
+    truth = clean_gray < 128
+    _, binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    found = binary == 0
+    true_positive = np.count_nonzero(truth & found)
+    if not true_positive:
+        return 0.0
+    precision = true_positive / np.count_nonzero(found)
+    recall = true_positive / np.count_nonzero(truth)
+    return 2 * precision * recall / (precision + recall)
+
+
+def ocr_accuracy(ocr, image: np.ndarray, labels: List[str]) -> float:
+    recognized = []
+    for res in ocr.predict(image):
+        recognized.extend(getattr(res, "rec_texts", []))
+    return difflib.SequenceMatcher(None, " ".join(labels), " ".join(recognized)).ratio()
+
+
+def run(sizes: List[str], repeat: int, with_ocr: bool) -> List[Dict]:
+    processor = ImageProcessor()
+    ocr = None
+    if with_ocr:
+        from paddleocr import PaddleOCR
+        ocr = PaddleOCR(lang="en")
+
+    rows = []
+    for size in sizes:
+        width, height = (int(v) for v in size.split("x"))
+        clean, labels = render_drawing(width, height)
+        clean_gray = cv2.cvtColor(clean, cv2.COLOR_RGB2GRAY)
+
+        for condition, image in (("clean", clean), ("noisy", degrade(clean))):
+            for preset in ENHANCEMENT_PRESETS:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    enhanced = processor.enhance_technical_drawing(image, preset=preset)
+                    timings.append(time.perf_counter() - start)
+                enhanced_gray = cv2.cvtColor(enhanced, cv2.COLOR_RGB2GRAY)
+
+                row = {
+                    "size": size,
+                    "input": condition,
+                    "preset": preset,
+                    "latency_ms": 1000 * min(timings),
+                    "ink_f1": ink_f1(clean_gray, enhanced_gray),
+                }
+                if ocr is not None:
+                    row["ocr_accuracy"] = ocr_accuracy(ocr, enhanced, labels)
+                rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1600x1200,3508x2480", help="Comma-separated WIDTHxHEIGHT sheet sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per preset; the fastest is reported")
+    parser.add_argument("--ocr", action="store_true", help="Also measure OCR accuracy (needs PaddleOCR)")
+    args = parser.parse_args()
+
+    rows = run(args.sizes.split(","), args.repeat, args.ocr)
+    header = f"{'size':>10}  {'input':>6}  {'preset':>9}  {'latency ms':>10}  {'ink F1':>7}"
+    if args.ocr:
+        header += f"  {'OCR acc':>7}"
+    print(header)
+    for row in rows:
+        line = f"{row['size']:>10}  {row['input']:>6}  {row['preset']:>9}  {row['latency_ms']:>10.1f}  {row['ink_f1']:>7.3f}"
+        if "ocr_accuracy" in row:
+            line += f"  {row['ocr_accuracy']:>7.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Measurement, reporting and baselines shared by the benchmark suite.
+
+A benchmark produces named cases, each a flat dict of metrics. Latencies are
+summarised as p50/p95/p99 in milliseconds, throughput as operations (or
+images) per second, and memory as the peak RSS in MiB. A run can be saved as
+a JSON baseline together with the environment it ran in, and a later run
+compared against it: a metric that moved in the wrong direction by more than
+the tolerance is reported as a regression.
+"""
+
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Metrics checked against a baseline; the others (run counts...) describe a case
+COMPARED = ("p50_ms", "p95_ms", "p99_ms", "throughput", "peak_rss_mib")
+# Compared metrics where a larger value is better; for the rest smaller is better
+HIGHER_IS_BETTER = ("throughput",)
+
+Case = Dict[str, float]
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Linearly interpolated percentile of ``values``, ``fraction`` between 0 and 1."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(seconds: Sequence[float]) -> Case:
+    """p50/p95/p99 of latencies given in seconds, in milliseconds."""
+    return {
+        "p50_ms": round(1000 * percentile(seconds, 0.50), 3),
+        "p95_ms": round(1000 * percentile(seconds, 0.95), 3),
+        "p99_ms": round(1000 * percentile(seconds, 0.99), 3),
+    }
+
+
+def peak_rss_mib(pid: Optional[int] = None) -> float:
+    """
+    Peak resident set size of a process in MiB.
+
+    Read from ``VmHWM`` in ``/proc/<pid>/status``; without /proc only the
+    current process can be measured, through ``getrusage``.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    if pid is None or pid == os.getpid():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return round(peak / (2**20 if sys.platform == "darwin" else 1024), 1)
+    return 0.0
+
+
+def reset_peak_rss(pid: Optional[int] = None) -> bool:
+    """
+    Reset the peak RSS of a process to its current RSS, so each case reports its own peak.
+
+    Only Linux supports this; elsewhere peaks carry over between cases.
+
+    Returns:
+        Whether the peak was reset
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def time_calls(function: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Seconds taken by each of ``repeat`` calls of ``function``, after ``warmup`` untimed calls."""
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def environment() -> Dict[str, object]:
+    """What a baseline was recorded on; comparisons across machines are only indicative."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_baseline(path: str, benchmark: str, cases: Dict[str, Case], settings: Dict[str, object]) -> None:
+    """Write a run's cases, settings and environment as a JSON baseline."""
+    baseline = {
+        "benchmark": benchmark,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "settings": settings,
+        "cases": cases,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str, benchmark: str) -> Dict[str, object]:
+    """
+    Read a baseline written by :func:`save_baseline`.
+
+    Raises:
+        ValueError: If the file holds a baseline of another benchmark
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("benchmark") != benchmark:
+        raise ValueError(f"{path} is a baseline for {baseline.get('benchmark')!r}, not {benchmark!r}")
+    return baseline
+
+
+def compare(
+    baseline: Dict[str, Case],
+    current: Dict[str, Case],
+    tolerance: float
+) -> List[Dict[str, object]]:
+    """
+    Compare the metrics of cases present in both runs.
+
+    Args:
+        baseline: Cases of the baseline run
+        current: Cases of this run
+        tolerance: Allowed relative change in the worse direction, e.g. 0.15
+
+    Returns:
+        One row per compared metric with ``case``, ``metric``, both values,
+        the relative ``change`` and whether it is a ``regression``
+    """
+    rows = []
+    for name, metrics in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if metric not in COMPARED or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append({
+                "case": name,
+                "metric": metric,
+                "baseline": old,
+                "current": value,
+                "change": change,
+                "regression": worse > tolerance,
+            })
+    return rows
+
+
+def print_cases(cases: Dict[str, Case], columns: Sequence[str]) -> None:
+    """Print cases as a table with one column per metric."""
+    width = max([len("case")] + [len(name) for name in cases])
+    print(f"{'case':<{width}}  " + "  ".join(f"{column:>10}" for column in columns))
+    for name, metrics in cases.items():
+        values = []
+        for column in columns:
+            value = metrics.get(column)
+            values.append(f"{value:>10.2f}" if isinstance(value, float) else f"{'' if value is None else value:>10}")
+        print(f"{name:<{width}}  " + "  ".join(values))
+
+
+def report_comparison(rows: List[Dict[str, object]], tolerance: float) -> bool:
+    """
+    Print the metrics that changed by more than the tolerance.
+
+    Returns:
+        Whether any metric regressed
+    """
+    changed = [row for row in rows if abs(row["change"]) > tolerance]
+    regressions = [row for row in changed if row["regression"]]
+    print(f"\nCompared {len(rows)} metrics against the baseline (tolerance {tolerance:.0%})")
+    for row in changed:
+        label = "REGRESSION" if row["regression"] else "improved"
+        print(
+            f"  {label:<10}  {row['case']}  {row['metric']}: "
+            f"{row['baseline']:.2f} -> {row['current']:.2f} ({row['change']:+.1%})"
+        )
+    if not changed:
+        print("  No metric changed by more than the tolerance")
+    return bool(regressions)
+
+
+def finish(
+    benchmark: str,
+    cases: Dict[str, Case],
+    settings: Dict[str, object],
+    save: Optional[str],
+    compare_to: Optional[str],
+    tolerance: float
+) -> int:
+    """
+    Save and/or compare a finished run, as selected on the command line.
+
+    Returns:
+        The process exit code: 1 if a metric regressed, otherwise 0
+    """
+    regressed = False
+    if compare_to:
+        baseline = load_baseline(compare_to, benchmark)
+        if baseline.get("settings") != settings:
+            print(f"\nWarning: the baseline was recorded with different settings: {baseline.get('settings')}")
+        regressed = report_comparison(compare(baseline["cases"], cases, tolerance), tolerance)
+    if save:
+        save_baseline(save, benchmark, cases, settings)
+        print(f"\nSaved baseline to {save}")
+    return 1 if regressed else 0
+
+
+def add_baseline_arguments(parser) -> None:
+    """Add the ``--save``, ``--compare`` and ``--tolerance`` options to an argument parser."""
+    parser.add_argument("--save", metavar="PATH", help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with a saved baseline; exits 1 on a regression")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15,
+        help="Relative change in the worse direction that counts as a regression (default 0.15)"
+    )
@@ -0,0 +1,222 @@
+"""
+End-to-end load test of ``/ocr/extract`` and ``/ocr/batch`` against a stub OCR model.
+
+The service runs in a subprocess under uvicorn with the "stub" OCR backend,
+so decoding, enhancement, spec extraction, serialization and the service's
+queues are real while the model's cost is a fixed, configurable sleep. The
+result cache is disabled, so every request reaches the model. Extra
+settings can be passed with ``--env``, e.g. ``--env OCR_INFERENCE_WORKERS=4``
+or ``--env OCR_WORKER_PROCESSES=2``.
+
+For each endpoint and concurrency level a fixed number of requests is sent
+from that many client threads, cycling over synthetic drawings rendered
+from fixed seeds. Each case reports throughput in images per second,
+p50/p95/p99 latency of successful requests, the number of failed requests
+(including 503s from a full inference queue) and the server's peak RSS.
+
+Usage (from services/ocr):
+    python -m benchmarks.load_test [--concurrency 1,4,16] [--requests 64] [--size 1600x1200]
+        [--batch-size 4] [--model-ms 50] [--env KEY=VALUE] [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import requests
+
+from benchmarks import harness
+from benchmarks.synthetic import degrade, render_drawing
+
+COLUMNS = ("throughput", "p50_ms", "p95_ms", "p99_ms", "errors", "peak_rss_mib")
+ENDPOINTS = ("extract", "batch")
+STARTUP_TIMEOUT = 120
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def render_images(size: str, count: int) -> List[bytes]:
+    """PNG-encoded noisy drawings, one per seed."""
+    width, height = (int(v) for v in size.split("x"))
+    images = []
+    for seed in range(count):
+        image = degrade(render_drawing(width, height, seed=seed)[0], seed=seed)
+        images.append(cv2.imencode(".png", cv2.cvtColor(image, cv2.COLOR_RGB2BGR))[1].tobytes())
+    return images
+
+
+class Server:
+    """The service in a subprocess, stopped when the context exits."""
+
+    def __init__(self, args: argparse.Namespace, workdir: str):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.log_path = os.path.join(workdir, "server.log")
+        self.env = {
+            **os.environ,
+            "OCR_BACKEND": "stub",
+            "OCR_STUB_LATENCY_MS": str(args.model_ms),
+            "OCR_STUB_LATENCY_MS_PER_MEGAPIXEL": str(args.model_ms_per_megapixel),
+            "OCR_CACHE_ENABLED": "false",
+            "OCR_PRELOAD_LANGUAGES": "en",
+            "OCR_PRELOAD_STRUCTURE": "false",
+            "OCR_JOB_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        }
+        for setting in args.env:
+            key, _, value = setting.partition("=")
+            self.env[key] = value
+        self.command = [
+            sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(self.port),
+            "--log-level", "warning", "--no-access-log",
+        ]
+        self.process: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "Server":
+        self._log = open(self.log_path, "w")
+        self.process = subprocess.Popen(self.command, env=self.env, stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if requests.get(f"{self.url}/health", timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        with open(self.log_path) as f:
+            log_tail = f.read()[-2000:]
+        raise RuntimeError(f"The OCR service did not become healthy; server log:\n{log_tail}")
+
+    def __exit__(self, *exc_info) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self._log.close()
+
+
+def send(
+    session: requests.Session,
+    url: str,
+    endpoint: str,
+    images: List[Tuple[str, bytes]],
+    form: Dict[str, str]
+) -> Tuple[bool, float]:
+    """Send one request; returns whether it succeeded and how long it took."""
+    if endpoint == "extract":
+        name, data = images[0]
+        files = [("file", (name, data, "image/png"))]
+    else:
+        files = [("files", (name, data, "image/png")) for name, data in images]
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{url}/ocr/{endpoint}", files=files, data=form, timeout=300)
+        ok = response.status_code == 200
+        if ok and endpoint == "batch":
+            ok = all(result["status"] == "success" for result in response.json()["results"])
+    except requests.RequestException:
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def run_case(
+    server: Server,
+    endpoint: str,
+    concurrency: int,
+    total: int,
+    images: List[bytes],
+    batch_size: int,
+    form: Dict[str, str]
+) -> harness.Case:
+    """Send ``total`` requests from ``concurrency`` threads and summarize them."""
+    per_request = 1 if endpoint == "extract" else batch_size
+    payloads = [
+        [(f"drawing-{(i * per_request + j) % len(images)}.png", images[(i * per_request + j) % len(images)])
+         for j in range(per_request)]
+        for i in range(total)
+    ]
+    local = threading.local()
+
+    def task(payload: List[Tuple[str, bytes]]) -> Tuple[bool, float]:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return send(local.session, server.url, endpoint, payload, form)
+
+    harness.reset_peak_rss(server.process.pid)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(task, payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for ok, seconds in outcomes if ok]
+    case = harness.summarize_latencies(latencies)
+    case["throughput"] = round(len(latencies) * per_request / elapsed, 3)
+    case["requests"] = total
+    case["errors"] = total - len(latencies)
+    case["peak_rss_mib"] = harness.peak_rss_mib(server.process.pid)
+    return case
+
+
+def run(args: argparse.Namespace) -> Dict[str, harness.Case]:
+    images = render_images(args.size, args.images)
+    form = {"enhance_preset": args.preset}
+    cases = {}
+    with tempfile.TemporaryDirectory() as workdir, Server(args, workdir) as server:
+        for endpoint in ENDPOINTS:
+            # Warm up connection handling and lazily built state before measuring
+            run_case(server, endpoint, 1, 2, images, args.batch_size, form)
+            for concurrency in (int(level) for level in args.concurrency.split(",")):
+                name = f"{endpoint}/c{concurrency}"
+                cases[name] = run_case(server, endpoint, concurrency, args.requests, images, args.batch_size, form)
+                print(f"  {name}", file=sys.stderr)
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--size", default="1600x1200", help="WIDTHxHEIGHT of the synthetic drawings")
+    parser.add_argument("--images", type=int, default=8, help="Distinct drawings to cycle over")
+    parser.add_argument("--batch-size", type=int, default=4, help="Images per /ocr/batch request")
+    parser.add_argument("--preset", default="auto", help="enhance_preset sent with each request")
+    parser.add_argument("--model-ms", type=int, default=50, help="Stub OCR latency per call in milliseconds")
+    parser.add_argument(
+        "--model-ms-per-megapixel", type=int, default=20, help="Additional stub OCR latency per megapixel"
+    )
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE", help="Environment setting for the server"
+    )
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    cases = run(args)
+    harness.print_cases(cases, COLUMNS)
+    settings = {
+        key: getattr(args, key)
+        for key in (
+            "concurrency", "requests", "size", "images", "batch_size", "preset",
+            "model_ms", "model_ms_per_megapixel", "env",
+        )
+    }
+    sys.exit(harness.finish("load_test", cases, settings, args.save, args.compare, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
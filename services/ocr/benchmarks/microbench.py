@@ -0,0 +1,109 @@
+"""
+Microbenchmarks of the image processor and the technical text analyzer.
+
+Every public ``ImageProcessor`` method that takes an image (and each
+enhancement preset) is timed on noisy synthetic drawings of several sheet
+sizes, and ``TechnicalTextAnalyzer.extract_technical_specifications`` on
+generated OCR-like spec text of several lengths. Inputs are generated from
+fixed seeds, so runs on the same machine are comparable. Each case reports
+p50/p95/p99 latency, throughput in calls per second and the peak RSS while
+it ran.
+
+Usage (from services/ocr):
+    python -m benchmarks.microbench [--sizes 1600x1200,3508x2480] [--text-sizes 400,4000,40000]
+        [--repeat 5] [--only image|text] [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import random
+import sys
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks import harness
+from benchmarks.synthetic import degrade, render_drawing
+from benchmarks.text_analyzer import random_text
+from utils.image_processor import ENHANCEMENT_PRESETS, ImageProcessor
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+COLUMNS = ("p50_ms", "p95_ms", "p99_ms", "throughput", "peak_rss_mib")
+
+
+def image_calls(processor: ImageProcessor, image: np.ndarray) -> List[Tuple[str, Callable[[], object]]]:
+    """``(name, call)`` for each image processing operation to time on ``image``."""
+    calls = [
+        (f"enhance_technical_drawing[{preset}]", lambda preset=preset: processor.enhance_technical_drawing(image, preset))
+        for preset in ENHANCEMENT_PRESETS
+    ]
+    calls += [
+        ("analyze_quality", lambda: processor.analyze_quality(image)),
+        ("estimate_skew", lambda: processor.estimate_skew(image)),
+        ("correct_skew", lambda: processor.correct_skew(image)),
+        ("preprocess_for_text_detection", lambda: processor.preprocess_for_text_detection(image)),
+        ("enhance_contrast", lambda: processor.enhance_contrast(image)),
+        ("remove_noise", lambda: processor.remove_noise(image)),
+        ("resize_for_ocr", lambda: processor.resize_for_ocr(image)),
+        ("sharpen_image", lambda: processor.sharpen_image(image)),
+    ]
+    return calls
+
+
+def measure(function: Callable[[], object], repeat: int) -> harness.Case:
+    harness.reset_peak_rss()
+    timings = harness.time_calls(function, repeat)
+    case = harness.summarize_latencies(timings)
+    case["throughput"] = round(len(timings) / sum(timings), 3)
+    case["peak_rss_mib"] = harness.peak_rss_mib()
+    case["runs"] = len(timings)
+    return case
+
+
+def run_image(sizes: List[str], repeat: int) -> Dict[str, harness.Case]:
+    processor = ImageProcessor()
+    cases = {}
+    for size in sizes:
+        width, height = (int(v) for v in size.split("x"))
+        image = degrade(render_drawing(width, height)[0])
+        for name, call in image_calls(processor, image):
+            cases[f"image/{name}/{size}"] = measure(call, repeat)
+            print(f"  image/{name}/{size}", file=sys.stderr)
+    return cases
+
+
+def run_text(sizes: List[int], repeat: int) -> Dict[str, harness.Case]:
+    analyzer = TechnicalTextAnalyzer()
+    cases = {}
+    for size in sizes:
+        text = random_text(random.Random(size), max(1, size // 7), spec_fraction=0.3)
+        # Short texts are cheap, so they get more runs for stable percentiles
+        runs = max(repeat, min(1000, 400_000 // max(1, len(text))))
+        cases[f"text/extract_technical_specifications/{size}"] = measure(
+            lambda: analyzer.extract_technical_specifications(text), runs
+        )
+        print(f"  text/extract_technical_specifications/{size}", file=sys.stderr)
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1600x1200,3508x2480", help="Comma-separated WIDTHxHEIGHT sheet sizes")
+    parser.add_argument("--text-sizes", default="400,4000,40000", help="Comma-separated spec text sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case, after one warm-up run")
+    parser.add_argument("--only", choices=("image", "text"), help="Run only the image or the text benchmarks")
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    cases: Dict[str, harness.Case] = {}
+    if args.only != "text":
+        cases.update(run_image(args.sizes.split(","), args.repeat))
+    if args.only != "image":
+        cases.update(run_text([int(size) for size in args.text_sizes.split(",")], args.repeat))
+
+    harness.print_cases(cases, COLUMNS)
+    settings = {"sizes": args.sizes, "text_sizes": args.text_sizes, "repeat": args.repeat, "only": args.only}
+    sys.exit(harness.finish("microbench", cases, settings, args.save, args.compare, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Synthetic technical drawings with known text, so benchmarks need no sample data."""
+
+import random
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+LABELS = [
+    "M8 x 25", "M10x1.5", "1/4-20 UNC", "ISO 4762", "DIN 912", "HEX HEAD",
+    "STAINLESS STEEL 304", "QTY: 4", "GRADE 8.8", "Ø12", "LENGTH: 40mm",
+    "SOCKET HEAD CAP SCREW", "TORX", "ZINC PLATED", "PART NO. AB12345",
+]
+
+
+def render_drawing(width: int, height: int, seed: int = 0) -> Tuple[np.ndarray, List[str]]:
+    """
+    Render a clean drawing sheet: border, grid lines, a title block and text callouts.
+
+    Returns:
+        ``(rgb_image, labels)`` where ``labels`` is the text drawn on the sheet
+    """
+    rng = random.Random(seed)
+    image = np.full((height, width), 255, dtype=np.uint8)
+    scale = max(0.5, min(width, height) / 1600)
+    thickness = max(1, int(round(2 * scale)))
+
+    cv2.rectangle(image, (10, 10), (width - 11, height - 11), 0, thickness + 1)
+    for x in range(0, width, max(50, width // 12)):
+        cv2.line(image, (x, 10), (x, height - 11), 200, 1)
+    for y in range(0, height, max(50, height // 12)):
+        cv2.line(image, (10, y), (width - 11, y), 200, 1)
+
+    title_w, title_h = width // 3, height // 6
+    cv2.rectangle(image, (width - title_w - 20, height - title_h - 20), (width - 20, height - 20), 0, thickness)
+
+    labels = []
+    line_height = int(40 * scale)
+    rows = max(1, (height - 100) // (line_height * 2))
+    for row in range(rows):
+        label = rng.choice(LABELS)
+        x = rng.randint(30, max(31, width // 2))
+        y = 60 + row * line_height * 2
+        cv2.putText(image, label, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, thickness, cv2.LINE_AA)
+        labels.append(label)
+
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB), labels
+
+
+def degrade(image: np.ndarray, noise_sigma: float = 12.0, blur: int = 0, seed: int = 0) -> np.ndarray:
+    """Add scanner-like Gaussian noise and optional blur to a clean render."""
+    rng = np.random.default_rng(seed)
+    degraded = image.astype(np.float32)
+    if blur:
+        degraded = cv2.GaussianBlur(degraded, (blur | 1, blur | 1), 0)
+    degraded += rng.normal(0, noise_sigma, size=image.shape[:2])[..., None]
+    return np.clip(degraded, 0, 255).astype(np.uint8)
@@ -0,0 +1,133 @@
+"""
+Speed and equivalence of the technical text analyzer's multi-pattern scanner.
+
+Random OCR-like texts mix spec fragments (threads, materials, units,
+standards, part numbers...) with drawing vocabulary and stray numbers.
+Each text is analyzed twice: once with the analyzer's PatternScanners and
+once with a reference that runs ``re.finditer`` for every pattern
+separately, as the analyzer used to. The two outputs must be identical;
+the script exits non-zero on the first difference. (tests/test_text_analyzer.py
+also checks the scanned categories against a frozen copy of the original
+analyzer's output.)
+
+Timings are reported for the pattern scan alone and for the whole
+``extract_technical_specifications`` call, which also normalizes the text
+and looks up vocabulary terms.
+
+Usage (from services/ocr):
+    python -m benchmarks.text_analyzer [--texts 2000] [--sizes 400,4000,40000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Dict, Hashable, List
+
+from utils.text_analyzer import TechnicalTextAnalyzer
+from utils.text_normalizer import normalize_text
+
+FRAGMENTS = [
+    "M8 x 25", "M10×30", "m12x1.5", "1/4-20 UNC", "1/4-28 UNF", "#8-32", "8mm x 25",
+    "stainless steel 304", "carbon steel", "alloy steel", "brass", "aluminum", "zinc plated",
+    "galvanized", "titanium", "inconel", "hastelloy", "25mm", "2.5cm", "1inch", '1"', "1'",
+    "Ø8", "Ø 12.5", "diameter: 8", "length - 25", "ISO 4762", "DIN912", "ANSI B18.2.1",
+    "ASME-B1.1", "JIS B1176", "BS 3692", "EN 14399", "hex head", "socket head", "pan head",
+    "countersunk", "phillips", "torx", "hex socket", "pozidriv", "grade 8.8", "class 10.9",
+    "800 MPa", "120ksi", "proof load: 600", "AB12345D4", "123-456", "A12345", "QTY: 4",
+    "quantity - 10", "5 pcs", "12 pieces", "pack of 50", "ſtainless ſteel", "KSI", "İSO 9001",
+]
+WORDS = (
+    "the of and to see note detail section view scale drawing sheet revision approved "
+    "checked date tolerance unless otherwise specified surface finish remove burrs break "
+    "sharp edges assembly item description material weight"
+).split()
+
+
+class FinditerReference:
+    """One ``re.finditer`` pass per pattern, with the same interface as PatternScanner."""
+
+    def __init__(self, scanner):
+        self.keys = scanner.keys
+        self.patterns = [pattern[0] for pattern in scanner._patterns]
+
+    def scan(self, text: str) -> Dict[Hashable, List["re.Match"]]:
+        results: Dict[Hashable, List["re.Match"]] = {key: [] for key in self.keys}
+        for key, regex in zip(self.keys, self.patterns):
+            results[key].extend(re.finditer(regex.pattern, text, regex.flags))
+        return results
+
+
+def random_text(rng: random.Random, words: int, spec_fraction: float = 0.1) -> str:
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < spec_fraction:
+            parts.append(rng.choice(FRAGMENTS))
+        elif roll < spec_fraction + 0.1:
+            parts.append(str(rng.randint(0, 999)))
+        else:
+            parts.append(rng.choice(WORDS))
+    return " ".join(parts)
+
+
+def reference_analyzer() -> TechnicalTextAnalyzer:
+    """An analyzer whose scanners run one ``re.finditer`` pass per pattern."""
+    analyzer = TechnicalTextAnalyzer()
+    analyzer._scanner = FinditerReference(analyzer._scanner)
+    analyzer._part_scanner = FinditerReference(analyzer._part_scanner)
+    return analyzer
+
+
+def scan(analyzer: TechnicalTextAnalyzer, text: str, cased: str) -> None:
+    analyzer._scanner.scan(text)
+    analyzer._part_scanner.scan(cased)
+
+
+def check_equivalence(texts: int, seed: int = 0) -> None:
+    scanned, reference = TechnicalTextAnalyzer(), reference_analyzer()
+    rng = random.Random(seed)
+    for index in range(texts):
+        text = random_text(rng, rng.randint(0, 80), spec_fraction=rng.random())
+        if scanned.extract_technical_specifications(text) != reference.extract_technical_specifications(text):
+            print(f"Output differs for text {index}: {text!r}")
+            sys.exit(1)
+    print(f"{texts} random texts: identical output")
+
+
+def time_sizes(sizes: List[int], seed: int = 0) -> None:
+    scanned, reference = TechnicalTextAnalyzer(), reference_analyzer()
+    print(f"{'':>8} {'pattern scan':^33} {'extract_technical_specifications':^33}")
+    print(f"{'chars':>8} " + f"{'finditer ms':>12} {'scanner ms':>11} {'speedup':>8} " * 2)
+    for size in sizes:
+        text = random_text(random.Random(seed), max(1, size // 7))
+        normalized = normalize_text(text)
+        repeat = max(3, 200_000 // max(1, len(text)))
+        row = f"{len(text):>8} "
+        for call in (
+            lambda analyzer: scan(analyzer, normalized.text, normalized.cased),
+            lambda analyzer: analyzer.extract_technical_specifications(text),
+        ):
+            timings = []
+            for analyzer in (reference, scanned):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    call(analyzer)
+                timings.append((time.perf_counter() - start) / repeat * 1000)
+            row += f"{timings[0]:>12.3f} {timings[1]:>11.3f} {timings[0] / timings[1]:>7.1f}x "
+        print(row.rstrip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000, help="Random texts for the equivalence check")
+    parser.add_argument("--sizes", default="400,4000,40000,400000", help="Text sizes in characters to time")
+    args = parser.parse_args()
+
+    check_equivalence(args.texts)
+    time_sizes([int(size) for size in args.sizes.split(",")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Runtime configuration for the OCR service, read from environment variables."""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+# Inference executor: worker threads running blocking OCR work, and how many
+# requests may wait for a free worker before new ones are rejected.
+INFERENCE_WORKERS = _env_int("OCR_INFERENCE_WORKERS", 2)
+INFERENCE_QUEUE_DEPTH = _env_int("OCR_INFERENCE_QUEUE_DEPTH", 8)
+INFERENCE_RETRY_AFTER = _env_int("OCR_INFERENCE_RETRY_AFTER", 5)
+
+# Process-pool mode: when > 0, inference runs in this many worker processes,
+# each with its own resident models, instead of in the API process.
+WORKER_PROCESSES = _env_int("OCR_WORKER_PROCESSES", 0)
+
+# Model registry: models loaded at start-up (before /health reports ready) and
+# the memory budget above which least-recently-used models are evicted.
+PRELOAD_LANGUAGES = [
+    lang.strip() for lang in os.getenv("OCR_PRELOAD_LANGUAGES", "en").split(",") if lang.strip()
+]
+PRELOAD_STRUCTURE = os.getenv("OCR_PRELOAD_STRUCTURE", "false").lower() in ("1", "true", "yes")
+# Worker processes preload the same models unless OCR_WORKER_PRELOAD_LANGUAGES
+# or OCR_WORKER_PRELOAD_STRUCTURE set them separately.
+WORKER_PRELOAD_LANGUAGES = [
+    lang.strip()
+    for lang in os.getenv("OCR_WORKER_PRELOAD_LANGUAGES", ",".join(PRELOAD_LANGUAGES)).split(",")
+    if lang.strip()
+]
+WORKER_PRELOAD_STRUCTURE = os.getenv(
+    "OCR_WORKER_PRELOAD_STRUCTURE", str(PRELOAD_STRUCTURE)
+).lower() in ("1", "true", "yes")
+MODEL_MEMORY_BUDGET_MB = _env_int("OCR_MODEL_MEMORY_BUDGET_MB", 0)
+# Used when a model's memory cannot be measured from RSS growth
+MODEL_MEMORY_ESTIMATE_MB = _env_int("OCR_MODEL_MEMORY_ESTIMATE_MB", 500)
+
+# OCR engine: "paddle" (PaddleOCR), "onnx" (PP-OCR models exported to ONNX,
+# run with ONNX Runtime on the CPU), "stub" (deterministic fake for tests and
+# benchmarks) or "auto" for the fastest engine installed on this node (onnx if
+# ONNX_MODEL_DIR is set, else paddle). Requests can pick another with "backend".
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")
+# The stub returns made-up text, so it is only offered (to requests, in /stats
+# and as OCR_BACKEND) when enabled here or selected as OCR_BACKEND explicitly
+STUB_BACKEND_ENABLED = (
+    OCR_BACKEND == "stub"
+    or os.getenv("OCR_STUB_BACKEND_ENABLED", "false").lower() in ("1", "true", "yes")
+)
+# det.onnx plus rec_<language>.onnx and rec_<language>.txt per language
+ONNX_MODEL_DIR = os.getenv("OCR_ONNX_MODEL_DIR", "")
+# ONNX Runtime intra-op threads per model; 0 lets it use every core
+ONNX_THREADS = _env_int("OCR_ONNX_THREADS", 0)
+# Simulated latency of the stub backend: per call, plus per megapixel
+STUB_LATENCY_MS = _env_int("OCR_STUB_LATENCY_MS", 0)
+STUB_LATENCY_MS_PER_MEGAPIXEL = _env_int("OCR_STUB_LATENCY_MS_PER_MEGAPIXEL", 0)
+
+# Batched inference: images per model call on /ocr/batch, text lines per
+# recognition batch, and threads used to decode/enhance images concurrently.
+OCR_BATCH_SIZE = max(1, _env_int("OCR_BATCH_SIZE", 8))
+OCR_REC_BATCH_SIZE = max(1, _env_int("OCR_REC_BATCH_SIZE", 16))
+PREPROCESS_THREADS = max(1, _env_int("OCR_PREPROCESS_THREADS", os.cpu_count() or 4))
+
+# OCR result cache: in-process LRU tier, plus an optional shared Redis tier
+# ("memory://" selects an in-process stand-in for tests).
+CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_ENTRIES = _env_int("OCR_CACHE_MAX_ENTRIES", 256)
+CACHE_MAX_MB = _env_int("OCR_CACHE_MAX_MB", 64)
+CACHE_TTL_SECONDS = _env_int("OCR_CACHE_TTL_SECONDS", 3600)
+CACHE_REDIS_URL = os.getenv("OCR_CACHE_REDIS_URL", os.getenv("REDIS_URL", ""))
+
+# Asynchronous job API: SQLite queue location (kept on the uploads volume so
+# jobs survive restarts), runner threads and how long finished jobs are kept.
+# A job interrupted by a restart is run again until it has been started
+# OCR_JOB_MAX_ATTEMPTS times, so an input that crashes the service fails
+# instead of crashing it on every start.
+JOB_DB_PATH = os.getenv("OCR_JOB_DB_PATH", "uploads/ocr_jobs.sqlite3")
+JOB_WORKERS = max(1, _env_int("OCR_JOB_WORKERS", 1))
+JOB_RETENTION_HOURS = _env_int("OCR_JOB_RETENTION_HOURS", 24)
+JOB_MAX_ATTEMPTS = max(1, _env_int("OCR_JOB_MAX_ATTEMPTS", 3))
+
+# Tiled OCR for very large drawings: images whose longer side exceeds the
+# threshold are split into overlapping tiles when tile_mode is "auto".
+TILE_THRESHOLD = _env_int("OCR_TILE_THRESHOLD", 4000)
+TILE_SIZE = max(256, _env_int("OCR_TILE_SIZE", 2048))
+TILE_OVERLAP = max(0, _env_int("OCR_TILE_OVERLAP", 192))
+
+# Multi-page PDF/TIFF input: rasterization DPI for PDF pages and how many
+# pages of one document are processed at once while streaming results.
+PDF_DPI = _env_int("OCR_PDF_DPI", 200)
+PAGE_CONCURRENCY = max(1, _env_int("OCR_PAGE_CONCURRENCY", INFERENCE_WORKERS))
+
+# Default image enhancement preset: none, fast, balanced, quality or auto.
+# "auto" measures each image and skips enhancement steps it does not need.
+ENHANCE_PRESET = os.getenv("OCR_ENHANCE_PRESET", "auto")
+# Hand enhanced images to the OCR model as single-channel arrays instead of
+# converting back to RGB. Only enable for models that accept grayscale input.
+GRAYSCALE_INPUT = os.getenv("OCR_GRAYSCALE_INPUT", "false").lower() in ("1", "true", "yes")
+
+# Decode limits. Uploads above MAX_IMAGE_PIXELS are rejected with 413 before
+# any pixel memory is allocated (A0 scanned at 300 dpi is about 140 MP).
+# DECODE_MAX_SIDE > 0 downscales larger images while decoding (JPEGs are
+# decoded at reduced scale directly); 0 keeps full resolution for tiling.
+MAX_IMAGE_PIXELS = _env_int("OCR_MAX_IMAGE_PIXELS", 150_000_000)
+DECODE_MAX_SIDE = _env_int("OCR_DECODE_MAX_SIDE", 0)
+
+# Upload limits. Request bodies above MAX_REQUEST_MB are rejected with 413
+# while they stream in, and each uploaded file is capped at MAX_UPLOAD_MB.
+# Uploads above UPLOAD_SPOOL_MB are spooled to a temporary file and
+# memory-mapped for decoding instead of being read into memory.
+MAX_UPLOAD_MB = _env_int("OCR_MAX_UPLOAD_MB", 100)
+MAX_REQUEST_MB = _env_int("OCR_MAX_REQUEST_MB", 512)
+UPLOAD_SPOOL_MB = max(1, _env_int("OCR_UPLOAD_SPOOL_MB", 1))
+
+# Layout detection model used by roi_mode="layout" to find tables and title
+# blocks (roi_mode="auto" uses a line-grid heuristic and needs no model).
+LAYOUT_MODEL = os.getenv("OCR_LAYOUT_MODEL", "PP-DocLayout_plus-L")
+
+# Vocabulary of materials, head types and drive types (with synonyms and trade
+# names) used by the technical text analyzer; empty uses the bundled one.
+ANALYZER_VOCABULARY = os.getenv("OCR_ANALYZER_VOCABULARY", "")
+
+# Default technical specification mode: "text" analyzes the joined page text,
+# "layout" analyzes clusters of neighbouring lines and reports source boxes.
+SPEC_MODE = os.getenv("OCR_SPEC_MODE", "text")
+
+# Catalog snapshot (JSONL or SQLite export of the components table) that part
+# numbers and standards are resolved against; empty disables resolution. The
+# file is checked for changes every CATALOG_RELOAD_SECONDS and re-indexed in
+# the background. CATALOG_MAX_DISTANCE is the edit distance allowed (0 or 1).
+CATALOG_SNAPSHOT = os.getenv("OCR_CATALOG_SNAPSHOT", "")
+CATALOG_RELOAD_SECONDS = _env_int("OCR_CATALOG_RELOAD_SECONDS", 30)
+CATALOG_MAX_DISTANCE = _env_int("OCR_CATALOG_MAX_DISTANCE", 1)
@@ -0,0 +1,658 @@
+"""
+Blocking OCR pipeline shared by the API process and the OCR worker processes.
+
+Nothing in here touches FastAPI, so worker processes can import it cheaply
+and keep their own model instances resident.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import structlog
+import numpy as np
+
+import config
+from utils.image_processor import ImageProcessor, ProcessingPipeline
+from utils.text_analyzer import TechnicalTextAnalyzer
+from utils.catalog_index import CatalogStore
+from utils.metrics import StageTimer
+from utils import document_loader, image_decoder
+from utils.uploads import ImageData
+from utils.roi import Region, detect_table_regions, normalize_rois, regions_from_layout
+from utils.model_registry import ModelRegistry
+from utils.ocr_backends import OCRBackend, OCRPage, build_backend, resolve_backend, result_field
+from utils.tiling import Tile, compute_tiles, merge_tile_boxes, offset_boxes
+
+logger = structlog.get_logger()
+
+# Initialize OCR models
+model_registry = ModelRegistry(
+    memory_budget_bytes=config.MODEL_MEMORY_BUDGET_MB * 2**20,
+    default_model_bytes=config.MODEL_MEMORY_ESTIMATE_MB * 2**20
+)
+image_processor = ImageProcessor()
+# Engine used when a request does not pick one
+DEFAULT_BACKEND = resolve_backend(config.OCR_BACKEND, config.ONNX_MODEL_DIR, allow_stub=config.STUB_BACKEND_ENABLED)
+catalog_store = None
+if config.CATALOG_SNAPSHOT:
+    catalog_store = CatalogStore(
+        config.CATALOG_SNAPSHOT,
+        reload_interval=config.CATALOG_RELOAD_SECONDS,
+        max_distance=config.CATALOG_MAX_DISTANCE
+    )
+    # Start indexing the snapshot in the background; results include catalog
+    # matches once it is ready
+    catalog_store.get()
+text_analyzer = TechnicalTextAnalyzer(
+    vocabulary_path=config.ANALYZER_VOCABULARY or None,
+    catalog=catalog_store
+)
+
+# Decoding and OpenCV enhancement release the GIL, so batches of images are
+# prepared concurrently on this pool
+preprocess_pool = ThreadPoolExecutor(
+    max_workers=config.PREPROCESS_THREADS,
+    thread_name_prefix="ocr-preprocess"
+)
+
+def _map_isolated(function: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    """Run ``function`` over ``items`` on the preprocess pool; an item that raises gets its exception in its slot."""
+    def _call(item: Any) -> Any:
+        try:
+            return function(item)
+        except Exception as e:
+            return e
+
+    return list(preprocess_pool.map(_call, items))
+
+def _build_ocr_model(language: str, use_gpu: bool, backend: str) -> OCRBackend:
+    logger.info("Initializing OCR model", backend=backend, language=language, use_gpu=use_gpu)
+    return build_backend(
+        backend,
+        language=language,
+        use_gpu=use_gpu,
+        rec_batch_size=config.OCR_REC_BATCH_SIZE,
+        onnx_model_dir=config.ONNX_MODEL_DIR,
+        onnx_threads=config.ONNX_THREADS,
+        stub_seconds=config.STUB_LATENCY_MS / 1000,
+        stub_seconds_per_megapixel=config.STUB_LATENCY_MS_PER_MEGAPIXEL / 1000
+    )
+
+def _build_structure_model(use_gpu: bool):
+    # Document structure analysis is Paddle-only; imported on first use so
+    # nodes running another OCR backend need not install Paddle
+    from paddleocr import PPStructureV3
+
+    logger.info("Initializing PP-StructureV3 model", use_gpu=use_gpu)
+    return PPStructureV3(
+        use_doc_orientation_classify=True,
+        use_doc_unwarping=True,
+        use_gpu=use_gpu,
+        show_log=False
+    )
+
+def _build_layout_model(use_gpu: bool):
+    # Only needed for roi_mode="layout", so PaddleOCR's layout module is imported on first use
+    from paddleocr import LayoutDetection
+
+    logger.info("Initializing layout detection model", model=config.LAYOUT_MODEL, use_gpu=use_gpu)
+    return LayoutDetection(model_name=config.LAYOUT_MODEL, device="gpu" if use_gpu else "cpu")
+
+def _ocr_model_spec(language: str, use_gpu: bool, backend: str) -> Tuple[str, Callable[[], OCRBackend]]:
+    return f"{backend}_{language}_{use_gpu}", lambda: _build_ocr_model(language, use_gpu, backend)
+
+def _structure_model_spec(use_gpu: bool) -> Tuple[str, Callable[[], Any]]:
+    return f"structure_{use_gpu}", lambda: _build_structure_model(use_gpu)
+
+def _layout_model_spec(use_gpu: bool) -> Tuple[str, Callable[[], Any]]:
+    return f"layout_{use_gpu}", lambda: _build_layout_model(use_gpu)
+
+def get_ocr_model(language: str = "en", use_gpu: bool = False, backend: Optional[str] = None) -> OCRBackend:
+    """Get or create the OCR model for a language on ``backend`` (by default ``DEFAULT_BACKEND``)."""
+    return model_registry.get(*_ocr_model_spec(language, use_gpu, backend or DEFAULT_BACKEND))
+
+def get_structure_model(use_gpu: bool = False):
+    """Get or create PP-StructureV3 model for document parsing."""
+    return model_registry.get(*_structure_model_spec(use_gpu))
+
+def get_layout_model(use_gpu: bool = False):
+    """Get or create the layout detection model used to find tables for ROI OCR."""
+    return model_registry.get(*_layout_model_spec(use_gpu))
+
+def preload_models(languages: List[str], use_gpu: bool = False, structure: bool = False) -> List[str]:
+    """Load the default backend's models up front so the first request does not pay for it. Returns the loaded keys."""
+    models = [_ocr_model_spec(language, use_gpu, DEFAULT_BACKEND) for language in languages]
+    if structure:
+        models.append(_structure_model_spec(use_gpu))
+    return model_registry.preload(models)
+
+def model_stats() -> Dict[str, Any]:
+    """This process's model registry statistics; worker processes report them with every result."""
+    return model_registry.stats()
+
+def decode_image(image_data: ImageData, dpi: Optional[int] = None) -> np.ndarray:
+    """Decode raw image bytes into an RGB numpy array; PDFs are rasterized at ``dpi``."""
+    return decode_image_with_info(image_data, dpi=dpi)[0]
+
+def decode_image_with_info(image_data: ImageData, dpi: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Decode raw image bytes and report how it went.
+
+    Raises:
+        ImageTooLargeError: The image or rendered page exceeds ``config.MAX_IMAGE_PIXELS``
+
+    Returns:
+        ``(rgb_array, info)`` with decode time in ms and peak decode buffer bytes
+    """
+    if document_loader.detect_format(image_data) == "pdf":
+        start = time.perf_counter()
+        page = document_loader.render_page(
+            image_data, 0, dpi=dpi or config.PDF_DPI, max_pixels=config.MAX_IMAGE_PIXELS
+        )
+        return page, {
+            "decoder": "pdfium",
+            "format": "PDF",
+            "size": [page.shape[1], page.shape[0]],
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+            # PDFium's BGRA bitmap plus the RGB copy taken from it
+            "peak_bytes": len(image_data) + page.nbytes // 3 * 4 + page.nbytes,
+        }
+
+    return image_decoder.decode(
+        image_data, max_pixels=config.MAX_IMAGE_PIXELS, max_side=config.DECODE_MAX_SIDE
+    )
+
+def decode_images(images_data: List[ImageData]) -> List[Union[np.ndarray, Exception]]:
+    """Decode several images concurrently; a failed decode is returned in its slot."""
+    return [
+        outcome if isinstance(outcome, Exception) else outcome[0]
+        for outcome in decode_images_with_info(images_data)
+    ]
+
+def decode_images_with_info(
+    images_data: List[ImageData]
+) -> List[Union[Tuple[np.ndarray, Dict[str, Any]], Exception]]:
+    """Decode several images concurrently, as :func:`decode_image_with_info`; a failed decode is returned in its slot."""
+    return _map_isolated(decode_image_with_info, images_data)
+
+def _collect_ocr_lines(page: OCRPage) -> List[Dict[str, Any]]:
+    """Turn the lines of one OCR backend page into bounding boxes with text and confidence."""
+    bounding_boxes = []
+
+    for text, score, poly in zip(page.texts, page.scores, page.polygons):
+        if text.strip():  # Only include non-empty text
+            # Convert polygon to bounding box
+            x_coords = [point[0] for point in poly]
+            y_coords = [point[1] for point in poly]
+            bbox = {
+                "text": text,
+                "confidence": float(score),
+                "coordinates": {
+                    "x_min": int(min(x_coords)),
+                    "y_min": int(min(y_coords)),
+                    "x_max": int(max(x_coords)),
+                    "y_max": int(max(y_coords))
+                },
+                "polygon": [[int(point[0]), int(point[1])] for point in poly]
+            }
+            bounding_boxes.append(bbox)
+
+    return bounding_boxes
+
+def _build_ocr_result(
+    bounding_boxes: List[Dict[str, Any]],
+    extract_technical_info: bool,
+    spec_mode: str = config.SPEC_MODE
+) -> Dict[str, Any]:
+    """
+    Turn the recognized lines of one image into the response payload.
+
+    In "layout" spec mode specifications are extracted per cluster of
+    neighbouring lines and carry the indices of their source boxes. The
+    payload's ``timings`` holds the seconds spent on extraction; callers add
+    their own stages to it.
+    """
+    confidences = [bbox["confidence"] for bbox in bounding_boxes]
+
+    # Calculate average confidence
+    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+
+    # Join all text
+    full_text = " ".join(bbox["text"] for bbox in bounding_boxes)
+
+    # Extract technical specifications if requested
+    technical_specs = None
+    timer = StageTimer()
+    if extract_technical_info and full_text:
+        with timer.stage("spec_extraction"):
+            if spec_mode == "layout":
+                technical_specs = text_analyzer.extract_from_lines(bounding_boxes)
+            else:
+                technical_specs = text_analyzer.extract_technical_specifications(full_text)
+
+    return {
+        "text": full_text,
+        "confidence": avg_confidence,
+        "bounding_boxes": bounding_boxes,
+        "technical_specs": technical_specs,
+        "timings": timer.seconds
+    }
+
+def should_tile(img_array: np.ndarray, tile_mode: str) -> bool:
+    """Decide whether an image is OCR'd in tiles ("auto" tiles anything above the size threshold)."""
+    if tile_mode == "on":
+        return True
+    if tile_mode == "auto":
+        return max(img_array.shape[:2]) > config.TILE_THRESHOLD
+    return False
+
+def _ocr_tiled(
+    ocr,
+    img_array: np.ndarray,
+    enhance_preset: str,
+    deskew: str = "auto",
+    timer: Optional[StageTimer] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    OCR a large image as overlapping tiles.
+
+    Tiles are processed in waves of ``config.OCR_BATCH_SIZE``: each wave is
+    enhanced concurrently, recognized in one batched model call and then
+    dropped, so working memory scales with the tile size rather than the page.
+    Enhancement is planned once for the whole page and every tile gets the
+    same steps; skew is corrected on the whole page so tiles stay aligned.
+    A tile whose enhancement fails is left out of recognition and listed
+    under ``failed_tiles`` in the report, so it cannot fail the whole page.
+
+    Returns:
+        ``(bounding_boxes, preprocessing_report)``; ``timer`` gets the
+        enhancement and recognition time
+    """
+    timer = timer or StageTimer()
+    height, width = img_array.shape[:2]
+    tiles = compute_tiles(height, width, config.TILE_SIZE, config.TILE_OVERLAP)
+    logger.info("Starting tiled OCR processing", width=width, height=height, tiles=len(tiles))
+
+    with timer.stage("enhance"):
+        plan, report = image_processor.plan_steps(img_array, enhance_preset, deskew)
+        report["tiles"] = len(tiles)
+        page_steps = list(report.pop("steps"))
+        skew_plan = [step for step in plan if not isinstance(step, str) and step[0] == "correct_skew"]
+        if skew_plan:
+            img_array, skew_steps = ProcessingPipeline(skew_plan).run(img_array)
+            page_steps.extend(skew_steps)
+    tile_pipeline = ProcessingPipeline([step for step in plan if step not in skew_plan], output=_enhance_output())
+
+    def prepare(tile: Tile) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        x0, y0, x1, y1 = tile
+        return tile_pipeline.run(img_array[y0:y1, x0:x1])
+
+    bounding_boxes = []
+    # Index into ``tiles`` of each box's tile, so only seam duplicates are merged
+    box_tiles = []
+    tile_steps = [page_steps]
+    failed_tiles = []
+    for start in range(0, len(tiles), config.OCR_BATCH_SIZE):
+        wave = tiles[start:start + config.OCR_BATCH_SIZE]
+        with timer.stage("enhance"):
+            prepared = _map_isolated(prepare, wave)
+        ready = []
+        for tile_index, (tile, outcome) in enumerate(zip(wave, prepared), start=start):
+            if isinstance(outcome, Exception):
+                logger.warning("Tile enhancement failed", tile=list(tile), error=str(outcome))
+                failed_tiles.append({"tile": list(tile), "error": str(outcome)})
+            else:
+                ready.append((tile_index, outcome[0]))
+                tile_steps.append(outcome[1])
+        if not ready:
+            continue
+        with timer.stage("ocr"):
+            pages = ocr.predict([crop for _, crop in ready])
+        for (tile_index, _), page in zip(ready, pages):
+            x0, y0 = tiles[tile_index][:2]
+            lines = offset_boxes(_collect_ocr_lines(page), x0, y0)
+            bounding_boxes.extend(lines)
+            box_tiles.extend([tile_index] * len(lines))
+
+    report["steps"] = _sum_step_timings(tile_steps)
+    if failed_tiles:
+        report["failed_tiles"] = failed_tiles
+    return merge_tile_boxes(bounding_boxes, box_tiles, tiles), report
+
+def _enhance_output() -> Optional[str]:
+    """Pipeline output format: single-channel when the model is configured to take it."""
+    return "gray" if config.GRAYSCALE_INPUT else None
+
+def _sum_step_timings(step_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Add up per-tile step timings by step name, keeping first-seen order."""
+    totals: Dict[str, float] = {}
+    for steps in step_lists:
+        for step in steps:
+            totals[step["name"]] = totals.get(step["name"], 0.0) + step["ms"]
+    return [{"name": name, "ms": round(ms, 2)} for name, ms in totals.items()]
+
+def find_regions(
+    img_array: np.ndarray,
+    roi_mode: str = "off",
+    rois: Optional[List[Any]] = None,
+    use_gpu: bool = False
+) -> List[Region]:
+    """
+    Pick the regions to OCR: explicit ``rois`` if given, else title block and tables found by ``roi_mode``.
+
+    Returns:
+        Regions in pixel coordinates; empty means OCR the whole image
+    """
+    height, width = img_array.shape[:2]
+    if rois:
+        return normalize_rois(rois, width, height)
+    if roi_mode == "auto":
+        return detect_table_regions(img_array)
+    if roi_mode == "layout":
+        boxes = []
+        for res in get_layout_model(use_gpu=use_gpu).predict(img_array):
+            boxes.extend(result_field(res, "boxes") or [])
+        return regions_from_layout(boxes, width, height)
+    return []
+
+def _ocr_regions(
+    ocr,
+    img_array: np.ndarray,
+    regions: List[Region],
+    enhance_preset: str,
+    deskew: str = "auto",
+    timer: Optional[StageTimer] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    OCR only the given regions of an image.
+
+    Each crop is a view into the page with its own enhancement plan; crops
+    are enhanced concurrently and recognized in batched model calls. A
+    region whose crop cannot be prepared gets an ``error`` in its result and
+    is left out of recognition.
+
+    Returns:
+        ``(bounding_boxes, region_results, preprocessing_report)`` with boxes
+        in page coordinates and each region's own text and confidence;
+        ``timer`` gets the enhancement and recognition time
+    """
+    timer = timer or StageTimer()
+    logger.info("Starting region OCR processing", regions=[region["label"] for region in regions])
+
+    def prepare(region: Region) -> Tuple[np.ndarray, Dict[str, Any]]:
+        coords = region["coordinates"]
+        crop = img_array[coords["y_min"]:coords["y_max"], coords["x_min"]:coords["x_max"]]
+        return image_processor.enhance_with_report(crop, preset=enhance_preset, output=_enhance_output(), deskew=deskew)
+
+    bounding_boxes = []
+    region_results = []
+    region_steps = []
+    for start in range(0, len(regions), config.OCR_BATCH_SIZE):
+        wave = regions[start:start + config.OCR_BATCH_SIZE]
+        with timer.stage("enhance"):
+            prepared = _map_isolated(prepare, wave)
+        ready = []
+        for region, outcome in zip(wave, prepared):
+            if isinstance(outcome, Exception):
+                logger.warning("Region preparation failed", region=region["label"], error=str(outcome))
+                region_results.append({**region, "text": "", "confidence": 0.0, "error": str(outcome)})
+            else:
+                ready.append((region, outcome[0]))
+                region_steps.append(outcome[1]["steps"])
+        if not ready:
+            continue
+        with timer.stage("ocr"):
+            pages = ocr.predict([crop for _, crop in ready])
+        for (region, _), page in zip(ready, pages):
+            coords = region["coordinates"]
+            boxes = offset_boxes(_collect_ocr_lines(page), coords["x_min"], coords["y_min"])
+            bounding_boxes.extend(boxes)
+            region_results.append({
+                **region,
+                "text": " ".join(box["text"] for box in boxes),
+                "confidence": sum(box["confidence"] for box in boxes) / len(boxes) if boxes else 0.0,
+            })
+
+    report = {"preset": enhance_preset, "regions": len(regions), "steps": _sum_step_timings(region_steps)}
+    return bounding_boxes, region_results, report
+
+def ocr_array(
+    img_array: np.ndarray,
+    language: str = "en",
+    enhance_image: bool = True,
+    extract_technical_info: bool = True,
+    use_gpu: bool = False,
+    tile_mode: str = "auto",
+    enhance_preset: str = config.ENHANCE_PRESET,
+    deskew: str = "auto",
+    roi_mode: str = "off",
+    rois: Optional[List[Any]] = None,
+    spec_mode: str = config.SPEC_MODE,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Enhance and OCR a decoded image, then extract technical specifications.
+
+    With ``rois`` or a ``roi_mode`` other than "off", only the title block and
+    table regions are recognized; when none are found the whole image is.
+    ``backend`` picks the OCR engine, ``DEFAULT_BACKEND`` if not given.
+    ``timings`` in the result has the seconds spent per stage (region
+    detection, enhancement, OCR and specification extraction).
+    """
+    preset = enhance_preset if enhance_image else "none"
+    timer = StageTimer()
+
+    # Get OCR model
+    ocr = get_ocr_model(language=language, use_gpu=use_gpu, backend=backend)
+
+    if rois or roi_mode != "off":
+        with timer.stage("regions"):
+            regions = find_regions(img_array, roi_mode, rois, use_gpu)
+        if regions:
+            bounding_boxes, region_results, preprocessing = _ocr_regions(
+                ocr, img_array, regions, preset, deskew, timer=timer
+            )
+            output = _build_ocr_result(bounding_boxes, extract_technical_info, spec_mode)
+            output["timings"].update(timer.seconds)
+            return {**output, "preprocessing": preprocessing, "regions": region_results}
+        logger.info("No regions of interest found, processing the whole image", roi_mode=roi_mode)
+        full_result = ocr_array(
+            img_array, language, enhance_image, extract_technical_info, use_gpu, tile_mode, enhance_preset, deskew,
+            spec_mode=spec_mode, backend=backend
+        )
+        full_result["timings"].update(timer.seconds)
+        return {**full_result, "regions": []}
+
+    if should_tile(img_array, tile_mode):
+        bounding_boxes, preprocessing = _ocr_tiled(ocr, img_array, preset, deskew, timer=timer)
+        output = _build_ocr_result(bounding_boxes, extract_technical_info, spec_mode)
+        output["timings"].update(timer.seconds)
+        return {**output, "preprocessing": preprocessing}
+
+    # Apply image enhancement if requested
+    with timer.stage("enhance"):
+        img_array, preprocessing = image_processor.enhance_with_report(
+            img_array, preset=preset, output=_enhance_output(), deskew=deskew
+        )
+
+    # Perform OCR
+    logger.info(
+        "Starting OCR processing",
+        language=language,
+        enhance_preset=preset,
+        preprocessing_steps=[step["name"] for step in preprocessing["steps"]]
+    )
+    with timer.stage("ocr"):
+        page = ocr.predict([img_array])[0]
+
+    output = _build_ocr_result(_collect_ocr_lines(page), extract_technical_info, spec_mode)
+    output["timings"].update(timer.seconds)
+    return {**output, "preprocessing": preprocessing}
+
+def ocr_batch(
+    images: List[np.ndarray],
+    language: str = "en",
+    enhance_image: bool = True,
+    extract_technical_info: bool = True,
+    use_gpu: bool = False,
+    enhance_preset: str = config.ENHANCE_PRESET,
+    spec_mode: str = config.SPEC_MODE,
+    backend: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    OCR several decoded images with batched model calls.
+
+    Images are enhanced concurrently and passed to the model in chunks of
+    ``config.OCR_BATCH_SIZE`` so detection and recognition see several
+    images per call. An image whose enhancement fails gets an error entry and
+    is left out of the model calls; if a batched call fails, the chunk is
+    retried one image at a time, so a bad image only fails its own entry.
+    Images above the tiling threshold are OCR'd in tiles on their own.
+
+    Returns:
+        One entry per input image: the OCR payload, or ``{"error": ...}``.
+        Batched stages are timed per call, so each payload's ``timings``
+        has its share of its chunk's enhancement and OCR time.
+    """
+    preset = enhance_preset if enhance_image else "none"
+    ocr = get_ocr_model(language=language, use_gpu=use_gpu, backend=backend)
+    logger.info("Starting batched OCR processing", language=language, images=len(images))
+
+    outputs: List[Optional[Dict[str, Any]]] = [None] * len(images)
+    batched = []
+    for index, img_array in enumerate(images):
+        if not should_tile(img_array, "auto"):
+            batched.append(index)
+            continue
+        try:
+            timer = StageTimer()
+            bounding_boxes, preprocessing = _ocr_tiled(ocr, img_array, preset, timer=timer)
+            output = _build_ocr_result(bounding_boxes, extract_technical_info, spec_mode)
+            output["timings"].update(timer.seconds)
+            outputs[index] = {**output, "preprocessing": preprocessing}
+        except Exception as e:
+            outputs[index] = {"error": str(e)}
+
+    enhance_start = time.perf_counter()
+    prepared = _map_isolated(
+        lambda img_array: image_processor.enhance_with_report(img_array, preset=preset, output=_enhance_output()),
+        [images[index] for index in batched]
+    )
+    enhance_seconds = (time.perf_counter() - enhance_start) / max(1, len(prepared))
+    enhanced = []
+    for index, outcome in zip(batched, prepared):
+        if isinstance(outcome, Exception):
+            logger.warning("Image enhancement failed", index=index, error=str(outcome))
+            outputs[index] = {"error": str(outcome)}
+        else:
+            enhanced.append((index, outcome))
+    images = [img_array for _, (img_array, _) in enhanced]
+
+    batched_outputs: List[Dict[str, Any]] = []
+    for start in range(0, len(images), config.OCR_BATCH_SIZE):
+        chunk = images[start:start + config.OCR_BATCH_SIZE]
+
+        ocr_start = time.perf_counter()
+        try:
+            # One page per input image, in input order
+            chunk_results = ocr.predict(chunk)
+            if len(chunk_results) != len(chunk):
+                raise RuntimeError(f"Expected {len(chunk)} results, got {len(chunk_results)}")
+        except Exception as e:
+            logger.warning("Batched OCR failed, retrying images individually", error=str(e))
+            chunk_results = []
+            for img_array in chunk:
+                try:
+                    chunk_results.append(ocr.predict([img_array])[0])
+                except Exception as image_error:
+                    chunk_results.append(image_error)
+        ocr_seconds = (time.perf_counter() - ocr_start) / len(chunk)
+
+        for result in chunk_results:
+            if isinstance(result, Exception):
+                batched_outputs.append({"error": str(result)})
+                continue
+            try:
+                output = _build_ocr_result(_collect_ocr_lines(result), extract_technical_info, spec_mode)
+                output["timings"].update(enhance=enhance_seconds, ocr=ocr_seconds)
+                batched_outputs.append(output)
+            except Exception as e:
+                batched_outputs.append({"error": str(e)})
+
+    for (index, (_, preprocessing)), output in zip(enhanced, batched_outputs):
+        if "error" not in output:
+            output["preprocessing"] = preprocessing
+        outputs[index] = output
+    return outputs
+
+def _collect_markdown(structure_model, results: List[Any]) -> str:
+    """
+    Build the markdown for all structure results in memory.
+
+    Each result's ``markdown`` property holds its page text (images stay as
+    in-memory crops); the pipeline's ``concatenate_markdown_pages`` joins
+    pages so tables and paragraphs split across pages are merged.
+    """
+    pages = [res.markdown for res in results if getattr(res, "markdown", None)]
+    if not pages:
+        return ""
+    if len(pages) > 1 and hasattr(structure_model, "concatenate_markdown_pages"):
+        return structure_model.concatenate_markdown_pages(pages)
+    return "\n\n".join(page.get("markdown_texts", "") for page in pages)
+
+def _collect_tables(res, page: int) -> List[Dict[str, Any]]:
+    """Extract recognized tables (HTML plus cell boxes) from one structure result."""
+    tables = []
+    for table in result_field(res, "table_res_list") or []:
+        tables.append({
+            "page": page,
+            "region_id": table.get("table_region_id"),
+            "html": table.get("pred_html", ""),
+            "cell_boxes": [[float(value) for value in box] for box in table.get("cell_box_list", [])],
+        })
+    return tables
+
+def structure_array(img_array: np.ndarray, use_gpu: bool = False) -> Dict[str, Any]:
+    """Run PP-StructureV3 document parsing on a decoded image; ``timings`` has the model's seconds."""
+    # Get structure model
+    structure_model = get_structure_model(use_gpu=use_gpu)
+
+    # Perform structure analysis
+    logger.info("Starting structure analysis")
+    start = time.perf_counter()
+    result = list(structure_model.predict(img_array))
+    structure_seconds = time.perf_counter() - start
+
+    # Process results
+    markdown_content = _collect_markdown(structure_model, result)
+    layout_elements = []
+    tables = []
+
+    for page, res in enumerate(result):
+        tables.extend(_collect_tables(res, page))
+
+        # Extract layout information if available
+        layout_info = result_field(res, "layout_det_res")
+        if layout_info:
+            for box in result_field(layout_info, "boxes") or []:
+                element = {
+                    "type": box.get("label", "unknown"),
+                    "confidence": float(box.get("score", 0.0)),
+                    "coordinates": [float(value) for value in box.get("coordinate", [])]
+                }
+                layout_elements.append(element)
+
+    return {
+        "markdown": markdown_content,
+        "layout_elements": layout_elements,
+        "tables": tables,
+        "timings": {"structure": structure_seconds}
+    }
+
+# Tasks the OCR worker processes can run; each takes the decoded image(s) first
+WORKER_TASKS = {
+    "ocr": ocr_array,
+    "ocr_batch": ocr_batch,
+    "structure": structure_array,
+}
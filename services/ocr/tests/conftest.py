@@ -0,0 +1,42 @@
+"""
+Shared test setup. The service reads its settings from the environment at
+import time, so the test settings are applied here before anything imports
+``config``: the deterministic "stub" OCR backend, no model preloading or
+cache, and a job database under a temporary directory.
+
+The app's shutdown stops its executors for good, so all tests share one
+``client`` for the whole session.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
+
+_RUNTIME_DIR = tempfile.mkdtemp(prefix="ocr-tests-")
+
+for key, value in {
+    "OCR_BACKEND": "stub",
+    "OCR_PRELOAD_LANGUAGES": "en",
+    "OCR_PRELOAD_STRUCTURE": "false",
+    "OCR_CACHE_ENABLED": "false",
+    # Above Starlette's 1 MB default, so tests can tell the setting is applied
+    "OCR_UPLOAD_SPOOL_MB": "2",
+    "OCR_JOB_DB_PATH": os.path.join(_RUNTIME_DIR, "jobs.sqlite3"),
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import app as service
+
+    with TestClient(service.app) as client:
+        yield client
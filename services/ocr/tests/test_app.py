@@ -0,0 +1,201 @@
+import base64
+import threading
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+import app as service
+from utils.inference_executor import InferenceExecutor
+
+
+def png(height: int = 120, width: int = 200, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    image[rng.integers(0, height, 40), rng.integers(0, width, 40)] = 0
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def test_batch_with_bad_image_fails_only_that_file(client):
+    files = [
+        ("files", ("good-1.png", png(seed=1), "image/png")),
+        ("files", ("broken.png", b"not an image", "image/png")),
+        ("files", ("good-2.png", png(seed=2), "image/png")),
+    ]
+
+    response = client.post("/ocr/batch", files=files)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["success", "failed", "success"]
+    assert results[1]["filename"] == "broken.png"
+    assert results[1]["error"]
+
+
+def test_extract_degenerate_image(client):
+    response = client.post("/ocr/extract", files={"file": ("tiny.png", png(2, 2), "image/png")})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("payload", [
+    "data:image/png;base64",
+    "data:image/png;base64;" + "A" * 64,
+    "not base64 at all \u00e9",
+    "data:image/png;base64,abc",
+])
+def test_extract_malformed_base64_is_rejected(client, payload):
+    response = client.post("/ocr/extract", data={"image_base64": payload})
+
+    assert response.status_code == 400
+
+
+def test_extract_data_url(client):
+    payload = "data:image/png;base64," + base64.b64encode(png()).decode("ascii")
+
+    response = client.post("/ocr/extract", data={"image_base64": payload})
+
+    assert response.status_code == 200
+    assert response.json()["text"]
+
+
+def test_uploads_above_spool_size_are_spooled_to_disk():
+    assert getattr(MultiPartParser, service.SPOOL_SIZE_ATTRIBUTE) == service.UPLOAD_SPOOL_BYTES
+
+    probe = FastAPI()
+
+    @probe.post("/probe")
+    async def spooled(file: UploadFile = File(...)):
+        return {"on_disk": file.file._rolled}
+
+    with TestClient(probe) as probe_client:
+        small = probe_client.post(
+            "/probe", files={"file": ("small.bin", b"x" * (service.UPLOAD_SPOOL_BYTES - 1024))}
+        )
+        large = probe_client.post(
+            "/probe", files={"file": ("large.bin", b"x" * (service.UPLOAD_SPOOL_BYTES + 1024))}
+        )
+
+    assert small.json() == {"on_disk": False}
+    assert large.json() == {"on_disk": True}
+
+
+def test_stub_backend_is_hidden_unless_enabled(client, monkeypatch):
+    monkeypatch.setattr(service, "AVAILABLE_BACKENDS", tuple(b for b in service.AVAILABLE_BACKENDS if b != "stub"))
+
+    response = client.post("/ocr/extract", files={"file": ("a.png", png(), "image/png")}, data={"backend": "stub"})
+    stats = client.get("/stats").json()
+
+    assert response.status_code == 400
+    assert "stub" not in stats["backends"]["available"]
+
+
+def test_job_runs_on_the_inference_executor(client):
+    completed = service.inference_executor.stats()["completed"]
+
+    job = client.post("/jobs", files={"file": ("a.png", png(), "image/png")}).json()
+    for _ in range(500):
+        status = client.get(f"/jobs/{job['job_id']}").json()["status"]
+        if status not in ("queued", "running"):
+            break
+        threading.Event().wait(0.01)
+
+    assert status == "completed"
+    assert client.get(f"/jobs/{job['job_id']}/result").json()["text"]
+    assert service.inference_executor.stats()["completed"] > completed
+
+
+def test_metrics_exposition(client):
+    client.post("/ocr/extract", files={"file": ("a.png", png(), "image/png")})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE ocr_stage_duration_seconds histogram" in lines
+    assert any(line.startswith('ocr_model_resident_bytes{process="api"}') for line in lines)
+
+
+def test_worker_model_stats_are_exported_per_process(client, monkeypatch):
+    class Pool:
+        def stats(self):
+            models = {"hits": 4, "misses": 1, "evictions": 0, "resident_bytes": 2048,
+                      "models": {"stub_en_False": {"load_time": 0.5}}}
+            return {"workers": [
+                {"worker_id": 0, "pending": 1, "stats": models},
+                {"worker_id": 1, "pending": 0, "stats": None},
+            ]}
+
+    monkeypatch.setattr(service, "worker_pool", Pool())
+
+    lines = client.get("/metrics").text.splitlines()
+
+    assert 'ocr_worker_pending{worker="0"} 1' in lines
+    assert 'ocr_model_resident_bytes{process="0"} 2048' in lines
+    assert 'ocr_model_load_seconds{process="0",model="stub_en_False"} 0.5' in lines
+    assert 'ocr_model_lookups_total{process="0",result="hit"} 4' in lines
+    assert not any('process="1"' in line for line in lines)
+
+
+def test_full_executor_sheds_load_with_503(client, monkeypatch):
+    executor = InferenceExecutor(max_workers=1, max_queue=0, retry_after=9)
+    monkeypatch.setattr(service, "inference_executor", executor)
+    release = threading.Event()
+    busy = threading.Thread(target=executor.call_admitted, args=(release.wait, 5))
+    busy.start()
+    try:
+        for _ in range(500):
+            if executor.stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+        response = client.post("/ocr/extract", files={"file": ("a.png", png(), "image/png")})
+    finally:
+        release.set()
+        busy.join()
+        executor.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "9"
+    assert executor.stats()["rejected"] == 1
+
+
+def test_structure_endpoint_returns_tables(client, monkeypatch):
+    class Result(dict):
+        markdown = {"markdown_texts": "| M8 |", "markdown_images": {}}
+
+    class Model:
+        def predict(self, image):
+            return [Result(table_res_list=[table], layout_det_res=None)]
+
+    table = {"table_region_id": 0, "pred_html": "<table><tr><td>M8</td></tr></table>", "cell_box_list": []}
+    monkeypatch.setattr(service.inference, "get_structure_model", lambda use_gpu=False: Model())
+
+    response = client.post("/ocr/structure", files={"file": ("sheet.png", png(), "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["markdown"] == "| M8 |"
+    assert body["tables"] == [{"page": 0, "region_id": 0, "html": table["pred_html"], "cell_boxes": []}]
+
+
+@pytest.mark.parametrize("rois", ["not json", "[[1, 2, 3]]", '{"x_min": 0}'])
+def test_extract_rejects_malformed_rois(client, rois):
+    response = client.post("/ocr/extract", files={"file": ("sheet.png", png(), "image/png")}, data={"rois": rois})
+
+    assert response.status_code == 400
+    assert "Invalid rois" in response.json()["detail"]
+
+
+def test_extract_ocrs_only_explicit_rois(client):
+    rois = '[{"label": "title", "x_min": 0.5, "y_min": 0.5, "x_max": 1, "y_max": 1}]'
+
+    response = client.post("/ocr/extract", files={"file": ("sheet.png", png(), "image/png")}, data={"rois": rois})
+
+    assert response.status_code == 200
+    regions = response.json()["regions"]
+    assert [region["label"] for region in regions] == ["title"]
+    assert regions[0]["coordinates"] == {"x_min": 100, "y_min": 60, "x_max": 200, "y_max": 120}
@@ -0,0 +1,89 @@
+import io
+import itertools
+import json
+
+import pytest
+
+from utils import batch_analysis
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+TEXTS = [
+    "M8x1.25 socket head cap screw ISO 4762 A2-70",
+    "",
+    "Qty 4 pcs 25 mm stainless steel 316",
+    "1/4-20 UNC grade 8",
+    "no specifications here",
+] * 3
+
+
+@pytest.fixture(scope="module")
+def expected():
+    analyzer = TechnicalTextAnalyzer()
+    return [analyzer.extract_technical_specifications(text) for text in TEXTS]
+
+
+def without_timing(specs):
+    return [{key: value for key, value in spec.items() if key != "processing_time"} for spec in specs]
+
+
+def test_in_process_results_match_the_analyzer(expected):
+    results = list(batch_analysis.analyze_texts(TEXTS))
+
+    assert without_timing(results) == without_timing(expected)
+
+
+def test_process_pool_keeps_input_order(expected):
+    results = list(batch_analysis.analyze_texts(TEXTS, processes=2, chunk_size=2))
+
+    assert without_timing(results) == without_timing(expected)
+
+
+def test_process_pool_reads_texts_lazily():
+    consumed = []
+
+    def texts():
+        for index in itertools.count():
+            consumed.append(index)
+            yield f"M{index + 1}x1.5 bolt"
+
+    results = batch_analysis.analyze_texts(texts(), processes=2, chunk_size=4)
+    first = next(results)
+    results.close()
+
+    assert first["threads"]
+    # At most two chunks per process in flight, plus the one being filled
+    assert len(consumed) <= (2 * 2 + 1) * 4 + 1
+
+
+def test_run_jsonl_writes_errors_in_input_order():
+    source = io.StringIO("\n".join([
+        json.dumps({"id": 1, "text": "M8x1.25 bolt"}),
+        "{not json",
+        json.dumps("M10x1.5 nut"),
+        "",
+        json.dumps({"id": 4, "body": "no text field"}),
+        json.dumps({"id": 5, "text": "M12x1.75 washer"}),
+    ]) + "\n")
+    sink = io.StringIO()
+
+    counts = batch_analysis.run_jsonl(source, sink)
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert counts == {"analyzed": 3, "failed": 2}
+    assert [line.get("id", line.get("line")) for line in lines] == [1, 2, None, 5, 5]
+    assert "Invalid JSON" in lines[1]["error"]
+    assert "specifications" in lines[2] and "text" not in lines[2]
+    assert lines[3] == {"line": 5, "error": "Expected an object with a string 'text' field"}
+    assert lines[4]["specifications"]["threads"]
+
+
+def test_run_jsonl_keeps_text_and_trailing_errors():
+    source = io.StringIO(json.dumps({"body": "M8x1.25 bolt"}) + "\n" + "[1, 2]\n")
+    sink = io.StringIO()
+
+    counts = batch_analysis.run_jsonl(source, sink, text_field="body", keep_text=True)
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert counts == {"analyzed": 1, "failed": 1}
+    assert lines[0]["body"] == "M8x1.25 bolt"
+    assert lines[1]["line"] == 2
@@ -0,0 +1,114 @@
+import argparse
+import json
+
+import pytest
+
+from benchmarks import harness
+
+
+@pytest.mark.parametrize("values, fraction, expected", [
+    ([], 0.5, 0.0),
+    ([3.0], 0.99, 3.0),
+    ([4.0, 1.0, 3.0, 2.0], 0.5, 2.5),
+    ([1.0, 2.0, 3.0, 4.0, 5.0], 0.95, 4.8),
+    ([1.0, 2.0], 1.0, 2.0),
+    ([1.0, 2.0], 0.0, 1.0),
+])
+def test_percentile_interpolates_linearly(values, fraction, expected):
+    assert harness.percentile(values, fraction) == pytest.approx(expected)
+
+
+def test_summarize_latencies_reports_milliseconds():
+    summary = harness.summarize_latencies([0.001 * value for value in range(1, 101)])
+
+    assert summary == {"p50_ms": 50.5, "p95_ms": 95.05, "p99_ms": 99.01}
+
+
+def test_peak_rss_of_this_process():
+    assert harness.peak_rss_mib() > 0
+
+
+def test_time_calls_runs_warmup_untimed():
+    calls = []
+
+    timings = harness.time_calls(lambda: calls.append(1), repeat=3, warmup=2)
+
+    assert len(calls) == 5
+    assert len(timings) == 3 and all(seconds >= 0 for seconds in timings)
+
+
+def test_compare_flags_changes_in_the_worse_direction_only():
+    baseline = {
+        "extract/c1": {"p50_ms": 100.0, "throughput": 10.0, "peak_rss_mib": 500.0, "requests": 64},
+        "removed": {"p50_ms": 1.0},
+    }
+    current = {
+        "extract/c1": {"p50_ms": 120.0, "throughput": 12.0, "peak_rss_mib": 510.0, "requests": 32},
+        "added": {"p50_ms": 1.0},
+    }
+
+    rows = harness.compare(baseline, current, tolerance=0.15)
+
+    by_metric = {row["metric"]: row for row in rows}
+    assert set(by_metric) == {"p50_ms", "throughput", "peak_rss_mib"}
+    assert by_metric["p50_ms"]["change"] == pytest.approx(0.2)
+    assert by_metric["p50_ms"]["regression"]
+    # Higher throughput is better, however much it changed
+    assert by_metric["throughput"]["change"] == pytest.approx(0.2)
+    assert not by_metric["throughput"]["regression"]
+    assert not by_metric["peak_rss_mib"]["regression"]
+
+
+def test_compare_treats_lower_throughput_as_regression_and_skips_zero_baselines():
+    rows = harness.compare(
+        {"case": {"throughput": 10.0, "p99_ms": 0.0}},
+        {"case": {"throughput": 8.0, "p99_ms": 5.0}},
+        tolerance=0.15,
+    )
+
+    assert [(row["metric"], row["regression"]) for row in rows] == [("throughput", True)]
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    cases = {"extract/c1": {"p50_ms": 10.0, "throughput": 5.0}}
+
+    harness.save_baseline(path, "load_test", cases, {"requests": 64})
+
+    baseline = harness.load_baseline(path, "load_test")
+    assert baseline["cases"] == cases
+    assert baseline["settings"] == {"requests": 64}
+    assert set(baseline["environment"]) == {"python", "platform", "machine", "cpus"}
+    with pytest.raises(ValueError, match="not 'pipeline'"):
+        harness.load_baseline(path, "pipeline")
+
+
+def test_finish_exits_nonzero_on_regression(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    harness.save_baseline(path, "load_test", {"case": {"p95_ms": 100.0}}, {"requests": 64})
+
+    assert harness.finish("load_test", {"case": {"p95_ms": 105.0}}, {"requests": 64}, None, path, 0.15) == 0
+    assert harness.finish("load_test", {"case": {"p95_ms": 150.0}}, {"requests": 32}, None, path, 0.15) == 1
+
+    output = capsys.readouterr().out
+    assert "REGRESSION  case  p95_ms: 100.00 -> 150.00 (+50.0%)" in output
+    assert "different settings" in output
+
+
+def test_finish_saves_after_comparing(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    harness.save_baseline(path, "load_test", {"case": {"p50_ms": 100.0}}, {})
+
+    assert harness.finish("load_test", {"case": {"p50_ms": 200.0}}, {}, path, path, 0.15) == 1
+
+    with open(path) as f:
+        assert json.load(f)["cases"] == {"case": {"p50_ms": 200.0}}
+
+
+def test_baseline_arguments():
+    parser = argparse.ArgumentParser()
+    harness.add_baseline_arguments(parser)
+
+    args = parser.parse_args(["--compare", "old.json", "--tolerance", "0.3"])
+
+    assert (args.save, args.compare, args.tolerance) == (None, "old.json", 0.3)
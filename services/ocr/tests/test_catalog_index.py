@@ -0,0 +1,201 @@
+import json
+import os
+import random
+import sqlite3
+import string
+import time
+
+import pytest
+
+from utils.catalog_index import Catalog, CatalogStore, _variants, catalog_key, load_catalog
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+COMPONENTS = [
+    {"id": "c1", "name": "Socket head cap screw", "manufacturer": "Acme", "partNumber": "SHCS-M8-25",
+     "sku": "100234", "standard": "ISO 4762, DIN 912"},
+    {"id": "c2", "name": "Hex nut", "manufacturer": "Acme", "partNumber": "HN-M8", "standard": "ISO 4032"},
+    {"id": "c3", "name": "Hex nut, other supplier", "manufacturer": "Bolt & Co", "partNumber": "hn m8",
+     "standard": "ISO 4032"},
+    {"id": "c4", "name": "Washer", "manufacturer": None, "partNumber": "WSH-1000A", "standard": "ISO 7089; "},
+    {"id": "c5", "name": "Washer", "manufacturer": None, "partNumber": "WSH-1000B"},
+]
+
+
+def write_jsonl(path, components):
+    with open(path, "w", encoding="utf-8") as f:
+        for component in components:
+            f.write(json.dumps(component) + "\n")
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / "catalog.jsonl")
+    write_jsonl(path, COMPONENTS)
+    return load_catalog(path)
+
+
+def test_catalog_key():
+    assert catalog_key("shcs-m8 25") == "SHCSM825"
+    assert catalog_key("abc123") == "ABC123"
+    assert catalog_key(" - ") == ""
+
+
+def test_exact_lookup_returns_every_entry_with_the_key(catalog):
+    match = catalog.resolve_part_number("hn-m8")
+
+    assert match.distance == 0
+    assert match.value == "HN-M8"
+    assert [entry["id"] for entry in match.entries] == ["c2", "c3"]
+    assert match.entries[1] == {"part_number": "hn m8", "id": "c3", "name": "Hex nut, other supplier",
+                                "manufacturer": "Bolt & Co"}
+
+
+def test_sku_and_missing_fields(catalog):
+    assert catalog.resolve_part_number("100234").entries[0]["id"] == "c1"
+    assert catalog.resolve_part_number("WSH-1000A").entries[0]["manufacturer"] == ""
+
+
+@pytest.mark.parametrize("candidate", ["SHCS-M8-2S", "SHCS-M8-5", "SHCS-M8-255", "SHCS-8M-25"])
+def test_one_edit_away_resolves(catalog, candidate):
+    match = catalog.resolve_part_number(candidate)
+
+    assert (match.value, match.distance) == ("SHCS-M8-25", 1)
+
+
+def test_fuzzy_lookup_refuses_to_guess_or_match_short_keys(catalog):
+    # One substitution away from both washers
+    assert catalog.resolve_part_number("WSH-1000C") is None
+    # Too short for fuzzy matching, though only one edit from HN-M8
+    assert catalog.resolve_part_number("HN-M9") is None
+    assert catalog.resolve_part_number("SHCS-M8-2S", max_distance=0) is None
+    assert catalog.resolve_part_number("--") is None
+
+
+def test_standards_are_split_and_deduplicated(catalog):
+    assert catalog.size == {"part_numbers": 6, "standards": 4}
+    assert catalog.resolve_standard("din912") == ("DIN 912", 0, [])
+    assert catalog.resolve_standard("ISO 4O32") == ("ISO 4032", 1, [])
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Reference: optimal string alignment distance of at most 1."""
+    if a == b:
+        return True
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 1 or (
+            len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+        )
+    if abs(len(a) - len(b)) != 1:
+        return False
+    short, long = (a, b) if len(a) < len(b) else (b, a)
+    return any(long[:i] + long[i + 1:] == short for i in range(len(long)))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fuzzy_lookup_matches_brute_force(seed):
+    rng = random.Random(seed)
+    alphabet = "ABC123"
+    keys = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(5, 7))) for _ in range(300)})
+    catalog = Catalog(((key, {"id": key}) for key in keys), [])
+
+    for _ in range(300):
+        candidate = "".join(rng.choice(alphabet) for _ in range(rng.randint(5, 7)))
+        close = [key for key in keys if within_one_edit(candidate, key)]
+
+        match = catalog.resolve_part_number(candidate)
+
+        if candidate in keys:
+            assert match.value == candidate and match.distance == 0
+        elif len(close) == 1:
+            assert match.value == close[0] and match.distance == 1
+        else:
+            assert match is None
+
+
+def test_variants_are_exactly_one_edit_away():
+    variants = set(_variants("AB1", "AB1"))
+
+    assert "AB1" not in variants
+    assert {"B1", "BA1", "AA1", "AB11", "1AB1"} <= variants
+    assert all(within_one_edit("AB1", variant) for variant in variants)
+
+
+def test_sqlite_snapshot(tmp_path):
+    path = str(tmp_path / "catalog.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE components (id TEXT, name TEXT, "partNumber" TEXT, standard TEXT)')
+    conn.execute("INSERT INTO components VALUES ('c1', 'Pin', 'PIN-0042', 'ISO 8734')")
+    conn.commit()
+    conn.close()
+
+    catalog = load_catalog(path)
+
+    assert catalog.resolve_part_number("PIN-0042").entries == [
+        {"part_number": "PIN-0042", "id": "c1", "name": "Pin", "manufacturer": ""}
+    ]
+    assert catalog.resolve_standard("iso 8734").value == "ISO 8734"
+
+
+def test_sqlite_snapshot_without_components_table(tmp_path):
+    path = str(tmp_path / "empty.db")
+    sqlite3.connect(path).close()
+
+    with pytest.raises(ValueError, match="no components table"):
+        load_catalog(path)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_store_swaps_in_a_rebuilt_index_when_the_snapshot_changes(tmp_path):
+    path = str(tmp_path / "catalog.jsonl")
+    write_jsonl(path, COMPONENTS[:1])
+    store = CatalogStore(path, reload_interval=0)
+    wait_until(lambda: store.get() is not None)
+    first = store.get()
+    assert first.resolve_part_number("HN-M8") is None
+
+    replacement = str(tmp_path / "catalog.jsonl.tmp")
+    write_jsonl(replacement, COMPONENTS)
+    os.replace(replacement, path)
+
+    wait_until(lambda: store.get() is not first)
+    assert store.get().resolve_part_number("HN-M8").value == "HN-M8"
+
+
+def test_store_keeps_the_previous_index_when_a_snapshot_is_unreadable(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE components ("partNumber" TEXT)')
+    conn.execute("INSERT INTO components VALUES ('PIN-0042')")
+    conn.commit()
+    conn.close()
+    store = CatalogStore(path, reload_interval=float("inf"))
+    assert store.reload()
+    previous = store.get()
+
+    with open(path, "wb") as f:
+        f.write(b"not a database")
+
+    assert not store.reload()
+    assert store.get() is previous
+
+
+def test_analyzer_resolves_candidates_against_the_catalog(tmp_path):
+    path = str(tmp_path / "catalog.jsonl")
+    write_jsonl(path, COMPONENTS)
+    store = CatalogStore(path, reload_interval=float("inf"))
+    store.reload()
+    analyzer = TechnicalTextAnalyzer(catalog=store)
+
+    specs = analyzer.extract_technical_specifications("Screw per ISO 4762 and DIN 913")
+
+    assert specs["catalog"] == {"standards": [
+        {"candidate": "iso 4762", "value": "ISO 4762", "distance": 0},
+        {"candidate": "din 913", "value": "DIN 912", "distance": 1},
+    ]}
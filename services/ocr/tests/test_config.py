@@ -0,0 +1,37 @@
+import importlib
+
+import pytest
+
+import config
+
+
+@pytest.fixture
+def reload_config(monkeypatch):
+    def reload(**environment):
+        for key, value in environment.items():
+            monkeypatch.setenv(key, value)
+        return importlib.reload(config)
+
+    yield reload
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_worker_preload_follows_the_process_settings(reload_config):
+    settings = reload_config(OCR_PRELOAD_LANGUAGES="en, de", OCR_PRELOAD_STRUCTURE="true")
+
+    assert settings.WORKER_PRELOAD_LANGUAGES == ["en", "de"]
+    assert settings.WORKER_PRELOAD_STRUCTURE is True
+
+
+def test_worker_preload_can_be_set_separately(reload_config):
+    settings = reload_config(
+        OCR_PRELOAD_LANGUAGES="en",
+        OCR_WORKER_PRELOAD_LANGUAGES="fr,ch",
+        OCR_PRELOAD_STRUCTURE="true",
+        OCR_WORKER_PRELOAD_STRUCTURE="no"
+    )
+
+    assert settings.PRELOAD_LANGUAGES == ["en"]
+    assert settings.WORKER_PRELOAD_LANGUAGES == ["fr", "ch"]
+    assert settings.WORKER_PRELOAD_STRUCTURE is False
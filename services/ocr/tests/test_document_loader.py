@@ -0,0 +1,89 @@
+import io
+import json
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+from utils import document_loader
+from utils.image_decoder import ImageTooLargeError
+
+
+def frames(count: int, size=(120, 80)):
+    return [Image.new("RGB", size, (index * 40, 255, 255)) for index in range(count)]
+
+
+def tiff(count: int, size=(120, 80)) -> bytes:
+    first, *rest = frames(count, size)
+    buffer = io.BytesIO()
+    first.save(buffer, format="TIFF", save_all=True, append_images=rest)
+    return buffer.getvalue()
+
+
+def pdf(count: int) -> bytes:
+    first, *rest = frames(count)
+    buffer = io.BytesIO()
+    first.save(buffer, format="PDF", save_all=True, append_images=rest, resolution=72)
+    return buffer.getvalue()
+
+
+def test_detect_format():
+    assert document_loader.detect_format(tiff(1)) == "tiff"
+    assert document_loader.detect_format(pdf(1)) == "pdf"
+    assert document_loader.detect_format(b"\x89PNG\r\n") == "image"
+
+
+@pytest.mark.parametrize("make", [tiff, pdf])
+def test_pages_are_counted_and_rendered_lazily_in_order(make):
+    data = make(3)
+
+    assert document_loader.count_pages(data) == 3
+    pages = list(document_loader.iter_pages(data, dpi=72, start=1))
+    assert [index for index, _ in pages] == [1, 2]
+    for index, page in pages:
+        assert page.shape == (80, 120, 3) and page.dtype == np.uint8
+        assert abs(int(page[40, 60, 0]) - index * 40) <= 2
+
+
+def test_tiff_frames_from_a_memoryview():
+    data = memoryview(tiff(2))
+
+    assert document_loader.count_pages(data) == 2
+    assert document_loader.render_page(data, 1).shape == (80, 120, 3)
+
+
+def test_pixel_budget_is_checked_before_rendering():
+    with pytest.raises(ImageTooLargeError):
+        list(document_loader.iter_pages(pdf(1), dpi=300, max_pixels=120 * 80))
+    with pytest.raises(ImageTooLargeError):
+        document_loader.render_page(tiff(1), max_pixels=100)
+
+
+def test_missing_page_raises_index_error():
+    with pytest.raises(IndexError):
+        document_loader.render_page(tiff(2), 5)
+
+
+def test_multi_page_upload_streams_one_line_per_page(client):
+    response = client.post("/ocr/extract", files={"file": ("drawing.tiff", tiff(3, (400, 300)), "image/tiff")})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["page"] for line in lines[:-1]) == [0, 1, 2]
+    assert all(line["status"] == "success" for line in lines[:-1])
+    assert lines[-1]["summary"]["pages"] == 3
+    assert lines[-1]["summary"]["failed"] == 0
+
+
+def test_multi_page_job_returns_every_page(client):
+    job = client.post("/jobs", files={"file": ("drawing.tiff", tiff(2, (400, 300)), "image/tiff")}).json()
+    for _ in range(500):
+        status = client.get(f"/jobs/{job['job_id']}").json()["status"]
+        if status not in ("queued", "running"):
+            break
+        time.sleep(0.01)
+
+    assert status == "completed"
+    result = client.get(f"/jobs/{job['job_id']}/result").json()
+    assert [page["page"] for page in result["pages"]] == [0, 1]
@@ -0,0 +1,64 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.image_decoder import ImageTooLargeError, decode, probe
+
+
+def encode(extension: str, width: int = 640, height: int = 480) -> bytes:
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[..., 2] = 200  # red in BGR
+    image[:, : width // 2, 0] = 100
+    return cv2.imencode(extension, image)[1].tobytes()
+
+
+def test_decodes_to_rgb_without_scaling():
+    image, info = decode(encode(".png"))
+
+    assert image.shape == (480, 640, 3)
+    assert image[0, -1].tolist() == [200, 0, 0]
+    assert image[0, 0].tolist() == [200, 0, 100]
+    assert (info["decoder"], info["format"], info["source_size"], info["size"], info["reduction"]) == (
+        "opencv", "PNG", [640, 480], [640, 480], 1
+    )
+
+
+def test_decodes_from_a_memoryview():
+    image, _ = decode(memoryview(encode(".png")))
+
+    assert image.shape == (480, 640, 3)
+
+
+def test_oversized_jpeg_is_decoded_at_reduced_scale():
+    image, info = decode(encode(".jpg", 4000, 3000), max_side=1000)
+
+    assert info["reduction"] == 4
+    assert max(image.shape[:2]) == 1000
+    assert info["size"] == [1000, 750]
+
+
+def test_oversized_png_is_downscaled_once():
+    image, info = decode(encode(".png", 3000, 1000), max_side=1500)
+
+    assert (info["reduction"], image.shape) == (1, (500, 1500, 3))
+
+
+def test_pixel_budget_is_checked_from_the_header():
+    data = encode(".png", 3000, 2000)
+
+    assert probe(data) == (3000, 2000, "PNG")
+    with pytest.raises(ImageTooLargeError):
+        decode(data, max_pixels=3000 * 2000 - 1)
+
+
+def test_formats_opencv_cannot_read_fall_back_to_pillow():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (10, 20, 30)).save(buffer, format="TGA")
+
+    image, info = decode(buffer.getvalue())
+
+    assert info["decoder"] == "pillow"
+    assert image[0, 0].tolist() == [10, 20, 30]
@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from utils.image_processor import ImageProcessor
+
+
+@pytest.fixture
+def processor():
+    return ImageProcessor()
+
+
+@pytest.mark.parametrize("shape", [(2, 2), (2, 2, 3), (1, 40, 3), (40, 2), (0, 0, 3)])
+def test_analyze_quality_of_degenerate_image_is_neutral(processor, shape):
+    metrics = processor.analyze_quality(np.full(shape, 200, dtype=np.uint8))
+
+    assert metrics["ink_fraction"] == 0.0
+    assert metrics["sharpness"] == 1.0
+    assert processor.plan_enhancement(metrics) == []
+
+
+@pytest.mark.parametrize("preset", ["auto", "balanced"])
+def test_enhance_degenerate_image_returns_it_unchanged(processor, preset):
+    image = np.zeros((2, 2, 3), dtype=np.uint8)
+
+    enhanced, report = processor.enhance_with_report(image, preset=preset)
+
+    assert enhanced.shape == image.shape
+    assert report["preset"] == preset
+
+
+def test_enhance_falls_back_to_original_when_planning_fails(processor, monkeypatch):
+    image = np.full((32, 32, 3), 255, dtype=np.uint8)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("analysis failed")
+
+    monkeypatch.setattr(processor, "analyze_quality", fail)
+    enhanced, report = processor.enhance_with_report(image, preset="auto")
+
+    assert enhanced is image
+    assert report["error"] == "analysis failed"
+
+
+def test_enhance_rejects_unknown_preset(processor):
+    with pytest.raises(ValueError):
+        processor.enhance_with_report(np.zeros((8, 8), dtype=np.uint8), preset="sharpest")
+
+
+def test_default_preset_matches_service_default(processor):
+    import config
+
+    image = np.full((64, 64, 3), 255, dtype=np.uint8)
+
+    assert processor.enhance_with_report(image)[1]["preset"] == config.ENHANCE_PRESET
+
+
+@pytest.fixture(scope="module")
+def drawing():
+    from benchmarks.synthetic import render_drawing
+
+    return render_drawing(800, 600, seed=3)[0]
+
+
+@pytest.mark.parametrize("preset", ["fast", "balanced", "quality"])
+def test_fixed_presets_run_their_pipeline(processor, drawing, preset):
+    from utils.image_processor import PRESET_PIPELINES
+
+    enhanced, report = processor.enhance_with_report(drawing, preset=preset)
+
+    assert enhanced.shape == drawing.shape and enhanced.dtype == np.uint8
+    assert [step["name"] for step in report["steps"]] == PRESET_PIPELINES[preset]
+    assert "skew" not in report
+
+
+def test_none_preset_returns_the_image_untouched(processor, drawing):
+    enhanced, report = processor.enhance_with_report(drawing, preset="none")
+
+    assert enhanced is drawing
+    assert report["steps"] == []
+
+
+def test_fixed_preset_deskews_only_on_request(processor, drawing):
+    import cv2
+
+    matrix = cv2.getRotationMatrix2D((400, 300), 3.0, 1.0)
+    skewed = cv2.warpAffine(drawing, matrix, (800, 600), borderValue=(255, 255, 255))
+
+    report = processor.enhance_with_report(skewed, preset="fast", deskew="on")[1]
+
+    assert [step["name"] for step in report["steps"]][:2] == ["estimate_skew", "correct_skew"]
+    assert report["skew"]["applied"]
+    assert "skew" not in processor.enhance_with_report(skewed, preset="fast")[1]
+
+
+def test_auto_leaves_a_clean_drawing_alone(processor, drawing):
+    enhanced, report = processor.enhance_with_report(drawing, preset="auto")
+
+    assert enhanced is drawing
+    assert [step["name"] for step in report["steps"]] == ["analyze"]
+    assert report["skew"] == {"angle": 0.0, "confidence": report["metrics"]["skew_confidence"], "applied": False}
+
+
+def test_auto_fixes_what_the_metrics_flag(processor, drawing):
+    from benchmarks.synthetic import degrade
+
+    noisy = degrade(drawing, seed=1)
+    faded = (drawing * 0.3 + 170).astype(np.uint8)
+
+    assert [name for name, _ in processor.plan_steps(noisy)[0]] == ["remove_noise"]
+    assert [name for name, _ in processor.plan_steps(faded)[0]] == ["enhance_contrast"]
+
+
+@pytest.mark.parametrize("metrics, deskew, expected", [
+    ({"noise": 0, "sharpness": 0.3}, "auto", ["sharpen_image"]),
+    ({"noise": 9, "sharpness": 0.3}, "auto", ["remove_noise"]),
+    ({"skew": 2.0, "skew_confidence": 0.9}, "auto", ["correct_skew"]),
+    ({"skew": 2.0, "skew_confidence": 0.9}, "off", []),
+    ({"skew": 2.0, "skew_confidence": 0.2}, "auto", []),
+    ({"skew": 0.2, "skew_confidence": 0.9}, "auto", []),
+    ({"noise": 9, "contrast": 0.1, "ink_fraction": 0.0}, "auto", []),
+])
+def test_plan_enhancement_thresholds(processor, metrics, deskew, expected):
+    clean = {"noise": 0.0, "contrast": 0.9, "sharpness": 1.0, "skew": 0.0, "skew_confidence": 0.9, "ink_fraction": 0.02}
+
+    plan = processor.plan_enhancement({**clean, **metrics}, deskew=deskew)
+
+    assert [name for name, _ in plan] == expected
+
+
+def test_pipeline_matches_running_its_steps_one_by_one(drawing):
+    import cv2
+
+    from utils.image_processor import PIPELINE_STEPS, ProcessingPipeline
+
+    steps = ["median_denoise", "clahe", ("enhance_contrast", {"alpha": 1.2}), "adaptive_threshold", "sharpen_image"]
+    original = drawing.copy()
+
+    fused, timings = ProcessingPipeline(steps).run(drawing)
+
+    expected = cv2.cvtColor(drawing, cv2.COLOR_RGB2GRAY)
+    for step in steps:
+        name, params = (step, {}) if isinstance(step, str) else step
+        expected = PIPELINE_STEPS[name][0](expected, np.empty_like(expected), **params)
+    assert np.array_equal(fused, cv2.cvtColor(expected, cv2.COLOR_GRAY2RGB))
+    assert [timing["name"] for timing in timings] == [s if isinstance(s, str) else s[0] for s in steps]
+    assert np.array_equal(drawing, original)
+
+
+def test_pipeline_output_channels(drawing):
+    import cv2
+
+    from utils.image_processor import ProcessingPipeline
+
+    gray = cv2.cvtColor(drawing, cv2.COLOR_RGB2GRAY)
+
+    assert ProcessingPipeline(["clahe"]).run(drawing)[0].shape == drawing.shape
+    assert ProcessingPipeline(["clahe"], output="gray").run(drawing)[0].shape == gray.shape
+    assert ProcessingPipeline([], output="rgb").run(gray)[0].shape == drawing.shape
+    assert ProcessingPipeline([]).run(gray)[0] is gray
+    # Point-wise steps run in place, but never on the caller's array
+    result = ProcessingPipeline(["enhance_contrast"]).run(gray)[0]
+    assert result is not gray and not np.shares_memory(result, gray)
+
+
+def test_pipeline_rejects_unknown_steps_and_outputs():
+    from utils.image_processor import ProcessingPipeline
+
+    with pytest.raises(ValueError):
+        ProcessingPipeline(["unsharp_mask"])
+    with pytest.raises(ValueError):
+        ProcessingPipeline(["clahe"], output="bgr")
@@ -0,0 +1,147 @@
+import threading
+
+import numpy as np
+import pytest
+
+import config
+import inference
+
+
+def drawing(height: int, width: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    for _ in range(20):
+        y, x = rng.integers(0, height - 8), rng.integers(0, width - 40)
+        image[y:y + 4, x:x + 30] = 0
+    return image
+
+
+@pytest.fixture
+def failing_enhancement(monkeypatch):
+    """Make enhancement raise for images of height 77."""
+    enhance = inference.image_processor.enhance_with_report
+
+    def enhance_with_report(image, *args, **kwargs):
+        if image.shape[0] == 77:
+            raise RuntimeError("broken image")
+        return enhance(image, *args, **kwargs)
+
+    monkeypatch.setattr(inference.image_processor, "enhance_with_report", enhance_with_report)
+
+
+def test_ocr_batch_isolates_failed_enhancement(failing_enhancement):
+    images = [drawing(200, 300, 1), drawing(77, 300, 2), drawing(200, 300, 3)]
+
+    results = inference.ocr_batch(images, backend="stub")
+
+    assert len(results) == 3
+    assert results[1] == {"error": "broken image"}
+    for result in (results[0], results[2]):
+        assert "error" not in result
+        assert result["text"]
+        assert result["preprocessing"]["preset"] == config.ENHANCE_PRESET
+
+
+def test_ocr_batch_results_match_single_image_ocr():
+    images = [drawing(200, 300, seed) for seed in range(3)]
+
+    batched = inference.ocr_batch(images, backend="stub", enhance_preset="none")
+    single = [inference.ocr_array(image, backend="stub", enhance_preset="none") for image in images]
+
+    assert [result["text"] for result in batched] == [result["text"] for result in single]
+
+
+def test_tiled_ocr_skips_failed_tile(monkeypatch):
+    monkeypatch.setattr(config, "TILE_SIZE", 256)
+    monkeypatch.setattr(config, "TILE_OVERLAP", 32)
+    run = inference.ProcessingPipeline.run
+    calls = []
+    lock = threading.Lock()
+
+    def run_failing_once(self, image):
+        with lock:
+            calls.append(image.shape)
+            first = len(calls) == 1
+        if first:
+            raise RuntimeError("tile failed")
+        return run(self, image)
+
+    monkeypatch.setattr(inference.ProcessingPipeline, "run", run_failing_once)
+    result = inference.ocr_array(drawing(600, 600), backend="stub", tile_mode="on", enhance_preset="fast")
+
+    failed = result["preprocessing"]["failed_tiles"]
+    assert len(failed) == 1
+    assert failed[0]["error"] == "tile failed"
+    assert result["preprocessing"]["tiles"] == len(calls)
+    assert result["bounding_boxes"]
+
+
+def test_region_ocr_isolates_failed_region(failing_enhancement):
+    rois = [
+        {"label": "broken", "x_min": 0, "y_min": 0, "x_max": 200, "y_max": 77},
+        {"label": "title_block", "x_min": 0, "y_min": 100, "x_max": 200, "y_max": 300},
+    ]
+
+    result = inference.ocr_array(drawing(300, 300), backend="stub", rois=rois)
+
+    regions = {region["label"]: region for region in result["regions"]}
+    assert regions["broken"]["error"] == "broken image"
+    assert "error" not in regions["title_block"]
+    assert regions["title_block"]["text"]
+    assert result["preprocessing"]["regions"] == 2
+
+
+class FakeStructureResult(dict):
+    """A PaddleOCR 3.x structure result: dict-like, with its page markdown as a property."""
+
+    def __init__(self, text: str, tables=(), boxes=()):
+        super().__init__(table_res_list=list(tables), layout_det_res={"boxes": list(boxes)})
+        self.markdown = {"markdown_texts": text, "markdown_images": {}}
+
+    def save_to_markdown(self, path):
+        raise AssertionError("structure results must not be written to disk")
+
+
+class FakeStructureModel:
+    def __init__(self, results):
+        self.results = results
+
+    def predict(self, image):
+        return iter(self.results)
+
+    def concatenate_markdown_pages(self, pages):
+        return " | ".join(page["markdown_texts"] for page in pages)
+
+
+def test_structure_keeps_markdown_and_tables_of_every_result(monkeypatch):
+    results = [
+        FakeStructureResult(
+            "# Title",
+            tables=[{"table_region_id": 3, "pred_html": "<table></table>", "cell_box_list": [np.array([1, 2, 3, 4])]}],
+            boxes=[{"label": "table", "score": np.float32(0.5), "coordinate": np.array([1.5, 2, 3, 4])}],
+        ),
+        FakeStructureResult("Second page"),
+    ]
+    monkeypatch.setattr(inference, "get_structure_model", lambda use_gpu=False: FakeStructureModel(results))
+
+    result = inference.structure_array(drawing(100, 100))
+
+    assert result["markdown"] == "# Title | Second page"
+    assert result["tables"] == [
+        {"page": 0, "region_id": 3, "html": "<table></table>", "cell_boxes": [[1.0, 2.0, 3.0, 4.0]]}
+    ]
+    assert result["layout_elements"] == [
+        {"type": "table", "confidence": 0.5, "coordinates": [1.5, 2.0, 3.0, 4.0]}
+    ]
+    assert type(result["layout_elements"][0]["confidence"]) is float
+
+
+def test_structure_markdown_of_a_single_result_is_not_concatenated(monkeypatch):
+    model = FakeStructureModel([FakeStructureResult("Only page")])
+    monkeypatch.setattr(inference, "get_structure_model", lambda use_gpu=False: model)
+
+    result = inference.structure_array(drawing(100, 100))
+
+    assert result["markdown"] == "Only page"
+    assert result["tables"] == []
+    assert result["layout_elements"] == []
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.inference_executor import ExecutorSaturatedError, InferenceExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=1, max_queue=1, retry_after=7)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def test_rejects_work_beyond_workers_and_queue(executor):
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError) as error:
+            await executor.run(lambda: "rejected")
+        # Already admitted follow-up work is not limited
+        admitted = asyncio.ensure_future(executor.run_admitted(lambda: "admitted"))
+        release.set()
+        return error.value, await asyncio.gather(running, queued, admitted)
+
+    error, results = asyncio.run(scenario())
+
+    assert error.retry_after == 7
+    assert results == [True, "queued", "admitted"]
+    stats = executor.stats()
+    assert (stats["completed"], stats["rejected"], stats["queued"], stats["in_flight"]) == (3, 1, 0, 0)
+
+
+def test_call_admitted_blocks_on_the_pool_and_counts(executor):
+    names = []
+
+    def work(x):
+        names.append(threading.current_thread().name)
+        return x * 2
+
+    assert executor.call_admitted(work, 21) == 42
+    with pytest.raises(ZeroDivisionError):
+        executor.call_admitted(lambda: 1 / 0)
+
+    assert names[0].startswith("ocr-inference")
+    stats = executor.stats()
+    assert (stats["completed"], stats["failed"]) == (1, 1)
+
+
+def test_retry_after_follows_task_duration(executor):
+    executor.call_admitted(threading.Event().wait, 0.2)
+
+    assert executor._estimate_retry_after() == 1
+    executor._avg_task_seconds = 4.0
+    executor._in_flight = 1
+    assert executor._estimate_retry_after() == 4
+    executor._in_flight = 0
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from utils.job_queue import CANCELLED, COMPLETED, FAILED, QUEUED, RUNNING, JobQueue, JobRunner
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+
+
+def restart(queue: JobQueue) -> JobQueue:
+    """A new queue on the same database, as after a process restart."""
+    return JobQueue(queue.db_path, max_attempts=queue.max_attempts)
+
+
+def test_claims_by_priority_then_age(queue):
+    low = queue.submit("extract", b"a", {})
+    high = queue.submit("extract", b"b", {}, priority=5)
+    later = queue.submit("extract", b"c", {})
+
+    assert [queue.claim()["id"] for _ in range(3)] == [high, low, later]
+    assert queue.claim() is None
+
+
+def test_interrupted_job_is_requeued_with_its_payload(queue):
+    job_id = queue.submit("extract", b"image", {"language": "en"})
+    queue.claim()
+
+    recovered = restart(queue)
+
+    assert recovered.requeue_interrupted() == 1
+    assert recovered.get(job_id)["status"] == QUEUED
+    job = recovered.claim()
+    assert (job["id"], job["payload"], job["params"]) == (job_id, b"image", {"language": "en"})
+    assert recovered.get(job_id)["attempts"] == 2
+
+
+def test_job_interrupted_max_attempts_times_fails(queue):
+    job_id = queue.submit("extract", b"image", {})
+    for _ in range(queue.max_attempts):
+        queue.requeue_interrupted()
+        assert queue.claim()["id"] == job_id
+
+    recovered = restart(queue)
+
+    assert recovered.requeue_interrupted() == 0
+    job = recovered.get(job_id)
+    assert job["status"] == FAILED
+    assert "giving up" in job["error"]
+    assert recovered.claim() is None
+
+
+def test_cancel_queued_and_running_jobs(queue):
+    running = queue.submit("extract", b"a", {})
+    queue.claim()
+    queued = queue.submit("extract", b"b", {})
+
+    assert queue.cancel(queued) == CANCELLED
+    assert queue.cancel(running) == RUNNING
+    assert queue.is_cancel_requested(running)
+    assert queue.cancel("missing") is None
+
+
+def test_result_is_streamed_in_chunks(queue):
+    job_id = queue.submit("extract", b"a", {})
+    queue.claim()
+    queue.complete(job_id, {"text": "x" * 1000})
+
+    chunks = list(queue.iter_result(job_id, chunk_size=100))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == b'{"text": "' + b"x" * 1000 + b'"}'
+
+
+def test_runner_completes_fails_and_cancels(queue):
+    release = threading.Event()
+
+    def slow(payload, params, progress):
+        release.wait(5)
+        progress(0.5)
+        return {}
+
+    handlers = {
+        "echo": lambda payload, params, progress: {"payload": payload.decode(), **params},
+        "broken": lambda payload, params, progress: 1 / 0,
+        "slow": slow,
+    }
+    runner = JobRunner(queue, handlers, poll_interval=0.01)
+    done = queue.submit("echo", b"hi", {"n": 1})
+    broken = queue.submit("broken", b"", {})
+    unknown = queue.submit("missing", b"", {})
+    cancelled = queue.submit("slow", b"", {})
+
+    runner.start()
+    try:
+        for _ in range(500):
+            if queue.get(cancelled)["status"] == RUNNING:
+                break
+            threading.Event().wait(0.01)
+        queue.cancel(cancelled)
+        release.set()
+        for _ in range(500):
+            if queue.get(cancelled)["status"] == CANCELLED:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        runner.stop()
+
+    assert queue.get(done)["status"] == COMPLETED
+    assert b"".join(queue.iter_result(done)) == b'{"payload": "hi", "n": 1}'
+    assert queue.get(broken)["status"] == FAILED
+    assert "Unknown job kind" in queue.get(unknown)["error"]
+    assert queue.get(cancelled)["status"] == CANCELLED
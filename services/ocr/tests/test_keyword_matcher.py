@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from utils.keyword_matcher import KeywordMatch, KeywordMatcher, load_vocabulary
+
+VOCABULARY = {
+    "materials": [
+        {"term": "steel", "synonyms": [], "grade": False},
+        {"term": "stainless steel", "synonyms": ["inox", "ss"], "grade": True},
+        {"term": "A2-70", "synonyms": [], "grade": False},
+    ],
+    "head_types": [
+        {"term": "socket head", "synonyms": ["shcs"], "grade": False},
+        {"term": "head", "synonyms": [], "grade": False},
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher(VOCABULARY)
+
+
+def values(found, category):
+    return [match.value for match in found[category]]
+
+
+def test_longest_term_wins_without_overlaps(matcher):
+    found = matcher.find("Stainless Steel bolt, steel washer")
+
+    assert values(found, "materials") == ["stainless steel", "steel"]
+
+
+def test_only_whole_words_match(matcher):
+    found = matcher.find("steels headless steelhead")
+
+    assert found == {"materials": [], "head_types": []}
+
+
+def test_synonyms_report_their_canonical_term(matcher):
+    found = matcher.find("INOX washer, SHCS")
+
+    assert values(found, "materials") == ["stainless steel"]
+    assert values(found, "head_types") == ["socket head"]
+
+
+def test_categories_match_independently(matcher):
+    found = matcher.find("socket head")
+
+    assert found["head_types"] == [KeywordMatch("head_types", "socket head", 0, 11)]
+    assert found["materials"] == []
+
+
+def test_terms_match_across_separators(matcher):
+    for text in ("A2-70", "a2 70", "A2 - 70"):
+        assert values(matcher.find(text), "materials") == ["a2-70"]
+
+
+def test_grade_number_is_absorbed_only_when_adjacent(matcher):
+    assert values(matcher.find("stainless steel 316 bolt"), "materials") == ["stainless steel 316"]
+    assert values(matcher.find("ss316"), "materials") == ["stainless steel 316"]
+    assert values(matcher.find("stainless steel, 316 bolts"), "materials") == ["stainless steel"]
+    # Only terms marked as graded take a number
+    assert values(matcher.find("steel 42"), "materials") == ["steel"]
+
+
+def test_offsets_point_into_the_original_text(matcher):
+    text = "İİ pan: Stainless  Steel 304 and inox"
+
+    found = matcher.find(text)
+
+    assert [text[match.start:match.end] for match in found["materials"]] == ["Stainless  Steel 304", "inox"]
+
+
+def test_empty_text_and_vocabulary():
+    assert KeywordMatcher(VOCABULARY).find("") == {"materials": [], "head_types": []}
+    assert KeywordMatcher({}).find("steel") == {}
+
+
+def test_first_definition_wins_for_duplicate_phrases():
+    matcher = KeywordMatcher({"materials": [
+        {"term": "brass", "synonyms": ["cuzn"]},
+        {"term": "bronze", "synonyms": ["CuZn"]},
+    ]})
+
+    assert values(matcher.find("cuzn"), "materials") == ["brass"]
+
+
+def test_load_vocabulary_accepts_shorthand(tmp_path):
+    path = tmp_path / "vocabulary.json"
+    path.write_text(json.dumps({"materials": ["brass", {"term": "nylon", "synonyms": ["pa6"], "grade": 1}]}))
+
+    assert load_vocabulary(str(path)) == {"materials": [
+        {"term": "brass", "synonyms": [], "grade": False},
+        {"term": "nylon", "synonyms": ["pa6"], "grade": True},
+    ]}
+
+
+@pytest.mark.parametrize("raw, message", [
+    (["brass"], "must map categories"),
+    ({"materials": "brass"}, "must be a list"),
+    ({"materials": [{"synonyms": ["x"]}]}, "without a term"),
+    ({"materials": [{"term": "brass", "synonyms": "cuzn"}]}, "must be a list of strings"),
+])
+def test_load_vocabulary_rejects_malformed_files(tmp_path, raw, message):
+    path = tmp_path / "vocabulary.json"
+    path.write_text(json.dumps(raw))
+
+    with pytest.raises(ValueError, match=message):
+        load_vocabulary(str(path))
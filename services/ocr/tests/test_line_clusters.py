@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from utils.line_clusters import _expanded, cluster_lines, reading_order
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+
+def box(x_min, y_min, x_max, y_max):
+    return {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max}
+
+
+def pairwise_clusters(boxes):
+    """Reference clustering comparing every pair of lines."""
+    expanded = [_expanded(b) for b in boxes]
+    labels = list(range(len(boxes)))
+    changed = True
+    while changed:
+        changed = False
+        for i, (x0, y0, x1, y1) in enumerate(expanded):
+            for j, (ox0, oy0, ox1, oy1) in enumerate(expanded):
+                if x0 <= ox1 and ox0 <= x1 and y0 <= oy1 and oy0 <= y1 and labels[i] != labels[j]:
+                    labels[i] = labels[j] = min(labels[i], labels[j])
+                    changed = True
+    groups = {}
+    for index, label in enumerate(labels):
+        groups.setdefault(label, set()).add(index)
+    return sorted(sorted(group) for group in groups.values())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_clustering_matches_pairwise_comparison(seed):
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(150):
+        x, y, height = rng.randint(0, 2000), rng.randint(0, 1500), rng.randint(10, 40)
+        boxes.append(box(x, y, x + rng.randint(20, 300), y + height))
+
+    clusters = cluster_lines(boxes)
+
+    assert sorted(sorted(cluster) for cluster in clusters) == pairwise_clusters(boxes)
+
+
+def test_callout_lines_join_while_columns_stay_apart():
+    boxes = [
+        box(100, 100, 300, 120),  # callout, first line
+        box(100, 125, 260, 145),  # callout, second line
+        box(800, 100, 900, 120),  # a column far to the right
+        box(100, 400, 200, 420),  # a note further down
+    ]
+
+    assert cluster_lines(boxes) == [[0, 1], [2], [3]]
+
+
+def test_clusters_are_in_reading_order():
+    boxes = [
+        box(150, 130, 250, 150),  # second row, right
+        box(100, 100, 140, 120),  # first row, left
+        box(145, 102, 260, 122),  # first row, right, slightly lower
+        box(100, 130, 145, 150),  # second row, left
+    ]
+
+    assert cluster_lines(boxes) == [[1, 2, 3, 0]]
+    assert reading_order(boxes, [0, 1, 2, 3]) == [1, 2, 3, 0]
+
+
+def test_empty_and_degenerate_boxes():
+    assert cluster_lines([]) == []
+    assert cluster_lines([box(5, 5, 5, 5), box(5, 5, 5, 5)]) == [[0, 1]]
+
+
+def test_specifications_do_not_match_across_separate_callouts():
+    analyzer = TechnicalTextAnalyzer()
+    quantity = {"text": "QTY 25", "coordinates": box(100, 100, 200, 120)}
+
+    apart = analyzer.extract_from_lines([quantity, {"text": "mm", "coordinates": box(900, 100, 1000, 120)}])
+    together = analyzer.extract_from_lines([quantity, {"text": "mm", "coordinates": box(205, 100, 260, 120)}])
+
+    assert "dimensions" not in apart
+    assert apart["sources"] == {"quantities": [[0]]}
+    assert [dimension["full_spec"] for dimension in together["dimensions"]] == ["25 mm"]
+    assert together["sources"]["dimensions"] == [[0, 1]]
@@ -0,0 +1,108 @@
+import re
+
+import pytest
+
+from utils.metrics import MetricFamily, MetricsRegistry, StageTimer
+
+# HELP text may only escape backslash and newline
+HELP = re.compile(r'^# HELP [a-zA-Z_:][a-zA-Z0-9_:]* ([^\\]|\\[\\n])*$')
+# A sample line of the Prometheus text format: name, optional labels, value
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? \S+$')
+
+
+def parse(text: str):
+    """Exposition text as ``{name: type}`` and a list of sample lines, checking its syntax."""
+    assert text.endswith("\n")
+    types, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types
+            types[name] = kind
+        elif line.startswith("# HELP "):
+            assert HELP.match(line), line
+        else:
+            assert SAMPLE.match(line), line
+            samples.append(line)
+    return types, samples
+
+
+def test_counter_and_gauge_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("endpoint",))
+    in_flight = registry.gauge("in_flight", "Running")
+    requests.inc(endpoint="/b")
+    requests.inc(2, endpoint="/a")
+    in_flight.set(3)
+    in_flight.dec(0.5)
+
+    types, samples = parse(registry.render())
+
+    assert types == {"requests_total": "counter", "in_flight": "gauge"}
+    assert samples == ['requests_total{endpoint="/a"} 2', 'requests_total{endpoint="/b"} 1', "in_flight 2.5"]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="ocr")
+
+    types, samples = parse(registry.render())
+
+    assert types == {"latency_seconds": "histogram"}
+    assert samples == [
+        'latency_seconds_bucket{stage="ocr",le="0.1"} 2',
+        'latency_seconds_bucket{stage="ocr",le="1"} 3',
+        'latency_seconds_bucket{stage="ocr",le="+Inf"} 4',
+        'latency_seconds_sum{stage="ocr"} 3.65',
+        'latency_seconds_count{stage="ocr"} 4',
+    ]
+
+
+def test_help_and_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("files_total", 'Files "seen"\nso far', ("name",)).inc(name='a"b\\c\nd')
+    registry.add_collector(lambda: [MetricFamily("paths", "gauge", 'Under "C:\\data"', [({}, 1)])])
+
+    text = registry.render()
+
+    parse(text)
+    assert '# HELP files_total Files "seen"\\nso far' in text
+    assert 'files_total{name="a\\"b\\\\c\\nd"} 1' in text
+    assert '# HELP paths Under "C:\\\\data"' in text
+
+
+def test_collectors_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    depth = [1]
+    registry.add_collector(lambda: [MetricFamily("queue_depth", "gauge", "Queued", [({"queue": "q"}, depth[0])])])
+
+    depth[0] = 4
+    types, samples = parse(registry.render())
+
+    assert types == {"queue_depth": "gauge"}
+    assert samples == ['queue_depth{queue="q"} 4']
+
+
+def test_misuse_is_rejected():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "C", ("a",))
+
+    with pytest.raises(ValueError):
+        registry.gauge("c_total", "Again")
+    with pytest.raises(ValueError):
+        counter.inc(-1, a="x")
+    with pytest.raises(ValueError):
+        counter.inc(b="x")
+
+
+def test_stage_timer_adds_up_repeated_stages():
+    timer = StageTimer()
+    timer.add("ocr", 0.25)
+    with timer.stage("ocr"):
+        pass
+    timer.add("decode", 0.5)
+
+    assert timer.seconds["decode"] == 0.5
+    assert 0.25 <= timer.seconds["ocr"] < 0.5
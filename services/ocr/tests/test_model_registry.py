@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.model_registry import ModelRegistry
+from utils.ocr_backends import StubBackend
+
+
+class Model:
+    def __init__(self, name: str, memory_bytes=None):
+        self.name = name
+        if memory_bytes is not None:
+            self.memory_bytes = memory_bytes
+
+
+def test_least_recently_used_models_are_evicted_over_budget():
+    registry = ModelRegistry(memory_budget_bytes=250)
+    for key in ("a", "b"):
+        registry.get(key, lambda key=key: Model(key, 100))
+    registry.get("a", lambda: pytest.fail("a is resident"))
+
+    registry.get("c", lambda: Model("c", 100))
+
+    assert registry.keys() == ["a", "c"]
+    stats = registry.stats()
+    assert (stats["evictions"], stats["resident_bytes"], stats["hits"], stats["misses"]) == (1, 200, 1, 3)
+
+
+def test_model_larger_than_the_budget_stays_resident_alone():
+    registry = ModelRegistry(memory_budget_bytes=100)
+    registry.get("small", lambda: Model("small", 50))
+
+    registry.get("large", lambda: Model("large", 500))
+
+    assert registry.keys() == ["large"]
+
+
+def test_reported_size_is_used_even_when_zero():
+    registry = ModelRegistry(default_model_bytes=500 * 2**20)
+
+    registry.get("stub", StubBackend)
+
+    assert registry.stats()["models"]["stub"]["memory_bytes"] == 0
+
+
+def test_unmeasurable_model_falls_back_to_the_default_size(monkeypatch):
+    monkeypatch.setattr("utils.model_registry._rss_bytes", lambda: 0)
+    registry = ModelRegistry(default_model_bytes=123)
+
+    registry.get("paddle", lambda: Model("paddle"))
+
+    assert registry.stats()["models"]["paddle"]["memory_bytes"] == 123
+
+
+def test_concurrent_requests_build_a_key_once_and_loads_do_not_overlap():
+    registry = ModelRegistry()
+    builds = []
+    loading = threading.Lock()
+
+    def factory(key):
+        assert loading.acquire(blocking=False), "two models loading at once"
+        try:
+            builds.append(key)
+            time.sleep(0.02)
+            return Model(key, 1)
+        finally:
+            loading.release()
+
+    keys = ["a", "b", "a", "c", "b", "a"] * 3
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        models = list(pool.map(lambda key: registry.get(key, lambda: factory(key)), keys))
+
+    assert sorted(builds) == ["a", "b", "c"]
+    assert [model.name for model in models] == keys
+
+
+def test_preload_skips_failures_and_marks_ready():
+    registry = ModelRegistry()
+
+    def broken():
+        raise RuntimeError("no engine")
+
+    assert not registry.ready
+    assert registry.preload([("ok", lambda: Model("ok", 1)), ("broken", broken)]) == ["ok"]
+    assert registry.ready
+    assert registry.keys() == ["ok"]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.ocr_backends import (
+    OnnxBackend, StubBackend, _order_points, _reading_order, available_backends, resolve_backend
+)
+
+
+def test_stub_is_only_available_when_allowed():
+    assert "stub" not in available_backends()
+    assert "stub" in available_backends(allow_stub=True)
+
+
+def test_resolving_the_stub_requires_it_to_be_allowed():
+    with pytest.raises(ValueError):
+        resolve_backend("stub")
+    assert resolve_backend("stub", allow_stub=True) == "stub"
+
+
+def test_auto_never_picks_the_stub():
+    assert resolve_backend("auto", allow_stub=True) in ("onnx", "paddle")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_backend("tesseract", allow_stub=True)
+
+
+def test_stub_is_deterministic_per_image():
+    rng = np.random.default_rng(0)
+    first = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    second = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    backend = StubBackend(lines=5)
+
+    pages = backend.predict([first, second, first])
+
+    assert pages[0] == pages[2]
+    assert pages[0].texts != pages[1].texts
+    assert all(len(page.texts) == len(page.scores) == len(page.polygons) == 5 for page in pages)
+
+
+def test_ctc_decode_collapses_repeats_and_drops_blanks():
+    backend = OnnxBackend.__new__(OnnxBackend)
+    backend.characters = ["", "a", "b", " "]
+    steps = [1, 1, 0, 1, 2, 2, 0, 0, 3]
+    probabilities = np.full((len(steps), 4), 0.05, dtype=np.float32)
+    probabilities[np.arange(len(steps)), steps] = 0.9
+
+    text, score = backend._ctc_decode(probabilities)
+
+    assert text == "aab "
+    assert score == pytest.approx(0.9)
+    assert backend._ctc_decode(np.eye(4, dtype=np.float32)[[0, 0]]) == ("", 0.0)
+
+
+def test_order_points_starts_top_left_clockwise():
+    points = np.float32([[10, 20], [0, 0], [10, 0], [0, 20]])
+
+    assert _order_points(points).tolist() == [[0, 0], [10, 0], [10, 20], [0, 20]]
+
+
+def test_reading_order_is_row_major_with_tolerance():
+    def box(x, y):
+        return np.float32([[x, y], [x + 5, y], [x + 5, y + 5], [x, y + 5]])
+
+    boxes = [box(50, 3), box(0, 40), box(0, 0), box(20, 8)]
+
+    assert [tuple(b[0]) for b in _reading_order(boxes)] == [(0, 0), (20, 8), (50, 3), (0, 40)]
@@ -0,0 +1,86 @@
+import types
+
+import pytest
+
+from utils import result_cache
+from utils.result_cache import LocalRedis, ResultCache, create_redis_client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(result_cache, "time", clock)
+    return clock
+
+
+class BrokenRedis:
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("down")
+
+
+def test_key_depends_on_image_and_options_not_their_order():
+    key = ResultCache.make_key(b"image", language="en", preset="auto")
+
+    assert key == ResultCache.make_key(b"image", preset="auto", language="en")
+    assert key != ResultCache.make_key(b"image", language="de", preset="auto")
+    assert key != ResultCache.make_key(b"other", language="en", preset="auto")
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResultCache(ttl_seconds=60)
+    cache.set("k", {"text": "M8"})
+
+    clock.now += 59
+    assert cache.get("k") == {"text": "M8"}
+    clock.now += 1
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_shared_tier_expires_too(clock):
+    shared = LocalRedis()
+    shared.set("a", b"1", ex=10)
+
+    clock.now += 9
+    assert shared.get("a") == b"1"
+    clock.now += 1
+    assert shared.get("a") is None
+
+
+def test_local_tier_is_bounded_by_entries_and_bytes():
+    cache = ResultCache(max_entries=2, max_bytes=30)
+    cache.set("a", {"t": "a"})
+    cache.set("b", {"t": "b"})
+    cache.get("a")
+    cache.set("c", {"t": "c"})
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ({"t": "a"}, None, {"t": "c"})
+
+    cache.set("large", {"t": "x" * 100})
+    assert cache.get("large") is None
+    assert cache.stats()["bytes"] <= 30
+
+
+def test_shared_hits_fill_the_local_tier():
+    shared = create_redis_client("memory://")
+    ResultCache(redis_client=shared).set("k", {"text": "ISO 4762"})
+    cache = ResultCache(redis_client=shared)
+
+    assert cache.get("k") == {"text": "ISO 4762"}
+    assert cache.get("k") == {"text": "ISO 4762"}
+    stats = cache.stats()
+    assert (stats["shared_hits"], stats["local_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_shared_tier_errors_are_misses():
+    cache = ResultCache(redis_client=BrokenRedis())
+
+    cache.set("k", {"text": "x"})
+    cache.clear()
+
+    assert cache.get("k") is None
+    assert cache.stats()["shared_errors"] == 2
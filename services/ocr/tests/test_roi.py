@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+import pytest
+
+from utils import roi
+
+
+def ruled_table(image: np.ndarray, x: int, y: int, rows: int, columns: int, cell_w: int, cell_h: int) -> None:
+    for row in range(rows + 1):
+        cv2.line(image, (x, y + row * cell_h), (x + columns * cell_w, y + row * cell_h), 0, 2)
+    for column in range(columns + 1):
+        cv2.line(image, (x + column * cell_w, y), (x + column * cell_w, y + rows * cell_h), 0, 2)
+
+
+def sheet() -> np.ndarray:
+    """A framed sheet with a BOM at the top right, a title block at the bottom right and a part in the middle."""
+    image = np.full((1200, 1600, 3), 255, dtype=np.uint8)
+    cv2.rectangle(image, (10, 10), (1589, 1189), (0, 0, 0), 3)
+    ruled_table(image, 1189, 12, rows=4, columns=4, cell_w=100, cell_h=30)
+    ruled_table(image, 1089, 1067, rows=4, columns=5, cell_w=100, cell_h=30)
+    cv2.circle(image, (600, 600), 200, (0, 0, 0), 3)
+    cv2.putText(image, "M8x1.25", (500, 600), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    return image
+
+
+def contains(region, x_min, y_min, x_max, y_max) -> bool:
+    box = region["coordinates"]
+    return box["x_min"] <= x_min and box["y_min"] <= y_min and box["x_max"] >= x_max and box["y_max"] >= y_max
+
+
+def test_detect_table_regions_finds_title_block_and_bom():
+    regions = roi.detect_table_regions(sheet())
+
+    assert [region["label"] for region in regions] == ["title_block", "table"]
+    assert all(region["source"] == "detected" for region in regions)
+    assert contains(regions[0], 1089, 1067, 1589, 1187)
+    assert contains(regions[1], 1189, 12, 1589, 132)
+    # The part drawing in the middle stays out of both regions
+    assert all(region["coordinates"]["x_min"] > 800 for region in regions)
+
+
+def test_detect_table_regions_on_downsampled_sheet_maps_back_to_full_resolution():
+    large = cv2.resize(sheet(), None, fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
+
+    regions = roi.detect_table_regions(large)
+
+    assert regions[0]["label"] == "title_block"
+    assert contains(regions[0], 2 * 1089 + 8, 2 * 1067 + 8, 2 * 1589 - 8, 2 * 1187 - 8)
+
+
+def test_detect_table_regions_on_blank_or_unruled_sheet():
+    blank = np.full((400, 600), 255, dtype=np.uint8)
+    text_only = blank.copy()
+    cv2.putText(text_only, "NO TABLES HERE", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+
+    assert roi.detect_table_regions(blank) == []
+    assert roi.detect_table_regions(text_only) == []
+
+
+def test_normalize_rois_accepts_pixels_fractions_and_labels():
+    regions = roi.normalize_rois(
+        [[10, 20, 110, 220], {"label": "title", "x_min": 0.5, "y_min": 0.5, "x_max": 1, "y_max": 1}],
+        width=400,
+        height=300,
+    )
+
+    assert regions == [
+        {"label": "roi_0", "source": "client", "coordinates": {"x_min": 10, "y_min": 20, "x_max": 110, "y_max": 220}},
+        {"label": "title", "source": "client", "coordinates": {"x_min": 200, "y_min": 150, "x_max": 400, "y_max": 300}},
+    ]
+
+
+def test_normalize_rois_clamps_reversed_boxes_and_drops_empty_ones():
+    regions = roi.normalize_rois([[500, 250, 300, -10], [900, 900, 950, 950]], width=400, height=300)
+
+    assert [region["coordinates"] for region in regions] == [{"x_min": 300, "y_min": 0, "x_max": 400, "y_max": 250}]
+
+
+@pytest.mark.parametrize("rois, message", [
+    ({"x_min": 0}, "must be a list"),
+    ([[1, 2, 3]], "ROI 0 must be"),
+    ([[1, 2, 3, "x"]], "ROI 0 must contain four numbers"),
+    ([[0, 0, 1, 1], {"x_min": 0, "y_min": 0, "x_max": 1}], "ROI 1 needs numeric"),
+])
+def test_parse_rois_rejects_malformed_regions(rois, message):
+    with pytest.raises(ValueError, match=message):
+        roi.parse_rois(rois)
+
+
+def test_regions_from_layout_keeps_tables_and_labels_the_corner_one_title_block():
+    boxes = [
+        {"label": "table", "score": 0.9, "coordinate": [700, 20, 990, 100]},
+        {"label": "text", "score": 0.9, "coordinate": [100, 100, 300, 140]},
+        {"label": "table", "score": 0.8, "coordinate": [600, 600, 995, 795]},
+        {"label": "table", "score": 0.5, "coordinate": [50, 50, 50.5, 50.5]},
+    ]
+
+    regions = roi.regions_from_layout(boxes, width=1000, height=800)
+
+    assert [region["label"] for region in regions] == ["title_block", "table"]
+    assert regions[0]["coordinates"] == {"x_min": 596, "y_min": 596, "x_max": 999, "y_max": 799}
+    assert regions[1]["coordinates"] == {"x_min": 696, "y_min": 16, "x_max": 994, "y_max": 104}
+    assert all(region["source"] == "layout" for region in regions)
+    assert len(roi.regions_from_layout(boxes, width=1000, height=800, labels=None)) == 3
@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import render_drawing
+from utils.image_processor import ImageProcessor
+from utils.skew import estimate_skew
+
+
+@pytest.fixture(scope="module")
+def page():
+    return cv2.cvtColor(render_drawing(1200, 900, seed=1)[0], cv2.COLOR_RGB2GRAY)
+
+
+def rotate(gray: np.ndarray, degrees: float) -> np.ndarray:
+    """Rotate counter-clockwise, so content runs up to the right for positive ``degrees``."""
+    height, width = gray.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), degrees, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), borderValue=255)
+
+
+@pytest.mark.parametrize("degrees", [-4.0, -1.5, 0.0, 0.7, 3.3])
+def test_estimates_the_skew_of_a_rotated_page(page, degrees):
+    estimate = estimate_skew(rotate(page, degrees))
+
+    # Content running down to the right (clockwise rotation) is a positive skew
+    assert estimate["angle"] == pytest.approx(-degrees, abs=0.1)
+    assert estimate["confidence"] > 0.5
+
+
+def test_large_pages_are_estimated_on_a_downsampled_copy(page):
+    large = cv2.resize(page, None, fx=3, fy=3, interpolation=cv2.INTER_NEAREST)
+
+    assert estimate_skew(rotate(large, 2.0))["angle"] == pytest.approx(-2.0, abs=0.1)
+
+
+def test_skew_beyond_the_search_range_is_clamped(page):
+    assert abs(estimate_skew(rotate(page, 8.0), max_skew=3.0)["angle"]) <= 3.0
+
+
+@pytest.mark.parametrize("image", [
+    np.full((500, 500), 255, dtype=np.uint8),
+    np.zeros((500, 500), dtype=np.uint8),
+    (np.random.default_rng(0).random((500, 500)) > 0.9).astype(np.uint8) * 255,
+])
+def test_blank_or_unstructured_images_have_no_confident_skew(image):
+    estimate = estimate_skew(image)
+
+    assert estimate["confidence"] < 0.2
+
+
+def test_correcting_the_estimated_skew_straightens_the_page(page):
+    skewed = cv2.cvtColor(rotate(page, 2.5), cv2.COLOR_GRAY2RGB)
+
+    straightened = ImageProcessor().correct_skew(skewed)
+
+    assert straightened.shape == skewed.shape
+    assert estimate_skew(cv2.cvtColor(straightened, cv2.COLOR_RGB2GRAY))["angle"] == pytest.approx(0.0, abs=0.1)
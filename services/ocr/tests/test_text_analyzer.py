@@ -0,0 +1,108 @@
+"""
+The pattern scanner against the analyzer it replaced.
+
+``data/analyzer_baseline.json`` is a frozen record of the original
+analyzer, which ran ``re.finditer`` once per pattern: for a fixed corpus of
+normalized texts (edge cases plus seeded texts from
+``benchmarks.text_analyzer.random_text``), the threads, dimensions,
+standards, strength grades and quantities it extracted. Those categories
+come from the scanner alone. Materials, head and drive types are matched
+by the vocabulary trie and part numbers by stricter patterns, so they are
+not compared. Normalization is also not compared, because the corpus is
+stored already normalized.
+"""
+
+import json
+import os
+import random
+import re
+
+import pytest
+
+from benchmarks.text_analyzer import random_text
+from utils.pattern_scanner import PatternScanner, _required_literals
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "analyzer_baseline.json")
+SCANNED = ("threads", "dimensions", "standards", "strength_grades", "quantities")
+
+with open(BASELINE, encoding="utf-8") as f:
+    CASES = json.load(f)
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return TechnicalTextAnalyzer()
+
+
+def without_thread_class(threads):
+    # The original analyzer looked for "UNC" in lower-cased text, so every
+    # imperial thread came out as UNF; the class is now read correctly
+    return [{key: value for key, value in thread.items() if key != "thread_class"} for thread in threads]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[f"case{index}" for index in range(len(CASES))])
+def test_scanned_categories_match_frozen_baseline(analyzer, case):
+    specs, _ = analyzer._extract(case["text"], case["text"])
+
+    expected = case["expected"]
+    assert without_thread_class(specs["threads"]) == without_thread_class(expected["threads"])
+    for category in SCANNED[1:]:
+        assert specs[category] == expected[category], category
+
+
+def test_imperial_thread_class(analyzer):
+    specs, _ = analyzer._extract("1/4-20 unc 1/4-28 unf", "1/4-20 UNC 1/4-28 UNF")
+
+    assert [thread["thread_class"] for thread in specs["threads"]] == ["UNC", "UNF"]
+
+
+def finditer_reference(patterns, text):
+    results = {key: [] for key, _, _ in patterns}
+    for key, pattern, flags in patterns:
+        results[key].extend(re.finditer(pattern, text, flags))
+    return results
+
+
+def spans(results):
+    return {key: [(match.span(), match.groups()) for match in matches] for key, matches in results.items()}
+
+
+@pytest.mark.parametrize("text", [
+    "1.2.3 mm 12.5 pcs 1234mm5678mm 7   mm 8\tmm 9\nmm mmm 5mmm mm5",
+    "3-4-5-6 unc 1.5-2.5.5 UNF --7-8 unc",
+    "M8 x 25 KSI 120 Ksi 5 ſpecial İSO 9001 iso 4762",
+    "",
+    "mm",
+    "5",
+])
+def test_scanner_matches_finditer_on_edge_cases(analyzer, text):
+    patterns = [(index, regex.pattern, regex.flags) for index, (regex, _, _) in enumerate(analyzer._scanner._patterns)]
+
+    assert spans(PatternScanner(patterns).scan(text)) == spans(finditer_reference(patterns, text))
+
+
+def test_scanner_matches_finditer_on_random_text(analyzer):
+    patterns = [(index, regex.pattern, regex.flags) for index, (regex, _, _) in enumerate(analyzer._scanner._patterns)]
+    patterns += [("parts", pattern, 0) for pattern in analyzer.part_number_patterns]
+    scanner = PatternScanner(patterns)
+    rng = random.Random(5)
+    for _ in range(300):
+        text = random_text(rng, rng.randint(0, 60), spec_fraction=rng.random())
+        text = text if rng.random() < 0.5 else text.upper()
+        assert spans(scanner.scan(text)) == spans(finditer_reference(patterns, text)), text
+
+
+@pytest.mark.parametrize("pattern, flags, leading, anchor", [
+    (r"ISO\s*(\d+)", re.IGNORECASE, "iso", ""),
+    (r"(\d+(?:\.\d+)?)\s*mm", re.IGNORECASE, "", "mm"),
+    (r"(\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)\s*UNC", re.IGNORECASE, "", "unc"),
+    # The prefix can match "m" itself, so "mm" cannot anchor the pattern
+    (r"(\w+)\s*mm", re.IGNORECASE, "", ""),
+    (r"(x\d+)mm", re.IGNORECASE, "", ""),
+    (r"\b[A-Z]\d{4,}\b", 0, "", ""),
+])
+def test_required_literals(pattern, flags, leading, anchor):
+    literals = _required_literals(pattern, flags)
+
+    assert (literals.leading, literals.anchor) == (leading, anchor)
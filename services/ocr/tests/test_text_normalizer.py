@@ -0,0 +1,61 @@
+import random
+import re
+
+import pytest
+
+from utils.text_normalizer import _translate, normalize_text
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("M1O X 3O", "m10 x 30"),
+    ("Stainless steel 316L", "stainless steel 316l"),
+    ("l0 mm and 3o4", "10 mm and 304"),
+    ("1omm", "10mm"),
+    ("Ø12 ⌀12 ∅12", "ø12 ø12 ø12"),
+    ("M8×1.25 – 20″ ‘x’", "m8x1.25 - 20\" 'x'"),
+    ("ＭＳ２０ İSO", "ms20 iso"),
+    ("  a\t\n b  c  ", "a b c"),
+    ("", ""),
+    ("   ", ""),
+])
+def test_normalize_text(raw, expected):
+    assert normalize_text(raw).text == expected
+
+
+def test_offsets_and_cased_text_map_back_to_the_original():
+    normalized = normalize_text("  Part  No:\tAB-12o\u00a0 M1O x 3O  ")
+
+    assert normalized.text == "part no: ab-120 m10 x 30"
+    # The first character of a collapsed whitespace run is copied as is
+    assert normalized.cased == "Part No:\tAB-12o\u00a0M1O x 3O"
+    start = normalized.text.index("m10")
+    assert normalized.original_span(start, start + 3) == (20, 23)
+    assert normalized.original[20:23] == "M1O"
+    assert normalized.original_span(5, 5) == (8, 8)
+
+
+def random_text(rng: random.Random) -> str:
+    alphabet = "abcMOIl|io0123456789 .x×–-\t\n Øİ"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_offset_map_on_random_text(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        raw = random_text(rng)
+
+        normalized = normalize_text(raw)
+
+        # Only whitespace is collapsed and trimmed; everything else keeps its position
+        assert normalized.text == re.sub(" +", " ", normalized.text).strip(" ")
+        assert len(normalized.cased) == len(normalized.text)
+        translated = _translate(raw)
+        for offset, char in enumerate(normalized.text):
+            original = normalized.to_original(offset)
+            assert normalized.cased[offset] == raw[original]
+            if char == " ":
+                assert raw[original].isspace()
+            elif char != translated[original]:
+                # Confusable letters read as digits
+                assert (translated[original], char) in {("o", "0"), ("l", "1"), ("i", "1"), ("|", "1")}
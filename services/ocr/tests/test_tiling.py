@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.ocr_backends import OCRPage
+from utils.tiling import _overlap_ratio, compute_tiles, merge_tile_boxes, offset_boxes
+
+
+def box(x_min, y_min, x_max, y_max, confidence=0.9, text=""):
+    return {
+        "text": text,
+        "confidence": confidence,
+        "coordinates": {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max},
+        "polygon": [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]],
+    }
+
+
+@pytest.mark.parametrize("height, width", [(500, 500), (3000, 5000), (2049, 4097), (6000, 1000)])
+def test_tiles_cover_the_image_at_full_size(height, width):
+    tile_size, overlap = 2048, 192
+    tiles = compute_tiles(height, width, tile_size, overlap)
+
+    covered = np.zeros((height, width), dtype=bool)
+    for x0, y0, x1, y1 in tiles:
+        covered[y0:y1, x0:x1] = True
+        assert x1 - x0 == min(tile_size, width) and y1 - y0 == min(tile_size, height)
+    assert covered.all()
+    assert tiles == sorted(tiles, key=lambda tile: (tile[1], tile[0]))
+
+
+def test_neighbouring_tiles_overlap():
+    xs = sorted({tile[0] for tile in compute_tiles(1000, 5000, 2048, 192)})
+
+    assert xs[0] == 0 and xs[-1] == 5000 - 2048
+    assert all(b - a <= 2048 - 192 for a, b in zip(xs, xs[1:]))
+
+
+def test_offset_boxes_moves_coordinates_and_polygon():
+    moved = offset_boxes([box(1, 2, 11, 12)], dx=100, dy=200)[0]
+
+    assert moved["coordinates"] == {"x_min": 101, "y_min": 202, "x_max": 111, "y_max": 212}
+    assert moved["polygon"][2] == [111, 212]
+
+
+# Two tiles side by side sharing the strip x = 1856..2048
+TILES = [(0, 0, 2048, 2048), (1856, 0, 3904, 2048)]
+
+
+def test_line_cut_at_a_tile_edge_merges_into_the_full_line():
+    full = box(1900, 100, 2300, 140, confidence=0.8, text="SOCKET HEAD CAP SCREW")
+    cut = box(1900, 100, 2047, 140, confidence=0.95, text="SOCKET HE")
+    elsewhere = box(100, 500, 400, 540, text="M8 x 25")
+
+    merged = merge_tile_boxes([cut, elsewhere, full], [0, 0, 1], TILES)
+
+    assert [b["text"] for b in merged] == ["SOCKET HEAD CAP SCREW", "M8 x 25"]
+
+
+def test_nested_and_crossing_boxes_from_one_tile_are_kept():
+    note = box(100, 100, 600, 140, text="NOTE 3: ALL DIMS IN MM")
+    callout = box(120, 105, 160, 135, text="M8")
+    crossing = box(1900, 100, 2040, 140, text="A")
+    crossed = box(1910, 90, 2030, 150, text="B")
+
+    merged = merge_tile_boxes([note, callout, crossing, crossed], [0, 0, 1, 1], TILES)
+
+    assert sorted(b["text"] for b in merged) == ["A", "B", "M8", "NOTE 3: ALL DIMS IN MM"]
+
+
+def test_tiled_ocr_keeps_text_nested_inside_a_line(monkeypatch):
+    import config
+    import inference
+
+    class NestedBoxesBackend:
+        """Finds a note with a callout inside it in the top-left corner of the page, i.e. of the first tile."""
+
+        def predict(self, images):
+            pages = [OCRPage() for _ in images]
+            pages[0] = OCRPage(
+                texts=["NOTE 3: ALL DIMS IN MM", "M8"],
+                scores=[0.9, 0.9],
+                polygons=[
+                    [[10, 10], [300, 10], [300, 40], [10, 40]],
+                    [[20, 15], [60, 15], [60, 35], [20, 35]],
+                ],
+            )
+            return pages
+
+    monkeypatch.setattr(config, "TILE_SIZE", 400)
+    monkeypatch.setattr(config, "TILE_OVERLAP", 64)
+    monkeypatch.setattr(config, "OCR_BATCH_SIZE", 8)
+    image = np.full((400, 900, 3), 255, dtype=np.uint8)
+
+    boxes, report = inference._ocr_tiled(NestedBoxesBackend(), image, "none", deskew="off")
+
+    assert report["tiles"] > 1
+    assert [b["text"] for b in boxes] == ["NOTE 3: ALL DIMS IN MM", "M8"]
+
+
+def test_grid_merge_matches_pairwise_merge():
+    rng = random.Random(7)
+    tiles = compute_tiles(3000, 4000, 1024, 192)
+    boxes, box_tiles = [], []
+    for _ in range(400):
+        tile = rng.randrange(len(tiles))
+        x0, y0, x1, y1 = tiles[tile]
+        w, h = rng.randrange(10, 600), rng.randrange(10, 80)
+        x, y = rng.randrange(x0, max(x0 + 1, x1 - w)), rng.randrange(y0, max(y0 + 1, y1 - h))
+        boxes.append(box(x, y, min(x + w, x1), min(y + h, y1), confidence=round(rng.random(), 3)))
+        box_tiles.append(tile)
+
+    def duplicates(i, j):
+        if box_tiles[i] == box_tiles[j]:
+            return False
+        a, b = boxes[i]["coordinates"], boxes[j]["coordinates"]
+        t, u = tiles[box_tiles[i]], tiles[box_tiles[j]]
+        strip = (max(t[0], u[0]), max(t[1], u[1]), min(t[2], u[2]), min(t[3], u[3]))
+        return (
+            _overlap_ratio(a, b) > 0.6
+            and strip[0] <= max(a["x_min"], b["x_min"]) and min(a["x_max"], b["x_max"]) <= strip[2]
+            and strip[1] <= max(a["y_min"], b["y_min"]) and min(a["y_max"], b["y_max"]) <= strip[3]
+        )
+
+    ranked = sorted(range(len(boxes)), key=lambda i: (
+        (boxes[i]["coordinates"]["x_max"] - boxes[i]["coordinates"]["x_min"])
+        * (boxes[i]["coordinates"]["y_max"] - boxes[i]["coordinates"]["y_min"]),
+        boxes[i]["confidence"]
+    ), reverse=True)
+    kept = []
+    for candidate in ranked:
+        if not any(duplicates(candidate, other) for other in kept):
+            kept.append(candidate)
+    expected = sorted((boxes[i] for i in kept), key=lambda b: (b["coordinates"]["y_min"], b["coordinates"]["x_min"]))
+
+    assert len(expected) < len(boxes)
+    for cell_size in (64, 256, 10000):
+        assert merge_tile_boxes(boxes, box_tiles, tiles, cell_size=cell_size) == expected
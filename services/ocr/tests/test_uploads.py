@@ -0,0 +1,79 @@
+import io
+import mmap
+import tempfile
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import app as service
+from utils.uploads import BufferReader, UploadTooLargeError, map_upload, open_stream, release
+
+
+def spooled(data: bytes, max_size: int = 1024):
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+    spool.write(data)
+    return spool
+
+
+def test_small_uploads_are_read_into_bytes():
+    assert map_upload(spooled(b"abc"), spool_bytes=10) == b"abc"
+
+
+def test_large_uploads_are_memory_mapped():
+    data = bytes(range(256)) * 64
+
+    mapped = map_upload(spooled(data), spool_bytes=1024)
+
+    assert isinstance(mapped, mmap.mmap)
+    assert mapped[:] == data
+    release(mapped)
+    assert mapped.closed
+
+
+def test_per_file_cap():
+    with pytest.raises(UploadTooLargeError):
+        map_upload(spooled(b"x" * 101), max_bytes=100)
+
+
+def test_buffer_readers_share_a_buffer_with_their_own_positions():
+    data = memoryview(b"0123456789")
+    first, second = BufferReader(data), BufferReader(data)
+
+    assert first.read(4) == b"0123"
+    assert second.read() == b"0123456789"
+    first.seek(-2, io.SEEK_END)
+    assert first.read() == b"89"
+    assert first.tell() == 10
+    assert isinstance(open_stream(b"ab"), io.BytesIO)
+
+
+@pytest.fixture
+def limited_client():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(service.RequestSizeLimitMiddleware(app, max_bytes=100))
+
+
+def test_request_size_limit_checks_declared_and_streamed_bodies(limited_client):
+    assert limited_client.post("/echo", content=b"x" * 100).json() == {"size": 100}
+    assert limited_client.post("/echo", content=b"x" * 101).status_code == 413
+
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 30
+
+    assert limited_client.post("/echo", content=chunks()).status_code == 413
+
+
+def test_oversized_file_is_413(client, monkeypatch):
+    monkeypatch.setattr(service, "MAX_UPLOAD_BYTES", 1000)
+
+    response = client.post("/ocr/extract", files={"file": ("big.png", b"x" * 5000, "image/png")})
+
+    assert response.status_code == 413
+    assert "big.png" in response.json()["detail"]
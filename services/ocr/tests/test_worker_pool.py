@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import pytest
+
+from utils.worker_pool import OCRWorkerPool
+
+
+def wait_until(condition, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = OCRWorkerPool(
+        num_workers=1,
+        task_module="inference",
+        initializer="preload_models",
+        initargs=(["en"], False, False),
+        stats_function="model_stats"
+    )
+    pool.start()
+    wait_until(lambda: pool.ready)
+    yield pool
+    pool.shutdown()
+
+
+def test_worker_runs_tasks_and_reports_its_models(pool):
+    image = np.full((64, 96, 3), 255, dtype=np.uint8)
+
+    result = pool.run("ocr", image, enhance_image=False)
+
+    assert result["text"]
+    worker = pool.stats()["workers"][0]
+    assert worker["preloaded"] == ["stub_en_False"]
+    assert list(worker["stats"]["models"]) == ["stub_en_False"]
+    assert worker["stats"]["hits"] >= 1
+
+
+def test_crashed_worker_is_replaced_when_work_is_dispatched(pool):
+    crashes = pool.stats()["crashes"]
+    process = pool._processes[0]
+    process.kill()
+    process.join()
+
+    result = pool.run("ocr", np.full((64, 96, 3), 255, dtype=np.uint8), enhance_image=False)
+
+    assert result["text"]
+    stats = pool.stats()
+    assert stats["crashes"] == crashes + 1
+    assert stats["workers"][0]["pid"] != process.pid
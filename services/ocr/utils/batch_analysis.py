@@ -0,0 +1,213 @@
+"""
+Bulk technical specification extraction over many OCR texts.
+
+:func:`analyze_texts` runs the technical text analyzer over an iterable of
+texts and yields results lazily, in input order, either in-process or over
+a process pool that receives texts in chunks. The module is also a CLI for
+offline back-fills that reads and writes JSONL, no HTTP service needed.
+
+Usage (from services/ocr):
+    python -m utils.batch_analysis texts.jsonl -o specs.jsonl [--processes 8] [--chunk-size 500]
+
+Each input line is a JSON object with the text under ``--text-field``
+(default ``text``) or a bare JSON string. Each output line has the input's
+other fields plus ``specifications``, or ``error`` for lines that could not
+be read.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from utils.catalog_index import CatalogStore
+from utils.text_analyzer import TechnicalTextAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 256
+
+# The analyzer of a pool worker process, built once by _init_worker
+_worker_analyzer: Optional[TechnicalTextAnalyzer] = None
+
+
+def _build_analyzer(vocabulary_path: Optional[str], catalog_path: Optional[str]) -> TechnicalTextAnalyzer:
+    catalog = None
+    if catalog_path:
+        # Never re-checked during a run, and indexed before the first text
+        catalog = CatalogStore(catalog_path, reload_interval=float("inf"))
+        catalog.reload()
+    return TechnicalTextAnalyzer(vocabulary_path=vocabulary_path, catalog=catalog)
+
+
+def _init_worker(vocabulary_path: Optional[str], catalog_path: Optional[str]) -> None:
+    global _worker_analyzer
+    _worker_analyzer = _build_analyzer(vocabulary_path, catalog_path)
+
+
+def _analyze_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    return list(_worker_analyzer.iter_specifications(texts))
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_texts(
+    texts: Iterable[str],
+    processes: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    vocabulary_path: Optional[str] = None,
+    catalog_path: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract technical specifications from many texts, yielding results lazily.
+
+    With ``processes`` > 1 the texts are sent to a process pool in chunks of
+    ``chunk_size``. At most two chunks per process are in flight, so memory
+    stays bounded however long ``texts`` is, and results come back in input
+    order.
+
+    Args:
+        texts: OCR texts, consumed lazily
+        processes: Worker processes (0 or 1 analyzes in this process)
+        chunk_size: Texts per task sent to a worker process
+        vocabulary_path: Analyzer vocabulary (None uses the bundled one)
+        catalog_path: Catalog snapshot to resolve part numbers and standards
+            against (see :func:`utils.catalog_index.load_catalog`); each
+            worker process indexes it
+
+    Yields:
+        One specifications dict per text, as from
+        :meth:`TechnicalTextAnalyzer.extract_technical_specifications`
+    """
+    if processes <= 1:
+        yield from _build_analyzer(vocabulary_path, catalog_path).iter_specifications(texts)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(vocabulary_path, catalog_path)
+    ) as pool:
+        in_flight = deque()
+        for chunk in _chunks(texts, max(1, chunk_size)):
+            if len(in_flight) >= 2 * processes:
+                yield from in_flight.popleft().result()
+            in_flight.append(pool.submit(_analyze_chunk, chunk))
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _read_records(stream: TextIO, text_field: str) -> Iterator[Dict[str, Any]]:
+    """Parse JSONL input; unreadable lines become records with an ``error``."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"line": line_number, "error": f"Invalid JSON: {e}"}
+            continue
+        if isinstance(record, str):
+            record = {text_field: record}
+        if not isinstance(record, dict) or not isinstance(record.get(text_field), str):
+            yield {"line": line_number, "error": f"Expected an object with a string {text_field!r} field"}
+            continue
+        yield record
+
+
+def run_jsonl(
+    source: TextIO,
+    sink: TextIO,
+    text_field: str = "text",
+    keep_text: bool = False,
+    processes: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    vocabulary_path: Optional[str] = None,
+    catalog_path: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Analyze every JSONL record of ``source`` and write one result line per record to ``sink``.
+
+    Returns:
+        Counts of ``analyzed`` and ``failed`` records
+    """
+    records = _read_records(source, text_field)
+    # Unreadable records are set aside and written in order between results
+    pending: deque = deque()
+
+    def texts() -> Iterator[str]:
+        for record in records:
+            pending.append(record)
+            if "error" not in record:
+                yield record[text_field]
+
+    counts = {"analyzed": 0, "failed": 0}
+    for specs in analyze_texts(texts(), processes, chunk_size, vocabulary_path, catalog_path):
+        while "error" in pending[0]:
+            sink.write(json.dumps(pending.popleft(), ensure_ascii=False) + "\n")
+            counts["failed"] += 1
+        record = pending.popleft()
+        if not keep_text:
+            record.pop(text_field)
+        record["specifications"] = specs
+        sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+        counts["analyzed"] += 1
+    for record in pending:
+        sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+        counts["failed"] += 1
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of OCR texts, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file, or - for stdout")
+    parser.add_argument("--text-field", default="text", help="Field holding the OCR text")
+    parser.add_argument("--keep-text", action="store_true", help="Copy the text into the output records")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Texts per worker task")
+    parser.add_argument("--vocabulary", default=None, help="Analyzer vocabulary JSON (default: bundled)")
+    parser.add_argument("--catalog", default=None, help="Catalog snapshot (JSONL or SQLite) to resolve against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        counts = run_jsonl(
+            source, sink,
+            text_field=args.text_field,
+            keep_text=args.keep_text,
+            processes=args.processes,
+            chunk_size=args.chunk_size,
+            vocabulary_path=args.vocabulary,
+            catalog_path=args.catalog
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"Analyzed {counts['analyzed']} texts ({counts['failed']} unreadable) in {elapsed:.1f}s",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
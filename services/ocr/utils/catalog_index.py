@@ -0,0 +1,397 @@
+"""
+In-memory index of catalog part numbers and standard designations.
+
+The analyzer's part number and standard candidates are raw regex hits; this
+module checks them against a snapshot of the catalog (the Prisma
+``Component`` table: ``partNumber``, ``sku`` and ``standard``) so they can
+be resolved to known components, also when OCR garbled a character.
+
+Snapshots are either JSONL, one component object per line with the Prisma
+field names, or an SQLite database with a ``components`` table. Write a new
+snapshot to a temporary file and rename it over the old one; the
+:class:`CatalogStore` notices the change and swaps in a fresh index built in
+the background.
+"""
+
+import array
+import bisect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fields of a part number entry, besides its value
+COMPONENT_FIELDS = ("id", "name", "manufacturer")
+
+# Fuzzy matches of shorter keys would mostly be coincidences
+MIN_FUZZY_LENGTH = 5
+
+# Separator between the fields of an index entry; stripped from values
+_SEPARATOR = "\x1f"
+_NOT_KEY = re.compile(r"[\W_]+")
+# Several standards in one ``standard`` field, e.g. "ISO 4762, DIN 912"
+_STANDARD_SPLIT = re.compile(r"[,;]")
+
+
+def catalog_key(value: str) -> str:
+    """Lookup key of a part number or designation: upper case, letters and digits only."""
+    if value.isalnum():
+        return value.upper()
+    return _NOT_KEY.sub("", value).upper()
+
+
+class CatalogMatch(NamedTuple):
+    """A candidate resolved against the catalog."""
+    # Catalog value as written there, e.g. "ABC-123" for the candidate "abc 12e"
+    value: str
+    # Edit distance between the candidate's key and the value's key
+    distance: int
+    # Fields of each catalog entry with this value (empty for standards)
+    entries: List[Dict[str, str]]
+
+
+class _KeyIndex:
+    """
+    Sorted 64-bit key hashes mapped to entries packed into one string.
+
+    Key hashes come from Python's ``hash``, which is only stable within one
+    process, so an index is never persisted or shared between processes.
+
+    An entry is its key and fields joined by ``_SEPARATOR``. Entries are
+    stored in hash order in a single string with an offsets array, so an
+    entry costs its characters plus 16 bytes of arrays instead of several
+    Python objects. A lookup binary-searches the hashes and compares keys to
+    rule out collisions. A one-byte-per-entry bit filter answers most
+    lookups of absent keys (the common case for fuzzy variants) without a
+    search.
+
+    Args:
+        entries: ``(key, fields)`` pairs, the fields already joined by
+            ``_SEPARATOR``; keys may repeat
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        keys: List[str] = []
+        packed: List[str] = []
+        for key, fields in entries:
+            if key:
+                keys.append(key)
+                packed.append(key + _SEPARATOR + fields)
+        self.alphabet = "".join(sorted(set("".join(keys))))
+
+        # numpy sorts and sums millions of entries in a fraction of the time
+        # the same loops take in Python; lookups use plain arrays
+        hashes = np.fromiter(map(hash, keys), dtype=np.int64, count=len(keys))
+        del keys
+        order = np.argsort(hashes, kind="stable")
+        hashes = hashes[order]
+        packed = [packed[i] for i in order.tolist()]
+        del order
+        offsets = np.zeros(len(packed) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, packed), dtype=np.int64, count=len(packed)), out=offsets[1:])
+        self._data = "".join(packed)
+        del packed
+
+        size = 1
+        while size < len(hashes):
+            size *= 2
+        self._filter_mask = size - 1
+        bits = np.zeros(size, dtype=np.uint8)
+        np.bitwise_or.at(bits, (hashes >> 3) & self._filter_mask, (1 << (hashes & 7)).astype(np.uint8))
+        self._filter = bits.tobytes()
+
+        self._hashes = array.array("q", hashes.tobytes())
+        self._offsets = array.array("q", offsets.tobytes())
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def get(self, key: str) -> List[List[str]]:
+        """Fields of every entry with ``key``."""
+        value = hash(key)
+        if not self._filter[(value >> 3) & self._filter_mask] >> (value & 7) & 1:
+            return []
+        found = []
+        hashes, offsets, data = self._hashes, self._offsets, self._data
+        position = bisect.bisect_left(hashes, value)
+        while position < len(hashes) and hashes[position] == value:
+            fields = data[offsets[position]:offsets[position + 1]].split(_SEPARATOR)
+            if fields[0] == key:
+                found.append(fields[1:])
+            position += 1
+        return found
+
+
+def _variants(key: str, alphabet: str) -> Iterator[str]:
+    """Every string one deletion, adjacent transposition, substitution or insertion away from ``key``."""
+    for i in range(len(key)):
+        yield key[:i] + key[i + 1:]
+    for i in range(len(key) - 1):
+        if key[i] != key[i + 1]:
+            yield key[:i] + key[i + 1] + key[i] + key[i + 2:]
+    for i in range(len(key)):
+        head, tail = key[:i], key[i + 1:]
+        for char in alphabet:
+            if char != key[i]:
+                yield head + char + tail
+    for i in range(len(key) + 1):
+        head, tail = key[:i], key[i:]
+        for char in alphabet:
+            yield head + char + tail
+
+
+class Catalog:
+    """
+    Part numbers and standard designations of a catalog snapshot.
+
+    Exact lookups cost a hash and a binary search. Fuzzy lookups look up
+    every variant of the candidate within edit distance 1 (about 75 per
+    character of the candidate), which stays in the low milliseconds
+    however many entries the catalog has; larger distances would multiply
+    that by the same factor again, so they are not offered.
+
+    Args:
+        part_numbers: ``(part_number, {field: value})`` pairs, fields as in
+            :data:`COMPONENT_FIELDS`
+        standards: Standard designations
+    """
+
+    def __init__(self, part_numbers: Iterable[Tuple[str, Dict[str, Any]]], standards: Iterable[str]):
+        self._part_numbers = _KeyIndex(
+            (catalog_key(value), _pack((value, *map(fields.get, COMPONENT_FIELDS))))
+            for value, fields in part_numbers
+        )
+        designations = {}
+        for designation in standards:
+            designations.setdefault(catalog_key(designation), _pack((designation,)))
+        self._standards = _KeyIndex(designations.items())
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {"part_numbers": len(self._part_numbers), "standards": len(self._standards)}
+
+    def resolve_part_number(self, candidate: str, max_distance: int = 1) -> Optional[CatalogMatch]:
+        """Resolve a part number candidate (see :meth:`_resolve`); entries have a ``part_number`` and the component fields."""
+        match = self._resolve(self._part_numbers, candidate, max_distance)
+        if match is None:
+            return None
+        entries = [dict(zip(("part_number", *COMPONENT_FIELDS), fields)) for fields in match.entries]
+        return match._replace(value=entries[0]["part_number"], entries=entries)
+
+    def resolve_standard(self, candidate: str, max_distance: int = 1) -> Optional[CatalogMatch]:
+        """Resolve a standard designation candidate (see :meth:`_resolve`)."""
+        match = self._resolve(self._standards, candidate, max_distance)
+        if match is None:
+            return None
+        return match._replace(value=match.entries[0][0], entries=[])
+
+    @staticmethod
+    def _resolve(index: _KeyIndex, candidate: str, max_distance: int) -> Optional[CatalogMatch]:
+        """
+        Look a candidate up by key, falling back to keys one edit away.
+
+        A fuzzy match is only returned when exactly one catalog key is one
+        edit away; a candidate close to several is left unresolved rather
+        than guessed.
+
+        Returns:
+            The match with the raw fields of its entries, or None
+        """
+        key = catalog_key(candidate)
+        if not key:
+            return None
+        found = index.get(key)
+        if found:
+            return CatalogMatch("", 0, found)
+        if max_distance < 1 or len(key) < MIN_FUZZY_LENGTH:
+            return None
+
+        matched_key, matched = None, []
+        for variant in _variants(key, index.alphabet):
+            if variant == matched_key:
+                continue
+            found = index.get(variant)
+            if not found:
+                continue
+            if matched_key is not None:
+                return None
+            matched_key, matched = variant, found
+        return CatalogMatch("", 1, matched) if matched else None
+
+
+def _pack(fields: Tuple[Any, ...]) -> str:
+    """Join entry fields with ``_SEPARATOR``; missing fields are empty."""
+    try:
+        packed = _SEPARATOR.join(fields)
+    except TypeError:
+        packed = None
+    # Catalog text practically never holds the separator, so only check for it
+    if packed is None or packed.count(_SEPARATOR) != len(fields) - 1:
+        packed = _SEPARATOR.join(
+            "" if field is None else str(field).replace(_SEPARATOR, " ") for field in fields
+        )
+    return packed
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    skipped = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            if isinstance(record, dict):
+                yield record
+            else:
+                skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} unreadable lines of catalog snapshot {path}")
+
+
+def _read_sqlite(path: str) -> Iterator[Dict[str, Any]]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        available = {row[1] for row in conn.execute("PRAGMA table_info(components)")}
+        if not available:
+            raise ValueError(f"Catalog snapshot {path} has no components table")
+        wanted = [name for name in ("partNumber", "sku", "standard", *COMPONENT_FIELDS) if name in available]
+        columns = ", ".join(f'"{name}"' for name in wanted)
+        for row in conn.execute(f"SELECT {columns} FROM components"):
+            yield dict(zip(wanted, row))
+    finally:
+        conn.close()
+
+
+def load_catalog(path: str) -> Catalog:
+    """
+    Build a catalog index from a JSONL or SQLite snapshot.
+
+    Every ``partNumber`` and ``sku`` of a component is indexed as a part
+    number, and every designation in its ``standard`` field (several may be
+    separated by commas or semicolons) as a standard.
+
+    Raises:
+        ValueError: The snapshot has no ``components`` table (SQLite)
+    """
+    start = time.perf_counter()
+    is_sqlite = path.endswith((".db", ".sqlite", ".sqlite3"))
+    records = _read_sqlite(path) if is_sqlite else _read_jsonl(path)
+
+    # Filled while the part numbers are consumed, which Catalog does first
+    standards: Dict[str, None] = {}
+    # Most components share a handful of standard fields; split each once
+    seen_standards = set()
+
+    def part_numbers() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for record in records:
+            part_number, sku = record.get("partNumber"), record.get("sku")
+            if part_number:
+                yield str(part_number), record
+            if sku and sku != part_number:
+                yield str(sku), record
+            standard = record.get("standard")
+            if standard and standard not in seen_standards:
+                seen_standards.add(standard)
+                for designation in _STANDARD_SPLIT.split(str(standard)):
+                    if designation.strip():
+                        standards.setdefault(designation.strip())
+
+    catalog = Catalog(part_numbers(), standards)
+    size = catalog.size
+    logger.info(
+        f"Catalog index built from {path}: {size['part_numbers']} part numbers, "
+        f"{size['standards']} standards in {time.perf_counter() - start:.1f}s"
+    )
+    return catalog
+
+
+class CatalogStore:
+    """
+    The current catalog index of a snapshot file, rebuilt when the file changes.
+
+    :meth:`get` checks the file's modification time and size at most once
+    per ``reload_interval`` seconds. When they changed, a new index is built
+    in a background thread while lookups keep using the old one, and then
+    replaces it in one assignment. If a snapshot cannot be read, the previous
+    index stays in use until the file changes again.
+
+    Args:
+        path: JSONL or SQLite snapshot (see :func:`load_catalog`)
+        reload_interval: Seconds between checks of the file (0 checks on every call)
+        max_distance: Edit distance allowed when resolving candidates (0 or 1)
+    """
+
+    def __init__(self, path: str, reload_interval: float = 30.0, max_distance: int = 1):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.max_distance = max(0, min(1, max_distance))
+        if max_distance > 1:
+            logger.warning(f"Catalog lookups support edit distance 1 at most; got {max_distance}")
+        self._catalog: Optional[Catalog] = None
+        self._signature: Optional[Tuple[float, int]] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._loading = False
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def reload(self) -> bool:
+        """
+        Rebuild the index now if the snapshot changed since the last build.
+
+        Returns:
+            Whether a new index was swapped in
+        """
+        signature = self._file_signature()
+        if signature is None:
+            logger.warning(f"Catalog snapshot {self.path} not found")
+            return False
+        if signature == self._signature:
+            return False
+        try:
+            catalog = load_catalog(self.path)
+        except Exception as e:
+            logger.error(f"Failed to load catalog snapshot {self.path}: {e}")
+            return False
+        finally:
+            # A snapshot that failed is not retried until it changes
+            self._signature = signature
+        self._catalog = catalog
+        return True
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.reload()
+        finally:
+            self._loading = False
+
+    def get(self) -> Optional[Catalog]:
+        """The current index (None until the first build finishes), starting a rebuild if the snapshot changed."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                if not self._loading and now - self._checked_at >= self.reload_interval:
+                    self._checked_at = now
+                    if self._file_signature() != self._signature:
+                        self._loading = True
+                        threading.Thread(
+                            target=self._reload_in_background, name="catalog-reload", daemon=True
+                        ).start()
+        return self._catalog
@@ -0,0 +1,135 @@
+import threading
+import logging
+from typing import Iterator, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.image_decoder import check_pixel_budget
+from utils.uploads import ImageData, open_stream
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # PDF input is optional
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# PDFium is not thread-safe; all document access goes through this lock
+_pdfium_lock = threading.Lock()
+
+
+def detect_format(data: ImageData) -> str:
+    """Identify the container format from the leading magic bytes: "pdf", "tiff" or "image"."""
+    head = bytes(data[:4])
+    if head == b"%PDF":
+        return "pdf"
+    if head in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    return "image"
+
+
+def _require_pdfium() -> None:
+    if pdfium is None:
+        raise ValueError("PDF input requires the pypdfium2 package")
+
+
+def _open_pdf(data: ImageData):
+    """Open a PDF from bytes, or stream a memory-mapped upload to PDFium without copying it."""
+    if isinstance(data, bytes):
+        return pdfium.PdfDocument(data)
+    return pdfium.PdfDocument(open_stream(data), autoclose=True)
+
+
+def count_pages(data: ImageData) -> int:
+    """
+    Count pages without rasterizing any of them.
+
+    Args:
+        data: Raw document bytes, or a memory-mapped upload
+
+    Returns:
+        Number of pages (frames for TIFF, 1 for single images)
+    """
+    kind = detect_format(data)
+    if kind == "pdf":
+        _require_pdfium()
+        with _pdfium_lock:
+            pdf = _open_pdf(data)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    if kind == "tiff":
+        with open_stream(data) as stream, Image.open(stream) as image:
+            return getattr(image, "n_frames", 1)
+    return 1
+
+
+def _render_pdf_page(pdf, index: int, dpi: int, max_pixels: int = 0) -> np.ndarray:
+    page = pdf[index]
+    try:
+        width, height = page.get_size()
+        # Check the rendered size before PDFium allocates the bitmap
+        check_pixel_budget(int(width * dpi / 72.0), int(height * dpi / 72.0), max_pixels)
+        bitmap = page.render(scale=dpi / 72.0, rev_byteorder=True)
+        try:
+            # Copy out of PDFium's buffer before it is freed
+            return np.array(bitmap.to_numpy()[:, :, :3])
+        finally:
+            bitmap.close()
+    finally:
+        page.close()
+
+
+def render_page(data: ImageData, index: int = 0, dpi: int = 200, max_pixels: int = 0) -> np.ndarray:
+    """Rasterize a single page of a PDF or TIFF into an RGB array."""
+    for _, page in iter_pages(data, dpi=dpi, start=index, max_pixels=max_pixels):
+        return page
+    raise IndexError(f"Document has no page {index}")
+
+
+def iter_pages(
+    data: ImageData,
+    dpi: int = 200,
+    start: int = 0,
+    max_pixels: int = 0
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Lazily rasterize the pages of a PDF or multi-frame TIFF.
+
+    Each page is rendered only when the consumer asks for it, so callers that
+    bound how many pages they hold keep memory at a few pages rather than the
+    whole document.
+
+    Args:
+        data: Raw document bytes, or a memory-mapped upload
+        dpi: Rasterization resolution for PDF pages
+        start: First page to yield
+        max_pixels: Per-page pixel budget, checked before rendering (0 disables)
+
+    Yields:
+        ``(page_index, rgb_array)`` pairs in page order
+    """
+    kind = detect_format(data)
+
+    if kind == "pdf":
+        _require_pdfium()
+        with _pdfium_lock:
+            pdf = _open_pdf(data)
+        try:
+            for index in range(start, len(pdf)):
+                with _pdfium_lock:
+                    page = _render_pdf_page(pdf, index, dpi, max_pixels)
+                yield index, page
+        finally:
+            with _pdfium_lock:
+                pdf.close()
+        return
+
+    with open_stream(data) as stream, Image.open(stream) as image:
+        for index in range(start, getattr(image, "n_frames", 1)):
+            image.seek(index)
+            check_pixel_budget(image.width, image.height, max_pixels)
+            frame = image if image.mode == "RGB" else image.convert("RGB")
+            yield index, np.array(frame)
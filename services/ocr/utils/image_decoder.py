@@ -0,0 +1,116 @@
+import time
+import logging
+from typing import Any, Dict, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from utils.uploads import ImageData, open_stream
+
+logger = logging.getLogger(__name__)
+
+# libjpeg can decode JPEGs directly at 1/2, 1/4 or 1/8 scale
+_REDUCED_DECODE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an image is larger than the decode pixel budget."""
+
+
+def check_pixel_budget(width: int, height: int, max_pixels: int) -> None:
+    """Raise :class:`ImageTooLargeError` if ``width x height`` exceeds ``max_pixels`` (0 disables)."""
+    if max_pixels and width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"Image is {width}x{height} ({width * height} pixels), above the {max_pixels} pixel limit"
+        )
+
+
+def probe(data: ImageData) -> Tuple[int, int, str]:
+    """
+    Read an image's dimensions and format from its header without decoding pixels.
+
+    Returns:
+        ``(width, height, format)``, e.g. ``(3508, 2480, "JPEG")``
+    """
+    try:
+        with open_stream(data) as stream, Image.open(stream) as image:
+            return image.width, image.height, image.format or ""
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e)) from e
+
+
+def _reduction_factor(longest_side: int, max_side: int) -> int:
+    """Largest libjpeg scale factor that keeps the longest side at or above ``max_side``."""
+    for factor in (8, 4, 2):
+        if longest_side // factor >= max_side:
+            return factor
+    return 1
+
+
+def decode(data: ImageData, max_pixels: int = 0, max_side: int = 0) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Decode encoded image bytes into an RGB array with as few full-size copies as possible.
+
+    The header is checked against ``max_pixels`` before any pixel memory is
+    allocated. OpenCV then decodes straight from a view of the input bytes
+    into the output array, and the BGR to RGB swap happens in place. When
+    ``max_side`` is set, JPEGs are decoded at a reduced scale by libjpeg
+    and anything still larger is downscaled once. Formats OpenCV cannot read
+    fall back to Pillow.
+
+    Args:
+        data: Encoded image bytes, or a memory-mapped upload
+        max_pixels: Pixel budget for the source image (0 disables the check)
+        max_side: Longest side wanted for OCR (0 keeps full resolution)
+
+    Returns:
+        ``(rgb_array, info)`` where ``info`` has the decoder used, source and
+        decoded sizes, the JPEG reduction factor, decode time in ms and the
+        peak bytes held by decode buffers
+    """
+    start = time.perf_counter()
+    width, height, image_format = probe(data)
+    check_pixel_budget(width, height, max_pixels)
+
+    factor = 1
+    if max_side and image_format == "JPEG":
+        factor = _reduction_factor(max(width, height), max_side)
+    flags = _REDUCED_DECODE_FLAGS.get(factor, cv2.IMREAD_COLOR)
+
+    # Keep EXIF orientation out of it, as the Pillow decoder always did
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags | cv2.IMREAD_IGNORE_ORIENTATION)
+    if image is not None:
+        decoder = "opencv"
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+        peak_bytes = len(data) + image.nbytes
+    else:
+        decoder = "pillow"
+        with open_stream(data) as stream, Image.open(stream) as pil_image:
+            pil_image.load()
+            decoded_bytes = len(pil_image.mode) * width * height
+            if pil_image.mode != "RGB":
+                pil_image = pil_image.convert("RGB")
+            image = np.asarray(pil_image)
+        peak_bytes = len(data) + decoded_bytes + image.nbytes
+
+    if max_side and max(image.shape[:2]) > max_side:
+        scale = max_side / max(image.shape[:2])
+        resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        peak_bytes = max(peak_bytes, len(data) + image.nbytes + resized.nbytes)
+        image = resized
+
+    info = {
+        "decoder": decoder,
+        "format": image_format,
+        "source_size": [width, height],
+        "size": [image.shape[1], image.shape[0]],
+        "reduction": factor,
+        "ms": round((time.perf_counter() - start) * 1000, 2),
+        "peak_bytes": peak_bytes,
+    }
+    return image, info
@@ -1,56 +1,437 @@
+import math
+import time
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import logging
 
+from utils.skew import SKEW_ANALYSIS_SIZE, estimate_skew
+
 logger = logging.getLogger(__name__)
 
+# Enhancement presets, cheapest first. "quality" keeps the original
+# non-local-means denoising, which can take seconds on large drawings;
+# "fast" and "balanced" use median and bilateral filtering instead.
+# "auto" measures the image first and runs only the steps it needs.
+ENHANCEMENT_PRESETS = ("none", "fast", "balanced", "quality", "auto")
+# Same default as the service's OCR_ENHANCE_PRESET
+DEFAULT_PRESET = "auto"
+
+# Skew correction modes: "auto" leaves it to the "auto" preset's analysis,
+# "on" estimates skew for every preset and "off" never rotates
+DESKEW_MODES = ("auto", "on", "off")
+
+# Image quality analysis is done on a thumbnail of at most this many pixels per side
+ANALYSIS_SIZE = 1024
+# Side of the full-resolution window used to measure edge sharpness
+SHARPNESS_WINDOW = 512
+# Images smaller than this per side are too small to measure and are left as they are
+MIN_ANALYSIS_SIZE = 3
+
+# Thresholds that decide which steps the "auto" preset runs
+NOISE_THRESHOLD = 4.0        # estimated noise standard deviation, grey levels (reads low on clipped white paper)
+CONTRAST_THRESHOLD = 0.55    # ink-to-paper contrast, 0-1
+SHARPNESS_THRESHOLD = 0.6    # steepest edge slope relative to a perfect step edge, 0-1
+SKEW_THRESHOLD = 0.5         # degrees
+SKEW_CONFIDENCE_THRESHOLD = 0.5  # skew estimates below this confidence are not corrected
+MIN_INK_FRACTION = 0.0005    # below this the page is treated as blank
+
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+_SHARPEN_KERNEL = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]], dtype=np.float32)
+
+StepSpec = Union[str, Tuple[str, Dict[str, Any]]]
+
+
+def _median_denoise(src: np.ndarray, dst: np.ndarray, ksize: int = 3) -> np.ndarray:
+    return cv2.medianBlur(src, ksize, dst=dst)
+
+
+def _bilateral_denoise(src: np.ndarray, dst: np.ndarray, d: int = 5, sigma: float = 40) -> np.ndarray:
+    return cv2.bilateralFilter(src, d, sigma, sigma, dst=dst)
+
+
+def _nlmeans_denoise(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    return cv2.fastNlMeansDenoising(src, dst=dst)
+
+
+def _clahe(src: np.ndarray, dst: np.ndarray, clip_limit: float = 2.0, grid: int = 8) -> np.ndarray:
+    # CLAHE objects are not thread-safe, so one is created per call
+    return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(grid, grid)).apply(src, dst=dst)
+
+
+def _gaussian_blur(src: np.ndarray, dst: np.ndarray, ksize: int = 3) -> np.ndarray:
+    return cv2.GaussianBlur(src, (ksize, ksize), 0, dst=dst)
+
+
+def _adaptive_threshold(src: np.ndarray, dst: np.ndarray, block_size: int = 11, c: int = 2) -> np.ndarray:
+    return cv2.adaptiveThreshold(
+        src, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, c, dst=dst
+    )
+
+
+def _correct_skew(src: np.ndarray, dst: np.ndarray, angle: float = 0.0) -> np.ndarray:
+    h, w = src.shape[:2]
+    rotation_matrix = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    return cv2.warpAffine(
+        src, rotation_matrix, (w, h), dst=dst,
+        flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+    )
+
+
+def _remove_noise(src: np.ndarray, dst: np.ndarray, kernel_size: int = 3) -> np.ndarray:
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (kernel_size, kernel_size))
+    cv2.morphologyEx(src, cv2.MORPH_OPEN, kernel, dst=dst)
+    return cv2.morphologyEx(dst, cv2.MORPH_CLOSE, kernel, dst=dst)
+
+
+def _enhance_contrast(
+    src: np.ndarray,
+    dst: np.ndarray,
+    alpha: Optional[float] = None,
+    beta: Optional[float] = None
+) -> np.ndarray:
+    if alpha is None:
+        # Stretch the 1st-99th percentile grey range to the full range
+        low, high = np.percentile(src[::4, ::4], (1, 99))
+        if high - low < 1:
+            return src
+        alpha, beta = 255.0 / (high - low), -low * 255.0 / (high - low)
+    return cv2.convertScaleAbs(src, dst=dst, alpha=alpha, beta=beta or 0)
+
+
+def _sharpen_image(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    return cv2.filter2D(src, -1, _SHARPEN_KERNEL, dst=dst)
+
+
+# Grayscale pipeline steps: name -> (function, safe to run in place)
+PIPELINE_STEPS: Dict[str, Tuple[Callable[..., np.ndarray], bool]] = {
+    "median_denoise": (_median_denoise, False),
+    "bilateral_denoise": (_bilateral_denoise, False),
+    "nlmeans_denoise": (_nlmeans_denoise, False),
+    "clahe": (_clahe, False),
+    "gaussian_blur": (_gaussian_blur, False),
+    "adaptive_threshold": (_adaptive_threshold, True),
+    "correct_skew": (_correct_skew, False),
+    "remove_noise": (_remove_noise, False),
+    "enhance_contrast": (_enhance_contrast, True),
+    "sharpen_image": (_sharpen_image, False),
+}
+
+
+class ProcessingPipeline:
+    """A fixed list of grayscale steps run in a single pass.
+
+    The input is converted to grayscale once and every step then writes into
+    one of two preallocated frame buffers (or in place, for point-wise steps),
+    so a chain of any length allocates at most two grayscale frames plus the
+    output. Pipelines hold no per-call state and can be shared across threads.
+    """
+
+    def __init__(self, steps: Sequence[StepSpec], output: Optional[str] = None):
+        """
+        Args:
+            steps: Step names from ``PIPELINE_STEPS``, or ``(name, params)`` pairs
+            output: "gray" or "rgb"; by default the output matches the input's channels
+        """
+        self.steps: List[Tuple[str, Dict[str, Any]]] = []
+        for step in steps:
+            name, params = (step, {}) if isinstance(step, str) else step
+            if name not in PIPELINE_STEPS:
+                raise ValueError(f"Unknown processing step: {name}")
+            self.steps.append((name, dict(params)))
+        if output not in (None, "gray", "rgb"):
+            raise ValueError(f"Unknown pipeline output: {output}")
+        self.output = output
+
+    def run(self, image: np.ndarray) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Run every step on ``image``. The input array is never modified.
+
+        Returns:
+            ``(processed_image, timings)`` with one ``{"name", "ms"}`` entry per step
+        """
+        color_input = len(image.shape) == 3
+        if not self.steps and (self.output is None or self.output == ("rgb" if color_input else "gray")):
+            return image, []
+
+        if color_input:
+            current = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        else:
+            current = image
+        owned = current is not image
+        spare: Optional[np.ndarray] = None
+
+        timings = []
+        for name, params in self.steps:
+            function, in_place = PIPELINE_STEPS[name]
+            start = time.perf_counter()
+            if in_place and owned:
+                target = current
+            else:
+                if spare is None:
+                    spare = np.empty_like(current)
+                target = spare
+            result = function(current, target, **params)
+            if result is not current:
+                # Ping-pong between the two frame buffers
+                spare = current if owned else None
+                current, owned = result, True
+            timings.append({"name": name, "ms": round((time.perf_counter() - start) * 1000, 2)})
+
+        if self.output == "gray" or (self.output is None and not color_input):
+            return (current if owned else current.copy()), timings
+        return cv2.cvtColor(current, cv2.COLOR_GRAY2RGB), timings
+
+
+_TEXT_DETECTION_PIPELINE = ProcessingPipeline(["gaussian_blur", "adaptive_threshold"])
+
+# Steps run by each fixed enhancement preset
+PRESET_PIPELINES: Dict[str, List[StepSpec]] = {
+    "none": [],
+    "fast": ["median_denoise", "clahe"],
+    "balanced": ["bilateral_denoise", "clahe"],
+    "quality": ["nlmeans_denoise", "clahe"],
+}
+
 class ImageProcessor:
     """Image processing utilities for technical drawings and component images."""
     
     def __init__(self):
         self.logger = logger
     
-    def enhance_technical_drawing(self, image: np.ndarray) -> np.ndarray:
+    def enhance_technical_drawing(self, image: np.ndarray, preset: str = DEFAULT_PRESET) -> np.ndarray:
         """
         Enhance technical drawings for better OCR accuracy.
         
         Args:
             image: Input image as numpy array
+            preset: Enhancement preset, one of ``ENHANCEMENT_PRESETS``
             
         Returns:
             Enhanced image as numpy array
         """
+        return self.enhance_with_report(image, preset)[0]
+
+    def enhance_with_report(
+        self,
+        image: np.ndarray,
+        preset: str = DEFAULT_PRESET,
+        output: Optional[str] = None,
+        deskew: str = "auto"
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Enhance an image and report what was done.
+
+        Args:
+            image: Input image as numpy array
+            preset: Enhancement preset, one of ``ENHANCEMENT_PRESETS``
+            output: "gray" to return a single-channel image, see :class:`ProcessingPipeline`
+            deskew: Skew correction mode, one of ``DESKEW_MODES``
+
+        Returns:
+            ``(enhanced_image, report)`` where ``report`` lists the steps that
+            ran with their duration in milliseconds, plus the quality metrics
+            for the "auto" preset and the skew estimate when one was made
+        """
+        self._check_modes(preset, deskew)
+        report: Dict[str, Any] = {"preset": preset, "steps": []}
         try:
-            # Convert to grayscale if needed
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image.copy()
-            
-            # Apply noise reduction
-            denoised = cv2.fastNlMeansDenoising(gray)
-            
-            # Enhance contrast using CLAHE
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(denoised)
-            
-            # Apply morphological operations to clean up text
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 1))
-            cleaned = cv2.morphologyEx(enhanced, cv2.MORPH_CLOSE, kernel)
-            
-            # Convert back to RGB for consistency
-            if len(image.shape) == 3:
-                result = cv2.cvtColor(cleaned, cv2.COLOR_GRAY2RGB)
-            else:
-                result = cleaned
-                
-            return result
-            
+            plan, report = self.plan_steps(image, preset, deskew)
+            result, timings = ProcessingPipeline(plan, output=output).run(image)
         except Exception as e:
             self.logger.error(f"Image enhancement failed: {e}")
-            return image
-    
+            return image, {**report, "error": str(e)}
+
+        report["steps"].extend(timings)
+        return result, report
+
+    def plan_steps(
+        self,
+        image: np.ndarray,
+        preset: str = DEFAULT_PRESET,
+        deskew: str = "auto"
+    ) -> Tuple[List[StepSpec], Dict[str, Any]]:
+        """
+        Decide the pipeline steps for an image without running them.
+
+        Args:
+            image: Input image as numpy array
+            preset: Enhancement preset, one of ``ENHANCEMENT_PRESETS``
+            deskew: Skew correction mode, one of ``DESKEW_MODES``
+
+        Returns:
+            ``(steps, report)``: steps for :class:`ProcessingPipeline` and the
+            start of the enhancement report, including any analysis timings
+        """
+        self._check_modes(preset, deskew)
+        report: Dict[str, Any] = {"preset": preset, "steps": []}
+        if preset == "auto":
+            start = time.perf_counter()
+            metrics = self.analyze_quality(image)
+            plan = self.plan_enhancement(metrics, deskew=deskew)
+            report["metrics"] = metrics
+            report["steps"].append({"name": "analyze", "ms": round((time.perf_counter() - start) * 1000, 2)})
+            skew = {"angle": metrics["skew"], "confidence": metrics["skew_confidence"]}
+        else:
+            plan = list(PRESET_PIPELINES[preset])
+            skew = None
+            if deskew == "on":
+                start = time.perf_counter()
+                skew = self.estimate_skew(image)
+                report["steps"].append({"name": "estimate_skew", "ms": round((time.perf_counter() - start) * 1000, 2)})
+                if self._should_deskew(skew["angle"], skew["confidence"]):
+                    plan.insert(0, ("correct_skew", {"angle": skew["angle"]}))
+
+        if skew is not None:
+            report["skew"] = {**skew, "applied": any(self._step_name(step) == "correct_skew" for step in plan)}
+        return plan, report
+
+    @staticmethod
+    def _check_modes(preset: str, deskew: str) -> None:
+        if preset not in ENHANCEMENT_PRESETS:
+            raise ValueError(f"Unknown enhancement preset: {preset}")
+        if deskew not in DESKEW_MODES:
+            raise ValueError(f"Unknown deskew mode: {deskew}")
+
+    @staticmethod
+    def _step_name(step: StepSpec) -> str:
+        return step if isinstance(step, str) else step[0]
+
+    @staticmethod
+    def _should_deskew(angle: float, confidence: float) -> bool:
+        return abs(angle) >= SKEW_THRESHOLD and confidence >= SKEW_CONFIDENCE_THRESHOLD
+
+    def estimate_skew(self, image: np.ndarray, max_skew: float = 10.0) -> Dict[str, float]:
+        """
+        Estimate page skew on a downsampled copy, see :func:`utils.skew.estimate_skew`.
+
+        Args:
+            image: Input image as numpy array
+            max_skew: Largest skew to search for, in degrees
+
+        Returns:
+            ``angle`` in degrees and ``confidence`` (0-1)
+        """
+        scale = min(1.0, SKEW_ANALYSIS_SIZE / max(image.shape[:2]))
+        if scale < 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return estimate_skew(self._to_gray(image), max_skew=max_skew)
+
+    def analyze_quality(self, image: np.ndarray) -> Dict[str, float]:
+        """
+        Measure noise, contrast, sharpness and skew cheaply.
+
+        Noise, contrast and skew are measured on a subsampled thumbnail;
+        sharpness on one full-resolution window around the densest ink, since
+        downsampling would hide blur.
+
+        Args:
+            image: Input image as numpy array
+
+        Returns:
+            ``noise`` (estimated standard deviation in grey levels),
+            ``contrast`` (paper minus ink level, 0-1), ``sharpness`` (0-1),
+            ``skew`` (degrees), ``skew_confidence`` (0-1) and ``ink_fraction``;
+            images under ``MIN_ANALYSIS_SIZE`` pixels per side get neutral
+            metrics that plan no steps
+        """
+        height, width = image.shape[:2]
+        metrics = {
+            "noise": 0.0,
+            "contrast": 0.0,
+            "sharpness": 1.0,
+            "skew": 0.0,
+            "skew_confidence": 0.0,
+            "ink_fraction": 0.0,
+        }
+        if min(height, width) < MIN_ANALYSIS_SIZE:
+            return metrics
+        step = max(1, math.ceil(max(height, width) / ANALYSIS_SIZE))
+        # Nearest-neighbour subsampling keeps per-pixel noise intact, unlike area averaging
+        thumb = self._to_gray(cv2.resize(
+            image, (math.ceil(width / step), math.ceil(height / step)), interpolation=cv2.INTER_NEAREST
+        ))
+
+        # Noise: robust version of Immerkaer's Laplacian-difference estimator,
+        # with the median taken from a histogram of the saturated responses
+        laplacian = cv2.convertScaleAbs(cv2.filter2D(thumb, cv2.CV_16S, _NOISE_KERNEL)[1:-1, 1:-1])
+        counts = np.bincount(laplacian.ravel(), minlength=256)
+        median = int(np.searchsorted(np.cumsum(counts), laplacian.size / 2))
+        noise = 1.4826 * median / 6.0
+
+        # Contrast: gap between the paper and ink levels found by Otsu
+        threshold, binary = cv2.threshold(thumb, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        ink = binary == 0
+        ink_fraction = float(np.count_nonzero(ink)) / ink.size
+        if 0 < ink_fraction < 1:
+            contrast = float(thumb[~ink].mean() - thumb[ink].mean()) / 255.0
+        else:
+            contrast = 0.0
+
+        metrics["noise"] = round(float(noise), 2)
+        metrics["contrast"] = round(contrast, 3)
+        metrics["ink_fraction"] = round(ink_fraction, 4)
+        if ink_fraction < MIN_INK_FRACTION or contrast <= 0:
+            return metrics
+
+        metrics["sharpness"] = round(self._measure_sharpness(image, ink, step, contrast), 3)
+        skew = estimate_skew(thumb)
+        metrics["skew"], metrics["skew_confidence"] = skew["angle"], skew["confidence"]
+        return metrics
+
+    def plan_enhancement(self, metrics: Dict[str, float], deskew: str = "auto") -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Choose the enhancement steps an image needs from its quality metrics.
+
+        Args:
+            metrics: Output of :meth:`analyze_quality`
+            deskew: "off" to never correct skew
+
+        Returns:
+            ``(step, params)`` pairs for :class:`ProcessingPipeline`, in the
+            order they should run; empty for clean images
+        """
+        if metrics["ink_fraction"] < MIN_INK_FRACTION:
+            return []
+
+        steps: List[Tuple[str, Dict[str, Any]]] = []
+        if deskew != "off" and self._should_deskew(metrics["skew"], metrics["skew_confidence"]):
+            steps.append(("correct_skew", {"angle": metrics["skew"]}))
+        noisy = metrics["noise"] >= NOISE_THRESHOLD
+        if noisy:
+            steps.append(("remove_noise", {}))
+        if metrics["contrast"] < CONTRAST_THRESHOLD:
+            steps.append(("enhance_contrast", {}))
+        # Sharpening amplifies noise, so only sharpen clean but soft images
+        if metrics["sharpness"] < SHARPNESS_THRESHOLD and not noisy:
+            steps.append(("sharpen_image", {}))
+        return steps
+
+    @staticmethod
+    def _to_gray(image: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if len(image.shape) == 3 else image
+
+    def _measure_sharpness(self, image: np.ndarray, ink: np.ndarray, step: int, contrast: float) -> float:
+        """Steepest edge slope in the densest ink window, relative to a perfect step edge."""
+        cell = max(1, SHARPNESS_WINDOW // step)
+        rows, cols = ink.shape[0] // cell, ink.shape[1] // cell
+        if rows and cols:
+            density = ink[:rows * cell, :cols * cell].reshape(rows, cell, cols, cell).sum(axis=(1, 3))
+            row, col = np.unravel_index(int(np.argmax(density)), density.shape)
+        else:
+            row = col = 0
+        y0, x0 = row * cell * step, col * cell * step
+        window = self._to_gray(np.ascontiguousarray(image[y0:y0 + SHARPNESS_WINDOW, x0:x0 + SHARPNESS_WINDOW]))
+
+        # A perfect step edge of height C gives a Sobel response of 4C
+        gx = cv2.Sobel(window, cv2.CV_32F, 1, 0, ksize=3)
+        gy = cv2.Sobel(window, cv2.CV_32F, 0, 1, ksize=3)
+        magnitude = cv2.magnitude(gx, gy)
+        edges = magnitude[magnitude > 0.25 * 4 * contrast * 255]
+        if edges.size == 0:
+            return 1.0
+        return float(min(1.0, np.percentile(edges, 90) / (4 * contrast * 255)))
+
     def preprocess_for_text_detection(self, image: np.ndarray) -> np.ndarray:
         """
         Preprocess image specifically for text detection.
@@ -62,80 +443,41 @@ class ImageProcessor:
             Preprocessed image
         """
         try:
-            # Convert to grayscale
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image.copy()
-            
-            # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-            
-            # Apply adaptive thresholding
-            thresh = cv2.adaptiveThreshold(
-                blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
-            
-            # Convert back to RGB
-            if len(image.shape) == 3:
-                result = cv2.cvtColor(thresh, cv2.COLOR_GRAY2RGB)
-            else:
-                result = thresh
-                
-            return result
+            # Gaussian blur to reduce noise, then adaptive thresholding
+            return _TEXT_DETECTION_PIPELINE.run(image)[0]
             
         except Exception as e:
             self.logger.error(f"Text detection preprocessing failed: {e}")
             return image
     
-    def correct_skew(self, image: np.ndarray, max_skew: float = 10.0) -> np.ndarray:
+    def correct_skew(
+        self,
+        image: np.ndarray,
+        max_skew: float = 10.0,
+        angle: Optional[float] = None,
+        min_confidence: float = SKEW_CONFIDENCE_THRESHOLD
+    ) -> np.ndarray:
         """
         Correct skew in scanned documents.
         
         Args:
             image: Input image
             max_skew: Maximum skew angle to correct (degrees)
+            angle: Skew angle already measured (degrees); skips estimation
+            min_confidence: Only rotate when the estimate is at least this confident
             
         Returns:
             Skew-corrected image
         """
         try:
-            # Convert to grayscale
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image.copy()
-            
-            # Apply edge detection
-            edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-            
-            # Detect lines using Hough transform
-            lines = cv2.HoughLines(edges, 1, np.pi/180, threshold=100)
-            
-            if lines is not None:
-                # Calculate skew angle
-                angles = []
-                for rho, theta in lines[:10]:  # Use first 10 lines
-                    angle = theta * 180 / np.pi - 90
-                    if abs(angle) <= max_skew:
-                        angles.append(angle)
-                
-                if angles:
-                    skew_angle = np.median(angles)
-                    
-                    # Rotate image to correct skew
-                    h, w = image.shape[:2]
-                    center = (w // 2, h // 2)
-                    rotation_matrix = cv2.getRotationMatrix2D(center, skew_angle, 1.0)
-                    
-                    corrected = cv2.warpAffine(
-                        image, rotation_matrix, (w, h),
-                        flags=cv2.INTER_CUBIC,
-                        borderMode=cv2.BORDER_REPLICATE
-                    )
-                    
-                    return corrected
-            
+            if angle is None:
+                estimate = self.estimate_skew(image, max_skew=max_skew)
+                if estimate["confidence"] < min_confidence:
+                    return image
+                angle = estimate["angle"]
+
+            if 0 < abs(angle) <= max_skew:
+                return _correct_skew(image, None, angle=angle)
             return image
             
         except Exception as e:
@@ -174,28 +516,8 @@ class ImageProcessor:
             Denoised image
         """
         try:
-            # Convert to grayscale if needed
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image.copy()
-            
-            # Create morphological kernel
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (kernel_size, kernel_size))
-            
-            # Apply opening to remove noise
-            opened = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-            
-            # Apply closing to fill gaps
-            closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
-            
-            # Convert back to original format
-            if len(image.shape) == 3:
-                result = cv2.cvtColor(closed, cv2.COLOR_GRAY2RGB)
-            else:
-                result = closed
-                
-            return result
+            # Opening removes specks, closing fills gaps
+            return ProcessingPipeline([("remove_noise", {"kernel_size": kernel_size})]).run(image)[0]
             
         except Exception as e:
             self.logger.error(f"Noise removal failed: {e}")
@@ -241,12 +563,7 @@ class ImageProcessor:
             Sharpened image
         """
         try:
-            # Define sharpening kernel
-            kernel = np.array([[-1, -1, -1],
-                             [-1,  9, -1],
-                             [-1, -1, -1]])
-            
-            sharpened = cv2.filter2D(image, -1, kernel)
+            sharpened = cv2.filter2D(image, -1, _SHARPEN_KERNEL)
             return sharpened
             
         except Exception as e:
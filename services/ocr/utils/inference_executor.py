@@ -0,0 +1,146 @@
+import asyncio
+import math
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when the inference executor has no free worker or queue slot."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference executor is at capacity, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Bounded thread pool for blocking OCR work.
+
+    Keeps model inference and image processing off the asyncio event loop.
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more
+    may wait; anything beyond that is rejected immediately with
+    :class:`ExecutorSaturatedError` instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, retry_after: int = 5):
+        self.logger = logger
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = max(1, retry_after)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr-inference")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._avg_task_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the executor and await its result.
+
+        Args:
+            func: Blocking callable to run
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            ExecutorSaturatedError: If all workers are busy and the queue is full
+        """
+        self.ensure_capacity()
+        return await self._submit(func, args, kwargs)
+
+    async def run_admitted(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run follow-up work for a request that has already been admitted.
+
+        Skips the capacity check so a streaming request that passed
+        :meth:`ensure_capacity` is not cut off halfway; the caller bounds how
+        much work it queues at once.
+        """
+        return await self._submit(func, args, kwargs)
+
+    def call_admitted(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Blocking form of :meth:`run_admitted`, for callers on their own threads.
+
+        Background job runners use it so their inference shares the
+        executor's workers, and its limits and statistics, with requests.
+        """
+        return self._submit_future(func, args, kwargs).result()
+
+    def ensure_capacity(self) -> None:
+        """Raise :class:`ExecutorSaturatedError` if all workers and queue slots are taken."""
+        with self._lock:
+            if self._queued + self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(self._estimate_retry_after())
+
+    async def _submit(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        return await asyncio.wrap_future(self._submit_future(func, args, kwargs))
+
+    def _submit_future(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Future:
+        with self._lock:
+            self._queued += 1
+        future = self._pool.submit(self._call, func, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _call(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._in_flight -= 1
+                # Exponentially weighted average, used for Retry-After estimates
+                if self._avg_task_seconds:
+                    self._avg_task_seconds = 0.8 * self._avg_task_seconds + 0.2 * elapsed
+                else:
+                    self._avg_task_seconds = elapsed
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            if future.cancelled():
+                # Cancelled before a worker picked it up, so _call never ran
+                self._queued -= 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def _estimate_retry_after(self) -> int:
+        if not self._avg_task_seconds:
+            return self.retry_after
+        waves = (self._queued + self._in_flight) / self.max_workers
+        return max(1, math.ceil(waves * self._avg_task_seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of queue length, in-flight count and totals."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_task_seconds": round(self._avg_task_seconds, 4),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,353 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    params TEXT NOT NULL,
+    payload BLOB,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority DESC, created_at);
+"""
+
+_STATUS_COLUMNS = (
+    "id, kind, status, priority, progress, message, error, attempts, created_at, started_at, finished_at"
+)
+
+
+class JobCancelledError(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+class JobQueue:
+    """Persistent job queue backed by a local SQLite database.
+
+    Jobs survive a restart: anything still marked running when the service
+    comes back is queued again, unless it has already been started
+    ``max_attempts`` times, in which case it is marked failed. Higher
+    ``priority`` jobs are claimed first, oldest first within a priority.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        self.logger = logger
+        self.db_path = db_path
+        self.max_attempts = max(1, max_attempts)
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def submit(self, kind: str, payload: bytes, params: Dict[str, Any], priority: int = 0) -> str:
+        """
+        Queue a new job.
+
+        Args:
+            kind: Handler name, e.g. ``"extract"``
+            payload: Raw input bytes
+            params: JSON-serializable handler options
+            priority: Higher values run first
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, status, priority, params, payload, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, priority, json.dumps(params), sqlite3.Binary(payload), time.time())
+        )
+        self.notify()
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the next queued job to running and return it with its payload."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, kind, params, payload FROM jobs WHERE status = ? "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                        (RUNNING, time.time(), row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "params": json.loads(row["params"]),
+            "payload": bytes(row["payload"]) if row["payload"] is not None else b"",
+        }
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None) -> None:
+        """Record progress (0.0-1.0) and raise if the job has been cancelled."""
+        self._execute(
+            "UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+            (max(0.0, min(1.0, progress)), message, job_id)
+        )
+        if self.is_cancel_requested(job_id):
+            raise JobCancelledError(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        row = self._fetchone("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,))
+        return bool(row and row["cancel_requested"])
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Store a finished job's result and drop its input payload."""
+        self._execute(
+            "UPDATE jobs SET status = ?, progress = 1, result = ?, payload = NULL, finished_at = ? WHERE id = ?",
+            (COMPLETED, json.dumps(result), time.time(), job_id)
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, payload = NULL, finished_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), job_id)
+        )
+
+    def mark_cancelled(self, job_id: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, payload = NULL, finished_at = ? WHERE id = ?",
+            (CANCELLED, time.time(), job_id)
+        )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a job. Queued jobs stop immediately; running jobs stop at their
+        next progress update.
+
+        Returns:
+            The job's status after the request, or None if it does not exist
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, payload = NULL, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                (job_id, RUNNING)
+            )
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's status record (without payload or result)."""
+        row = self._fetchone(f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+        return dict(row) if row else None
+
+    def iter_result(self, job_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield a completed job's JSON result in chunks, reading it incrementally from SQLite."""
+        row = self._fetchone(
+            "SELECT rowid, length(CAST(result AS BLOB)) AS size FROM jobs WHERE id = ?", (job_id,)
+        )
+        if row is None or row["size"] is None:
+            return
+
+        # Read the result as bytes, one slice at a time
+        offset = 0
+        while offset < row["size"]:
+            chunk_row = self._fetchone(
+                "SELECT substr(CAST(result AS BLOB), ?, ?) AS chunk FROM jobs WHERE rowid = ?",
+                (offset + 1, chunk_size, row["rowid"])
+            )
+            if chunk_row is None or not chunk_row["chunk"]:
+                break
+            offset += len(chunk_row["chunk"])
+            yield bytes(chunk_row["chunk"])
+
+    def requeue_interrupted(self) -> int:
+        """
+        Queue again any job left running by a previous process.
+
+        Jobs that have already been started ``max_attempts`` times are marked
+        failed instead, so one that takes the process down is not retried forever.
+
+        Returns:
+            How many jobs were queued again
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                given_up = self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, payload = NULL, finished_at = ? "
+                    "WHERE status = ? AND attempts >= ?",
+                    (FAILED, f"Interrupted {self.max_attempts} times, giving up", time.time(),
+                     RUNNING, self.max_attempts)
+                ).rowcount
+                requeued = self._conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 0, started_at = NULL WHERE status = ?",
+                    (QUEUED, RUNNING)
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if given_up:
+            self.logger.warning(f"Failed {given_up} OCR jobs interrupted {self.max_attempts} times")
+        if requeued:
+            self.logger.info(f"Requeued {requeued} interrupted OCR jobs")
+            self.notify()
+        return requeued
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the retention period. Returns how many."""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        return self._execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+            (*FINISHED_STATUSES, time.time() - older_than_seconds)
+        )
+
+    def notify(self) -> None:
+        """Wake up runners waiting for work."""
+        self._wakeup.set()
+
+    def wait_for_work(self, timeout: float) -> None:
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return job counts per status."""
+        rows = self._fetchall("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+        return {row["status"]: row["count"] for row in rows}
+
+
+class JobRunner:
+    """Background threads that claim jobs from a :class:`JobQueue` and run them.
+
+    Handlers are called as ``handler(payload, params, progress)`` where
+    ``progress(fraction, message=None)`` records progress and raises
+    :class:`JobCancelledError` once the job is cancelled.
+    """
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        handlers: Dict[str, Callable[..., Dict[str, Any]]],
+        num_workers: int = 1,
+        retention_seconds: float = 24 * 3600,
+        poll_interval: float = 1.0
+    ):
+        self.logger = logger
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.num_workers = max(1, num_workers)
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._last_purge = 0.0
+
+    def start(self) -> None:
+        self.job_queue.requeue_interrupted()
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._loop, name=f"ocr-job-runner-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.job_queue.notify()
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self._maybe_purge()
+            try:
+                job = self.job_queue.claim()
+            except Exception as e:
+                self.logger.error(f"Failed to claim OCR job: {e}")
+                job = None
+            if job is None:
+                self.job_queue.wait_for_work(self.poll_interval)
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self.job_queue.fail(job_id, f"Unknown job kind: {job['kind']}")
+            return
+
+        def progress(fraction: float, message: Optional[str] = None) -> None:
+            self.job_queue.update_progress(job_id, fraction, message)
+
+        try:
+            progress(0.0, "started")
+            result = handler(job["payload"], job["params"], progress)
+            if self.job_queue.is_cancel_requested(job_id):
+                raise JobCancelledError(job_id)
+            self.job_queue.complete(job_id, result)
+        except JobCancelledError:
+            self.job_queue.mark_cancelled(job_id)
+            self.logger.info(f"OCR job {job_id} cancelled")
+        except Exception as e:
+            self.logger.error(f"OCR job {job_id} failed: {e}")
+            self.job_queue.fail(job_id, str(e))
+
+    def _maybe_purge(self) -> None:
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        try:
+            purged = self.job_queue.purge(self.retention_seconds)
+            if purged:
+                self.logger.info(f"Purged {purged} finished OCR jobs")
+        except Exception as e:
+            self.logger.error(f"Failed to purge OCR jobs: {e}")
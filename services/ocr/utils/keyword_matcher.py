@@ -0,0 +1,190 @@
+import json
+import re
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Terms and text are split the same way into runs of letters and runs of
+# digits, so "A2-70", "a2 70" and "A2 - 70" are all the same three words
+_WORD = re.compile(r"[^\W\d_]+|\d+")
+
+
+class KeywordMatch(NamedTuple):
+    """A vocabulary term found in text; ``start`` and ``end`` are character offsets."""
+    category: str
+    value: str
+    start: int
+    end: int
+
+
+class _Term(NamedTuple):
+    value: str
+    # Absorb a number written right after the term, e.g. "stainless steel 316"
+    grade: bool
+
+
+def load_vocabulary(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load a keyword vocabulary from a JSON file.
+
+    The file maps each category to a list of entries such as
+    ``{"term": "stainless steel", "synonyms": ["inox", "ss"], "grade": true}``.
+    A plain string is shorthand for an entry without synonyms.
+
+    Raises:
+        ValueError: The file is not a valid vocabulary
+
+    Returns:
+        Entries by category, each with ``term``, ``synonyms`` and ``grade``
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise ValueError(f"Vocabulary {path} must map categories to lists of terms")
+
+    vocabulary = {}
+    for category, entries in raw.items():
+        if not isinstance(entries, list):
+            raise ValueError(f"Vocabulary category {category!r} must be a list")
+        parsed = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"term": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("term"), str):
+                raise ValueError(f"Vocabulary category {category!r} has an entry without a term: {entry!r}")
+            synonyms = entry.get("synonyms", [])
+            if not isinstance(synonyms, list) or not all(isinstance(s, str) for s in synonyms):
+                raise ValueError(f"Synonyms of {entry['term']!r} must be a list of strings")
+            parsed.append({"term": entry["term"], "synonyms": synonyms, "grade": bool(entry.get("grade", False))})
+        vocabulary[category] = parsed
+    return vocabulary
+
+
+class KeywordMatcher:
+    """
+    Find vocabulary terms in text with a word-level trie.
+
+    Every term and synonym is inserted once, word by word, into a trie whose
+    nodes are plain dicts. Matching walks the trie from each word of the text,
+    so its cost depends on the text and the longest term, not on how many
+    terms the vocabulary holds. Matching is case-insensitive, only whole
+    words match, and within a category the longest term starting at the
+    leftmost position wins, without overlaps. Synonyms report their
+    canonical term.
+
+    Args:
+        vocabulary: Entries by category, as returned by :func:`load_vocabulary`
+    """
+
+    # Key of the per-category terms stored at the node where a term ends
+    _END = ""
+
+    def __init__(self, vocabulary: Dict[str, Iterable[Dict[str, Any]]]):
+        self.categories = list(vocabulary)
+        self._root: Dict[str, Any] = {}
+        terms = 0
+        for category, entries in vocabulary.items():
+            for entry in entries:
+                term = _Term(entry["term"].lower(), bool(entry.get("grade", False)))
+                for phrase in [entry["term"], *entry.get("synonyms", [])]:
+                    terms += self._insert(category, phrase, term)
+        logger.info(f"Keyword matcher built with {terms} terms in {len(self.categories)} categories")
+
+    def _insert(self, category: str, phrase: str, term: _Term) -> int:
+        words = _WORD.findall(phrase.lower())
+        if not words:
+            logger.warning(f"Ignoring vocabulary term without letters or digits: {phrase!r}")
+            return 0
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        # First definition wins when a phrase is listed twice in a category
+        node.setdefault(self._END, {}).setdefault(category, term)
+        return 1
+
+    def find(self, text: str) -> Dict[str, List[KeywordMatch]]:
+        """
+        Return the terms found in ``text``, in text order, by category.
+
+        A number following a term marked ``grade`` is appended to its value,
+        e.g. "Stainless Steel 316" gives "stainless steel 316".
+        """
+        results: Dict[str, List[KeywordMatch]] = {category: [] for category in self.categories}
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lower-case to two; keep offsets aligned with ``text``
+            lowered = "".join(char.lower()[:1] for char in text)
+
+        root = self._root
+        words = _WORD.findall(lowered)
+        candidates = [index for index, word in enumerate(words) if word in root]
+        if not candidates:
+            return results
+        offsets = _WordOffsets(lowered, words)
+
+        end_key = self._END
+        # Per category, the first word a new match may start at
+        free_from = dict.fromkeys(self.categories, 0)
+        for index in candidates:
+            node = root[words[index]]
+            longest: Dict[str, Tuple[_Term, int]] = {}
+            last = index
+            while True:
+                for category, term in node.get(end_key, {}).items():
+                    longest[category] = (term, last)
+                last += 1
+                if last == len(words) or words[last] not in node:
+                    break
+                node = node[words[last]]
+
+            for category, (term, last) in longest.items():
+                if index < free_from[category]:
+                    continue
+                value = term.value
+                if term.grade and self._grade_follows(lowered, words, offsets, last):
+                    last += 1
+                    value = f"{value} {words[last]}"
+                results[category].append(KeywordMatch(category, value, offsets.start(index), offsets.end(last)))
+                free_from[category] = last + 1
+        return results
+
+    @staticmethod
+    def _grade_follows(text: str, words: List[str], offsets: "_WordOffsets", last: int) -> bool:
+        """Whether word ``last`` is followed by a number, separated by whitespace at most."""
+        following = last + 1
+        if following == len(words) or not words[following].isdigit():
+            return False
+        gap = text[offsets.end(last):offsets.start(following)]
+        return not gap or gap.isspace()
+
+
+class _WordOffsets:
+    """
+    Character offsets of the words of a text, computed only as far as needed.
+
+    Words are runs of letters or digits and everything between them is
+    neither, so each word is the first occurrence of its text after the
+    previous word ends.
+    """
+
+    def __init__(self, text: str, words: List[str]):
+        self._text = text
+        self._words = words
+        self._starts: List[int] = []
+        # Offset just after the last word located so far
+        self._scanned = 0
+
+    def start(self, index: int) -> int:
+        starts = self._starts
+        if index >= len(starts):
+            find, words, position = self._text.find, self._words, self._scanned
+            for word in words[len(starts):index + 1]:
+                position = find(word, position)
+                starts.append(position)
+                position += len(word)
+            self._scanned = position
+        return starts[index]
+
+    def end(self, index: int) -> int:
+        return self.start(index) + len(self._words[index])
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+# Lines are joined when the horizontal gap between them is below this many
+# line heights...
+HORIZONTAL_GAP = 1.2
+# ...and the vertical gap below this many, so a multi-line callout stays
+# together while neighbouring callouts and table columns stay apart
+VERTICAL_GAP = 0.6
+
+Box = Dict[str, int]
+
+
+def _expanded(box: Box) -> Tuple[float, float, float, float]:
+    """The box grown by half the allowed gaps, so two boxes are neighbours if their expansions touch."""
+    height = max(1, box["y_max"] - box["y_min"])
+    dx, dy = HORIZONTAL_GAP * height / 2, VERTICAL_GAP * height / 2
+    return box["x_min"] - dx, box["y_min"] - dy, box["x_max"] + dx, box["y_max"] + dy
+
+
+def reading_order(boxes: Sequence[Box], indices: Sequence[int]) -> List[int]:
+    """
+    Sort line indices top to bottom, then left to right within a row.
+
+    Lines whose vertical centres are within half a line height of the first
+    line of a row belong to that row.
+    """
+    by_centre = sorted(indices, key=lambda i: (boxes[i]["y_min"] + boxes[i]["y_max"], boxes[i]["x_min"]))
+    ordered: List[int] = []
+    row: List[int] = []
+    row_centre = row_height = 0.0
+    for index in by_centre:
+        box = boxes[index]
+        centre = (box["y_min"] + box["y_max"]) / 2
+        if row and abs(centre - row_centre) > row_height / 2:
+            ordered.extend(sorted(row, key=lambda i: boxes[i]["x_min"]))
+            row = []
+        if not row:
+            row_centre, row_height = centre, max(1, box["y_max"] - box["y_min"])
+        row.append(index)
+    ordered.extend(sorted(row, key=lambda i: boxes[i]["x_min"]))
+    return ordered
+
+
+def cluster_lines(boxes: Sequence[Box]) -> List[List[int]]:
+    """
+    Group text lines that sit next to each other into clusters.
+
+    Lines are inserted into a uniform grid keyed by their expanded boxes, so
+    each line is only compared with lines in the grid cells it covers rather
+    than with every other line on the sheet. Neighbours are merged with a
+    union-find.
+
+    Args:
+        boxes: Line boxes with ``x_min``, ``y_min``, ``x_max`` and ``y_max``
+
+    Returns:
+        Clusters as lists of indices into ``boxes``, each in reading order;
+        clusters are ordered by their first line
+    """
+    if not boxes:
+        return []
+
+    expanded = [_expanded(box) for box in boxes]
+    heights = sorted(box["y_max"] - box["y_min"] for box in boxes)
+    # Cells a few lines tall keep the number of lines per cell small
+    cell = max(8, 4 * heights[len(heights) // 2])
+
+    parent = list(range(len(boxes)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for index, (x0, y0, x1, y1) in enumerate(expanded):
+        for cx in range(int(x0 // cell), int(x1 // cell) + 1):
+            for cy in range(int(y0 // cell), int(y1 // cell) + 1):
+                members = grid[(cx, cy)]
+                for other in members:
+                    ox0, oy0, ox1, oy1 = expanded[other]
+                    if x0 <= ox1 and ox0 <= x1 and y0 <= oy1 and oy0 <= y1:
+                        root, other_root = find(index), find(other)
+                        if root != other_root:
+                            parent[other_root] = root
+                members.append(index)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(boxes)):
+        groups[find(index)].append(index)
+
+    clusters = [reading_order(boxes, members) for members in groups.values()]
+    clusters.sort(key=lambda members: (boxes[members[0]]["y_min"], boxes[members[0]]["x_min"]))
+    return clusters
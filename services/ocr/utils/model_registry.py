@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process, or 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@dataclass
+class ModelEntry:
+    """A resident model and its bookkeeping."""
+    model: Any
+    load_time: float
+    memory_bytes: int
+    hits: int = 0
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ModelRegistry:
+    """Thread-safe cache of loaded OCR models with LRU eviction.
+
+    Each key is built at most once, even when several requests ask for it at
+    the same time. When a memory budget is set, least-recently-used models are
+    evicted to stay under it. A model that knows its size reports it as a
+    ``memory_bytes`` attribute (0 is a valid size); otherwise resident memory
+    is estimated from the process RSS growth while it loads. Loads run one at
+    a time, so concurrent loads do not count each other's growth.
+    """
+
+    def __init__(self, memory_budget_bytes: int = 0, default_model_bytes: int = 0):
+        self.logger = logger
+        self.memory_budget_bytes = memory_budget_bytes
+        self.default_model_bytes = default_model_bytes
+        self._models: "OrderedDict[str, ModelEntry]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Held while a model is built, so RSS deltas measure only that model
+        self._load_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._ready = threading.Event()
+
+    def get(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the model for ``key``, building it with ``factory`` on first use.
+
+        Args:
+            key: Cache key identifying the model variant
+            factory: Zero-argument callable that builds the model
+
+        Returns:
+            The resident model
+        """
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have finished building it while we waited
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry.model
+                self._misses += 1
+
+            with self._load_lock:
+                rss_before = _rss_bytes()
+                start = time.perf_counter()
+                model = factory()
+                load_time = time.perf_counter() - start
+                rss_growth = max(0, _rss_bytes() - rss_before)
+            memory_bytes = getattr(model, "memory_bytes", None)
+            if memory_bytes is None:
+                memory_bytes = rss_growth or self.default_model_bytes
+
+            with self._lock:
+                self._models[key] = ModelEntry(model=model, load_time=load_time, memory_bytes=memory_bytes)
+                self._key_locks.pop(key, None)
+                self._evict(keep=key)
+
+            self.logger.info(
+                f"Loaded model {key} in {load_time:.2f}s (~{memory_bytes / 2**20:.0f} MiB)"
+            )
+            return model
+
+    def _touch(self, key: str):
+        entry = self._models.get(key)
+        if entry is not None:
+            self._models.move_to_end(key)
+            entry.hits += 1
+            self._hits += 1
+        return entry
+
+    def _evict(self, keep: str) -> None:
+        if not self.memory_budget_bytes:
+            return
+        while self._resident_bytes() > self.memory_budget_bytes:
+            victim = next((k for k in self._models if k != keep), None)
+            if victim is None:
+                break
+            evicted = self._models.pop(victim)
+            self._evictions += 1
+            self.logger.info(f"Evicted model {victim} (~{evicted.memory_bytes / 2**20:.0f} MiB)")
+
+    def _resident_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._models.values())
+
+    def preload(self, models: List[Tuple[str, Callable[[], Any]]]) -> List[str]:
+        """
+        Build a set of models up front and mark the registry ready.
+
+        Args:
+            models: ``(key, factory)`` pairs to load
+
+        Returns:
+            Keys that loaded successfully
+        """
+        loaded = []
+        try:
+            for key, factory in models:
+                try:
+                    self.get(key, factory)
+                    loaded.append(key)
+                except Exception as e:
+                    self.logger.error(f"Model preload failed for {key}: {e}")
+        finally:
+            self._ready.set()
+        return loaded
+
+    @property
+    def ready(self) -> bool:
+        """Whether start-up warm-up has finished."""
+        return self._ready.is_set()
+
+    def keys(self) -> List[str]:
+        """Keys of resident models, least recently used first."""
+        with self._lock:
+            return list(self._models.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and per-model load time and memory."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "ready": self.ready,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "resident_bytes": self._resident_bytes(),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "models": {
+                    key: {
+                        "load_time": round(entry.load_time, 3),
+                        "memory_bytes": entry.memory_bytes,
+                        "hits": entry.hits,
+                        "loaded_at": entry.loaded_at,
+                    }
+                    for key, entry in self._models.items()
+                },
+            }
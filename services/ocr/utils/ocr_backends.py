@@ -0,0 +1,423 @@
+"""
+OCR engines behind one interface.
+
+Every backend takes a list of decoded images and returns one
+:class:`OCRPage` per image: the recognized lines with their confidence and
+polygon. The pipeline only sees that format, so engines can be swapped per
+deployment or per request:
+
+- "paddle": PaddleOCR, on CPU or GPU
+- "onnx": PP-OCR detection and recognition models exported to ONNX, run
+  with ONNX Runtime on the CPU; no Paddle install needed
+- "stub": a deterministic stand-in for tests and benchmarks, with an
+  optional simulated latency; it makes up its text, so deployments only
+  offer it when it is enabled explicitly
+
+Engine packages are imported when a backend is built, so importing this
+module (and the service) does not load Paddle or ONNX Runtime.
+"""
+
+import importlib.util
+import logging
+import math
+import os
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OCR_BACKENDS = ("paddle", "onnx", "stub")
+# Tried in this order when the backend is "auto": the fastest engine installed wins
+AUTO_PREFERENCE = ("onnx", "paddle")
+
+Polygon = List[List[float]]
+
+
+@dataclass
+class OCRPage:
+    """Text lines recognized on one image, in reading order."""
+    texts: List[str] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+    # Four or more ``[x, y]`` points per line, in image coordinates
+    polygons: List[Polygon] = field(default_factory=list)
+
+
+class OCRBackend:
+    """
+    An OCR engine: text line detection and recognition.
+
+    Implementations must be safe to call from several threads, as the
+    pipeline shares one instance per language between requests.
+    """
+
+    name = ""
+    # Resident memory of the engine in bytes if it knows it; None lets the
+    # model registry measure it
+    memory_bytes: Optional[int] = None
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[OCRPage]:
+        """
+        Recognize the text on each image.
+
+        Args:
+            images: RGB (or single-channel) images
+
+        Returns:
+            One page per image, in input order
+        """
+        raise NotImplementedError
+
+
+def result_field(res: Any, key: str) -> Any:
+    """Read a field from a PaddleOCR result, which is dict-like in 3.x and attribute-based before."""
+    if hasattr(res, "get"):
+        return res.get(key)
+    return getattr(res, key, None)
+
+
+class PaddleBackend(OCRBackend):
+    """PaddleOCR's detection, orientation and recognition pipeline."""
+
+    name = "paddle"
+
+    def __init__(self, language: str = "en", use_gpu: bool = False, rec_batch_size: int = 16):
+        from paddleocr import PaddleOCR
+
+        self.model = PaddleOCR(
+            use_angle_cls=True,
+            lang=language,
+            use_gpu=use_gpu,
+            show_log=False,
+            use_doc_orientation_classify=True,
+            use_doc_unwarping=True,
+            use_textline_orientation=True,
+            text_recognition_batch_size=rec_batch_size
+        )
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[OCRPage]:
+        pages = []
+        for res in self.model.predict(list(images)):
+            pages.append(OCRPage(
+                texts=list(result_field(res, "rec_texts") or []),
+                scores=[float(score) for score in result_field(res, "rec_scores") or []],
+                polygons=[[[float(x), float(y)] for x, y in poly] for poly in result_field(res, "dt_polys") or []]
+            ))
+        return pages
+
+
+class OnnxBackend(OCRBackend):
+    """
+    PP-OCR models exported to ONNX (e.g. with paddle2onnx), run with ONNX Runtime on the CPU.
+
+    ``model_dir`` holds ``det.onnx``, a DB text detection model, and per
+    language ``rec_<language>.onnx``, a CTC recognition model, with its
+    character dictionary ``rec_<language>.txt`` (one character per line).
+    Pre- and post-processing follow PaddleOCR's defaults for these models.
+
+    Args:
+        language: Selects the recognition model
+        model_dir: Directory with the models
+        threads: ONNX Runtime intra-op threads; 0 lets it decide
+        rec_batch_size: Text lines per recognition call
+    """
+
+    name = "onnx"
+
+    DET_LIMIT_SIDE = 960
+    DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+    DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+    # Probability above which a pixel is text, and mean probability a box needs
+    DET_THRESHOLD = 0.3
+    BOX_THRESHOLD = 0.6
+    # How far a detected text kernel is grown to cover the whole line
+    UNCLIP_RATIO = 1.5
+    MIN_BOX_SIDE = 3
+    MAX_BOXES = 1000
+    REC_HEIGHT = 48
+    REC_MIN_RATIO = 320 / 48
+
+    def __init__(self, language: str = "en", model_dir: str = "", threads: int = 0, rec_batch_size: int = 16):
+        import onnxruntime
+
+        det_path = os.path.join(model_dir, "det.onnx")
+        rec_path = os.path.join(model_dir, f"rec_{language}.onnx")
+        dict_path = os.path.join(model_dir, f"rec_{language}.txt")
+        for path in (det_path, rec_path, dict_path):
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"ONNX OCR model file not found: {path}")
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        providers = ["CPUExecutionProvider"]
+        self.det_session = onnxruntime.InferenceSession(det_path, options, providers=providers)
+        self.rec_session = onnxruntime.InferenceSession(rec_path, options, providers=providers)
+        self.det_input = self.det_session.get_inputs()[0].name
+        self.rec_input = self.rec_session.get_inputs()[0].name
+        self.rec_batch_size = rec_batch_size
+
+        with open(dict_path, encoding="utf-8") as f:
+            characters = [line.rstrip("\r\n") for line in f]
+        # Index 0 is the CTC blank; PP-OCR dictionaries are used with a trailing space
+        self.characters = [""] + characters + [" "]
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[OCRPage]:
+        pages = []
+        for image in images:
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+            boxes = self._detect(image)
+            crops = [self._crop(image, box) for box in boxes]
+            texts, scores = self._recognize(crops)
+            pages.append(OCRPage(
+                texts=texts,
+                scores=scores,
+                polygons=[box.tolist() for box in boxes]
+            ))
+        return pages
+
+    def _detect(self, image: np.ndarray) -> List[np.ndarray]:
+        """Text line quadrilaterals in reading order, as float32 ``(4, 2)`` arrays."""
+        height, width = image.shape[:2]
+        scale = min(1.0, self.DET_LIMIT_SIDE / max(height, width))
+        resized_h = max(32, int(round(height * scale / 32)) * 32)
+        resized_w = max(32, int(round(width * scale / 32)) * 32)
+        resized = cv2.resize(image, (resized_w, resized_h))
+        blob = ((resized.astype(np.float32) / 255 - self.DET_MEAN) / self.DET_STD).transpose(2, 0, 1)[None]
+
+        probability = self.det_session.run(None, {self.det_input: blob})[0][0, 0]
+        bitmap = (probability > self.DET_THRESHOLD).astype(np.uint8)
+        contours, _ = cv2.findContours(bitmap, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        ratio_x, ratio_y = width / resized_w, height / resized_h
+        boxes = []
+        for contour in contours[:self.MAX_BOXES]:
+            (cx, cy), (w, h), angle = cv2.minAreaRect(contour)
+            if min(w, h) < self.MIN_BOX_SIDE:
+                continue
+            if self._box_score(probability, contour) < self.BOX_THRESHOLD:
+                continue
+            # Grow the box by the DB "unclip" distance: area * ratio / perimeter
+            distance = w * h * self.UNCLIP_RATIO / (2 * (w + h))
+            w, h = w + 2 * distance, h + 2 * distance
+            if min(w, h) < self.MIN_BOX_SIDE + 2:
+                continue
+            box = _order_points(cv2.boxPoints(((cx, cy), (w, h), angle)))
+            box[:, 0] = np.clip(box[:, 0] * ratio_x, 0, width - 1)
+            box[:, 1] = np.clip(box[:, 1] * ratio_y, 0, height - 1)
+            boxes.append(box)
+
+        return _reading_order(boxes)
+
+    @staticmethod
+    def _box_score(probability: np.ndarray, contour: np.ndarray) -> float:
+        """Mean text probability inside a contour, over its bounding rectangle only."""
+        x, y, w, h = cv2.boundingRect(contour)
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, [contour.reshape(-1, 2) - (x, y)], 1)
+        return cv2.mean(probability[y:y + h, x:x + w], mask)[0]
+
+    @staticmethod
+    def _crop(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+        """Rectify one text line; vertical lines are rotated to read left to right."""
+        width = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+        height = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+        width, height = max(1, width), max(1, height)
+        target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        crop = cv2.warpPerspective(
+            image, cv2.getPerspectiveTransform(box, target), (width, height),
+            borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC
+        )
+        if height / width >= 1.5:
+            crop = np.ascontiguousarray(np.rot90(crop))
+        return crop
+
+    def _recognize(self, crops: List[np.ndarray]) -> Tuple[List[str], List[float]]:
+        """CTC-decode each crop; crops of similar width share a recognition call."""
+        texts: List[str] = [""] * len(crops)
+        scores: List[float] = [0.0] * len(crops)
+        order = sorted(range(len(crops)), key=lambda i: crops[i].shape[1] / crops[i].shape[0])
+        for start in range(0, len(order), self.rec_batch_size):
+            batch = order[start:start + self.rec_batch_size]
+            max_ratio = max([self.REC_MIN_RATIO] + [crops[i].shape[1] / crops[i].shape[0] for i in batch])
+            batch_width = int(math.ceil(self.REC_HEIGHT * max_ratio))
+            blob = np.zeros((len(batch), 3, self.REC_HEIGHT, batch_width), dtype=np.float32)
+            for row, index in enumerate(batch):
+                crop = crops[index]
+                crop_width = min(batch_width, int(math.ceil(self.REC_HEIGHT * crop.shape[1] / crop.shape[0])))
+                resized = cv2.resize(crop, (crop_width, self.REC_HEIGHT)).astype(np.float32)
+                blob[row, :, :, :crop_width] = (resized / 255 - 0.5).transpose(2, 0, 1) / 0.5
+
+            probabilities = self.rec_session.run(None, {self.rec_input: blob})[0]
+            for row, index in enumerate(batch):
+                texts[index], scores[index] = self._ctc_decode(probabilities[row])
+        return texts, scores
+
+    def _ctc_decode(self, probabilities: np.ndarray) -> Tuple[str, float]:
+        """Greedy CTC decoding: best class per step, repeats collapsed, blanks dropped."""
+        indices = probabilities.argmax(axis=1)
+        confidences = probabilities.max(axis=1)
+        keep = indices != 0
+        keep[1:] &= indices[1:] != indices[:-1]
+        if not keep.any():
+            return "", 0.0
+        text = "".join(self.characters[index] for index in indices[keep] if index < len(self.characters))
+        return text, float(confidences[keep].mean())
+
+
+def _order_points(points: np.ndarray) -> np.ndarray:
+    """Order four corners clockwise from the top left."""
+    by_x = points[np.argsort(points[:, 0])]
+    left = by_x[:2][np.argsort(by_x[:2, 1])]
+    right = by_x[2:][np.argsort(by_x[2:, 1])]
+    return np.float32([left[0], right[0], right[1], left[1]])
+
+
+def _reading_order(boxes: List[np.ndarray]) -> List[np.ndarray]:
+    """Sort boxes top to bottom, and left to right when their tops are within 10 pixels."""
+    boxes = sorted(boxes, key=lambda box: (box[0, 1], box[0, 0]))
+    for i in range(1, len(boxes)):
+        j = i
+        while j > 0 and abs(boxes[j][0, 1] - boxes[j - 1][0, 1]) < 10 and boxes[j][0, 0] < boxes[j - 1][0, 0]:
+            boxes[j], boxes[j - 1] = boxes[j - 1], boxes[j]
+            j -= 1
+    return boxes
+
+
+# Lines the stub backend "recognizes"
+STUB_LINES = (
+    "SOCKET HEAD CAP SCREW", "M8 x 25", "ISO 4762", "DIN 912", "STAINLESS STEEL 304",
+    "GRADE 8.8", "QTY: 4", "HEX HEAD", "ZINC PLATED", "LENGTH: 40mm", "1/4-20 UNC", "Ø12",
+)
+
+
+class StubBackend(OCRBackend):
+    """
+    Deterministic fake OCR: the same image always gives the same lines.
+
+    Lines are drawn from :data:`STUB_LINES`, seeded by the image's size and
+    a sample of its pixels, and laid out in rows over the image. The
+    optional latency is a sleep, which releases the GIL like a real engine,
+    so load tests exercise the service's queues and threads without a model.
+
+    Args:
+        seconds: Latency of every ``predict`` call
+        seconds_per_megapixel: Additional latency per million input pixels
+        lines: Lines returned per image
+    """
+
+    name = "stub"
+    memory_bytes = 0
+
+    def __init__(self, seconds: float = 0.0, seconds_per_megapixel: float = 0.0, lines: int = 8):
+        self.seconds = seconds
+        self.seconds_per_megapixel = seconds_per_megapixel
+        self.lines = lines
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[OCRPage]:
+        delay = self.seconds + self.seconds_per_megapixel * sum(image.shape[0] * image.shape[1] for image in images) / 1e6
+        if delay > 0:
+            time.sleep(delay)
+        return [self._page(image) for image in images]
+
+    def _page(self, image: np.ndarray) -> OCRPage:
+        height, width = image.shape[:2]
+        step = max(1, min(height, width) // 64)
+        rng = random.Random(zlib.crc32(np.ascontiguousarray(image[::step, ::step]).tobytes()) ^ (width << 16) ^ height)
+        line_height = max(1, height // (self.lines * 2))
+        page = OCRPage()
+        for row in range(self.lines):
+            text = rng.choice(STUB_LINES)
+            x_min = rng.randint(0, max(0, width // 2))
+            x_max = min(width - 1, x_min + line_height * len(text) // 2)
+            y_min = row * line_height * 2
+            y_max = min(height - 1, y_min + line_height)
+            page.texts.append(text)
+            page.scores.append(round(rng.uniform(0.8, 1.0), 3))
+            page.polygons.append([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]])
+        return page
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def available_backends(onnx_model_dir: str = "", allow_stub: bool = False) -> List[str]:
+    """
+    Backends this node can run: their engine is installed (and, for "onnx", models are configured).
+
+    Only checks that the packages can be found, without importing them.
+    "stub" is only included with ``allow_stub``.
+    """
+    available = []
+    if _installed("paddleocr"):
+        available.append("paddle")
+    if onnx_model_dir and _installed("onnxruntime"):
+        available.append("onnx")
+    if allow_stub:
+        available.append("stub")
+    return available
+
+
+def resolve_backend(name: str, onnx_model_dir: str = "", allow_stub: bool = False) -> str:
+    """
+    Turn a configured backend name into a concrete one.
+
+    "auto" picks the first of :data:`AUTO_PREFERENCE` that is available,
+    falling back to "paddle" so a missing engine is reported when the model
+    is first built. "auto" never picks the stub.
+
+    Raises:
+        ValueError: For an unknown backend name, or "stub" without ``allow_stub``
+    """
+    if name == "auto":
+        available = available_backends(onnx_model_dir)
+        return next((backend for backend in AUTO_PREFERENCE if backend in available), "paddle")
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    if name == "stub" and not allow_stub:
+        raise ValueError("The stub OCR backend is for tests and benchmarks and is not enabled")
+    return name
+
+
+def build_backend(
+    name: str,
+    language: str = "en",
+    use_gpu: bool = False,
+    rec_batch_size: int = 16,
+    onnx_model_dir: str = "",
+    onnx_threads: int = 0,
+    stub_seconds: float = 0.0,
+    stub_seconds_per_megapixel: float = 0.0
+) -> OCRBackend:
+    """
+    Build an OCR backend.
+
+    Args:
+        name: One of ``OCR_BACKENDS``
+        language: Recognition language
+        use_gpu: Run on the GPU (Paddle only; ONNX Runtime runs on the CPU)
+        rec_batch_size: Text lines per recognition call
+        onnx_model_dir: Model directory of the "onnx" backend
+        onnx_threads: ONNX Runtime intra-op threads, 0 for its default
+        stub_seconds: Simulated latency per call of the "stub" backend
+        stub_seconds_per_megapixel: Additional simulated latency per megapixel
+
+    Returns:
+        The backend, ready to predict
+    """
+    if name == "paddle":
+        return PaddleBackend(language, use_gpu, rec_batch_size)
+    if name == "onnx":
+        if use_gpu:
+            logger.warning("The ONNX OCR backend runs on the CPU; use_gpu is ignored")
+        return OnnxBackend(language, onnx_model_dir, onnx_threads, rec_batch_size)
+    if name == "stub":
+        return StubBackend(stub_seconds, stub_seconds_per_megapixel)
+    raise ValueError(f"Unknown OCR backend: {name}")
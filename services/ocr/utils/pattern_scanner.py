@@ -0,0 +1,240 @@
+import re
+from typing import Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
+# Case-insensitive matching folds ASCII upper case and four other characters
+# (İ, ı, ſ and the Kelvin sign) onto ASCII letters; nothing else outside
+# ASCII matches an ASCII character. str.lower() covers all but ı and ſ, and
+# keeps character offsets unless the text contains İ (lowered to two characters).
+_ASCII_FOLD = {
+    **{code: code + 32 for code in range(ord("A"), ord("Z") + 1)},
+    0x130: "i",  # İ
+    0x131: "i",  # ı
+    0x17F: "s",  # ſ
+    0x212A: "k",  # Kelvin sign
+}
+
+
+def _fold_ascii(text: str) -> str:
+    """Lower-case ``text`` the way case-insensitive regexes see ASCII letters, keeping every offset."""
+    folded = text.lower()
+    if text.isascii():
+        return folded
+    if len(folded) != len(text):
+        return text.translate(_ASCII_FOLD)
+    return folded.replace("\u0131", "i").replace("\u017f", "s")
+
+
+class _CharClass(NamedTuple):
+    """A superset of the characters some part of a pattern can match."""
+    chars: FrozenSet[str]
+    digits: bool
+    spaces: bool
+
+    def __contains__(self, char: str) -> bool:
+        return char in self.chars or (self.digits and char.isdigit()) or (self.spaces and char.isspace())
+
+
+class _Literals(NamedTuple):
+    """Literal text every match of a pattern contains, lower-cased for ``re.IGNORECASE`` patterns."""
+    # The literal every match starts with, or ""
+    leading: str
+    # All required ASCII literal runs
+    required: List[str]
+    # A required literal that only characters of ``prefix`` can precede
+    # within a match, or "" (see PatternScanner)
+    anchor: str
+    prefix: Optional[_CharClass]
+
+
+def _char_class(items, ignore_case: bool) -> Optional[_CharClass]:
+    """
+    Characters that a parsed (sub)pattern can match, or None when that is
+    not simple to tell (letters under ``re.IGNORECASE``, negated sets, ``.``...).
+    """
+    chars = set()
+    digits = spaces = False
+    for op, value in items:
+        if op is _sre_parse.LITERAL:
+            char = chr(value)
+            if ignore_case and char.lower() != char.upper():
+                return None
+            chars.add(char)
+        elif op is _sre_parse.IN:
+            for set_op, set_value in value:
+                if set_op is _sre_parse.LITERAL:
+                    char = chr(set_value)
+                    if ignore_case and char.lower() != char.upper():
+                        return None
+                    chars.add(char)
+                elif set_op is _sre_parse.CATEGORY and set_value is _sre_parse.CATEGORY_DIGIT:
+                    digits = True
+                elif set_op is _sre_parse.CATEGORY and set_value is _sre_parse.CATEGORY_SPACE:
+                    spaces = True
+                else:
+                    return None
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT, _sre_parse.SUBPATTERN, _sre_parse.BRANCH):
+            if op is _sre_parse.SUBPATTERN:
+                alternatives = [value[-1]]
+            elif op is _sre_parse.BRANCH:
+                alternatives = value[1]
+            else:
+                alternatives = [value[2]]
+            for alternative in alternatives:
+                inner = _char_class(alternative, ignore_case)
+                if inner is None:
+                    return None
+                chars |= inner.chars
+                digits, spaces = digits or inner.digits, spaces or inner.spaces
+        else:
+            return None
+    return _CharClass(frozenset(chars), digits, spaces)
+
+
+def _required_literals(pattern: str, flags: int) -> _Literals:
+    """
+    Find literal text that every match of ``pattern`` must contain.
+
+    Only top-level runs of plain characters count, so the result is
+    conservative: an empty leading literal, anchor or list means "no shortcut".
+    """
+    try:
+        parsed = list(_sre_parse.parse(pattern, flags))
+    except Exception:
+        return _Literals("", [], "", None)
+
+    runs: List[Tuple[int, str]] = []
+    current = ""
+    current_start = 0
+    for position, (op, value) in enumerate(parsed):
+        if op is _sre_parse.LITERAL:
+            if not current:
+                current_start = position
+            current += chr(value)
+            continue
+        if current:
+            runs.append((current_start, current))
+        current = ""
+    if current:
+        runs.append((current_start, current))
+
+    fold = bool(flags & re.IGNORECASE)
+    literals = [(start, text.lower() if fold else text) for start, text in runs if text.isascii()]
+    leading = next((text for start, text in literals if start == 0), "")
+
+    # The longest literal whose first character cannot be matched by what precedes it
+    anchor, prefix = "", None
+    if not leading:
+        for start, text in sorted(literals, key=lambda literal: -len(literal[1])):
+            candidate = _char_class(parsed[:start], fold)
+            if candidate is not None and not any(char in candidate for char in {text[0], text[0].upper()}):
+                anchor, prefix = text, candidate
+                break
+    return _Literals(leading, [text for _, text in literals], anchor, prefix)
+
+
+class PatternScanner:
+    """
+    Find the matches of many regexes with far less scanning than one pass per pattern.
+
+    The result is the same as running ``re.finditer`` for every pattern
+    separately. Each pattern keeps its own non-overlapping, leftmost
+    matches, and matches of different patterns may overlap. Python's regex
+    engine tries alternatives one by one at every position, so a single
+    combined alternation is no faster than separate passes. The savings
+    come from literals every match must contain, found by fast substring
+    search:
+
+    - A pattern whose required literal is missing from the text is skipped.
+    - A pattern that starts with a literal is tried only where that literal
+      occurs.
+    - A pattern such as ``(\\d+)\\s*mm``, where only digits, spaces and a few
+      other characters can come before a literal, is tried only in the run
+      of those characters just before each occurrence of the literal.
+    - Other patterns fall back to a precompiled ``finditer``.
+
+    Case-insensitive patterns look up literals in an ASCII-folded copy of the
+    text that keeps every character offset.
+
+    Args:
+        patterns: ``(key, pattern, flags)`` triples
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[Hashable, str, int]]):
+        self.keys = [key for key, _, _ in patterns]
+        self._patterns = []
+        for _, pattern, flags in patterns:
+            literals = _required_literals(pattern, flags)
+            self._patterns.append((re.compile(pattern, flags), bool(flags & re.IGNORECASE), literals))
+        self._ignore_case = any(ignore_case for _, ignore_case, _ in self._patterns)
+
+    def scan(self, text: str) -> Dict[Hashable, List["re.Match"]]:
+        """
+        Return every pattern's matches, in text order, keyed by pattern key.
+
+        Patterns that share a key have their matches listed pattern by
+        pattern, in the order the patterns were given.
+        """
+        # Only case-insensitive patterns look up literals in the folded copy
+        folded = _fold_ascii(text) if self._ignore_case else text
+        results: Dict[Hashable, List["re.Match"]] = {key: [] for key in self.keys}
+
+        for key, (regex, ignore_case, literals) in zip(self.keys, self._patterns):
+            haystack = folded if ignore_case else text
+            if any(literal not in haystack for literal in literals.required):
+                continue
+            if literals.anchor:
+                results[key].extend(self._scan_anchored(regex, text, haystack, literals.anchor, literals.prefix))
+                continue
+            leading = literals.leading
+            if not leading:
+                results[key].extend(regex.finditer(text))
+                continue
+
+            matches = results[key]
+            position = haystack.find(leading)
+            while position >= 0:
+                match = regex.match(text, position)
+                if match:
+                    matches.append(match)
+                    # Like finditer, resume after the match (all matches here are non-empty)
+                    position = haystack.find(leading, match.end())
+                else:
+                    position = haystack.find(leading, position + 1)
+        return results
+
+    @staticmethod
+    def _scan_anchored(
+        regex: "re.Pattern",
+        text: str,
+        haystack: str,
+        anchor: str,
+        prefix: _CharClass
+    ) -> List["re.Match"]:
+        """
+        ``regex.finditer(text)``, trying the regex only just before each occurrence of ``anchor``.
+
+        A match that contains the anchor at ``L`` starts within the run of
+        ``prefix`` characters ending at ``L``. The anchor's first character is
+        not in ``prefix``, so these runs do not overlap and are tried in
+        text order, which finds the same leftmost matches as ``finditer``.
+        """
+        matches = []
+        end = 0
+        position = haystack.find(anchor)
+        while position >= 0:
+            start = position
+            while start > end and text[start - 1] in prefix:
+                start -= 1
+            for candidate in range(start, position + 1):
+                match = regex.match(text, candidate)
+                if match:
+                    matches.append(match)
+                    end = match.end()
+                    break
+            position = haystack.find(anchor, max(position + 1, end))
+        return matches
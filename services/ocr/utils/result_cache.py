@@ -0,0 +1,201 @@
+import hashlib
+import json
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Redis tier is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the Redis client the cache uses.
+
+    Selected with a ``memory://`` URL; useful for tests and single-node runs
+    where no Redis server is available.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def ping(self) -> bool:
+        return True
+
+
+def create_redis_client(url: str):
+    """
+    Create a client for the shared cache tier.
+
+    Args:
+        url: ``redis://`` URL, or ``memory://`` for the in-process stand-in
+
+    Returns:
+        Client object, or None if the tier cannot be enabled
+    """
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return LocalRedis()
+    if redis is None:
+        logger.warning("redis package not installed; shared OCR result cache disabled")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+class ResultCache:
+    """Two-tier cache of OCR results keyed by image content and request options.
+
+    The first tier is an in-process LRU bounded by entry count, total size and
+    TTL. The optional second tier is a Redis instance shared across replicas;
+    its hits are copied into the local tier. Redis errors count as misses and
+    never fail a request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 2**20,
+        ttl_seconds: int = 3600,
+        redis_client=None,
+        key_prefix: str = "ocr:result:"
+    ):
+        self.logger = logger
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+
+        self._local: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._redis_errors = 0
+
+    @staticmethod
+    def make_key(image_data: bytes, **options: Any) -> str:
+        """
+        Build a cache key from the raw image bytes and the request options.
+
+        Args:
+            image_data: Raw (encoded) image bytes as uploaded
+            **options: Options that affect the result, e.g. language
+
+        Returns:
+            Hex digest identifying the image/options combination
+        """
+        digest = hashlib.blake2b(image_data, digest_size=16)
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._local.get(key)
+            if item is not None:
+                payload, expires_at = item
+                if expires_at > now:
+                    self._local.move_to_end(key)
+                    self._local_hits += 1
+                    return json.loads(payload)
+                self._drop_local(key)
+
+        payload = self._redis_get(key)
+        if payload is not None:
+            with self._lock:
+                self._redis_hits += 1
+                self._store_local(key, payload)
+            return json.loads(payload)
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a JSON-serializable result in both tiers."""
+        payload = json.dumps(value).encode("utf-8")
+        with self._lock:
+            self._store_local(key, payload)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(self.key_prefix + key, payload, ex=self.ttl_seconds)
+            except Exception as e:
+                self._redis_errors += 1
+                self.logger.warning(f"Shared OCR cache write failed: {e}")
+
+    def _redis_get(self, key: str) -> Optional[bytes]:
+        if self.redis_client is None:
+            return None
+        try:
+            return self.redis_client.get(self.key_prefix + key)
+        except Exception as e:
+            self._redis_errors += 1
+            self.logger.warning(f"Shared OCR cache read failed: {e}")
+            return None
+
+    def _store_local(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        if key in self._local:
+            self._drop_local(key)
+        self._local[key] = (payload, time.monotonic() + self.ttl_seconds)
+        self._local_bytes += len(payload)
+        while len(self._local) > self.max_entries or self._local_bytes > self.max_bytes:
+            oldest = next(iter(self._local))
+            self._drop_local(oldest)
+
+    def _drop_local(self, key: str) -> None:
+        payload, _ = self._local.pop(key)
+        self._local_bytes -= len(payload)
+
+    def clear(self) -> None:
+        """Empty the local tier."""
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and hit rate for both tiers."""
+        with self._lock:
+            hits = self._local_hits + self._redis_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._local),
+                "bytes": self._local_bytes,
+                "local_hits": self._local_hits,
+                "shared_hits": self._redis_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "shared_tier": self.redis_client is not None,
+                "shared_errors": self._redis_errors,
+            }
@@ -0,0 +1,237 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# "auto" finds ruled tables with a line-grid heuristic, "layout" asks the
+# layout detection model, "off" OCRs the whole sheet
+ROI_MODES = ("off", "auto", "layout")
+
+# Regions are detected on a copy of at most this many pixels per side
+ROI_ANALYSIS_SIZE = 1600
+# Ruled lines shorter than this fraction of the sheet side are ignored
+MIN_LINE_FRACTION = 1 / 40
+# Cells covering more than this fraction of the sheet are drawing areas, not table cells
+MAX_CELL_FRACTION = 0.2
+# Smallest cell side in analysis pixels
+MIN_CELL_SIDE = 6
+# A group of at least this many cells counts as a table wherever it sits
+MIN_TABLE_CELLS = 3
+# Tables must lie within this fraction of the sheet side from the drawing frame
+EDGE_BAND = 0.06
+# Padding added around each region so text touching a ruled line is not clipped
+REGION_PADDING = 4
+
+Region = Dict[str, Any]
+
+
+def parse_rois(rois: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Validate client-supplied regions of interest.
+
+    Each ROI is either ``[x_min, y_min, x_max, y_max]`` or a mapping with
+    those keys and an optional ``label``.
+
+    Raises:
+        ValueError: ``rois`` is not a list or an ROI is malformed
+
+    Returns:
+        ``{"label": str, "box": [x_min, y_min, x_max, y_max]}`` per ROI
+    """
+    if not isinstance(rois, (list, tuple)):
+        raise ValueError("rois must be a list")
+    parsed = []
+    for index, roi in enumerate(rois):
+        if isinstance(roi, dict):
+            try:
+                box = [float(roi[key]) for key in ("x_min", "y_min", "x_max", "y_max")]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"ROI {index} needs numeric x_min, y_min, x_max and y_max")
+            label = str(roi.get("label") or f"roi_{index}")
+        elif isinstance(roi, (list, tuple)) and len(roi) == 4:
+            try:
+                box = [float(value) for value in roi]
+            except (TypeError, ValueError):
+                raise ValueError(f"ROI {index} must contain four numbers")
+            label = f"roi_{index}"
+        else:
+            raise ValueError(f"ROI {index} must be [x_min, y_min, x_max, y_max] or an object with those keys")
+        parsed.append({"label": label, "box": box})
+    return parsed
+
+
+def normalize_rois(rois: Sequence[Any], width: int, height: int) -> List[Region]:
+    """
+    Convert client-supplied ROIs to pixel regions clamped to the image.
+
+    Coordinates that are all within 0-1 are read as fractions of the image
+    size. ROIs that fall outside the image are dropped.
+
+    Raises:
+        ValueError: An ROI is malformed (see :func:`parse_rois`)
+
+    Returns:
+        Regions with ``label``, ``source`` and integer pixel coordinates
+    """
+    regions = []
+    for roi in parse_rois(rois):
+        box = roi["box"]
+        if all(0.0 <= value <= 1.0 for value in box):
+            box = [box[0] * width, box[1] * height, box[2] * width, box[3] * height]
+        x_min, x_max = sorted((int(np.clip(box[0], 0, width)), int(np.clip(box[2], 0, width))))
+        y_min, y_max = sorted((int(np.clip(box[1], 0, height)), int(np.clip(box[3], 0, height))))
+        if x_max - x_min < 2 or y_max - y_min < 2:
+            logger.warning(f"Skipping ROI {roi['label']}: empty inside a {width}x{height} image")
+            continue
+        regions.append(_region(roi["label"], "client", x_min, y_min, x_max, y_max))
+    return regions
+
+
+def _region(label: str, source: str, x_min: int, y_min: int, x_max: int, y_max: int) -> Region:
+    return {
+        "label": label,
+        "source": source,
+        "coordinates": {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max},
+    }
+
+
+def _find_cells(lines: np.ndarray) -> List[Sequence[int]]:
+    """Bounding boxes of the closed, roughly rectangular cells enclosed by ruled lines."""
+    contours, hierarchy = cv2.findContours(lines, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return []
+
+    page_area = lines.shape[0] * lines.shape[1]
+    cells = []
+    for contour, (_, _, _, parent) in zip(contours, hierarchy[0]):
+        # In a two-level hierarchy the holes of the line mask are the cells
+        if parent < 0:
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        if w < MIN_CELL_SIDE or h < MIN_CELL_SIDE or w * h > MAX_CELL_FRACTION * page_area:
+            continue
+        if cv2.contourArea(contour) < 0.8 * w * h:
+            continue
+        cells.append((x, y, w, h))
+    return cells
+
+
+def detect_table_regions(image: np.ndarray) -> List[Region]:
+    """
+    Find the title block and other ruled tables (e.g. a BOM) on a drawing sheet.
+
+    Long horizontal and vertical strokes are isolated with morphological
+    opening, the closed cells they enclose are grouped into tables, and only
+    tables near the drawing frame are kept, which is where title blocks and
+    parts lists sit. The table closest to the bottom-right corner is labelled
+    ``title_block``, the rest ``table``. Runs on a downsampled copy and takes
+    a few tens of milliseconds even for large sheets.
+
+    Args:
+        image: RGB or grayscale image
+
+    Returns:
+        Regions in full-resolution pixel coordinates, empty if none were found
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape
+    scale = min(1.0, ROI_ANALYSIS_SIZE / max(height, width))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    ys, xs = np.nonzero(ink)
+    if len(ys) == 0:
+        return []
+    small_h, small_w = ink.shape
+
+    horizontal = cv2.morphologyEx(
+        ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, int(small_w * MIN_LINE_FRACTION)), 1))
+    )
+    vertical = cv2.morphologyEx(
+        ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(3, int(small_h * MIN_LINE_FRACTION))))
+    )
+    # Close one-pixel gaps where ruled lines meet
+    lines = cv2.dilate(cv2.bitwise_or(horizontal, vertical), np.ones((3, 3), np.uint8))
+
+    cells = _find_cells(lines)
+    if not cells:
+        return []
+
+    # Neighbouring cells share a ruled line, so growing each cell by a little
+    # more than a line width joins the cells of one table
+    cell_mask = np.zeros_like(ink)
+    for x, y, w, h in cells:
+        cv2.rectangle(cell_mask, (x - 3, y - 3), (x + w + 3, y + h + 3), 255, -1)
+    group_count, group_labels, stats, _ = cv2.connectedComponentsWithStats(cell_mask)
+    cell_counts = np.bincount([group_labels[y + h // 2, x + w // 2] for x, y, w, h in cells], minlength=group_count)
+
+    # The drawing frame: extent of all ink on the sheet
+    frame = (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+    band = EDGE_BAND * min(small_h, small_w)
+
+    tables = []
+    for group in range(1, group_count):
+        x, y, w, h = (int(value) for value in stats[group, :4])
+        near_frame = min(x - frame[0], y - frame[1], frame[2] - (x + w), frame[3] - (y + h)) <= band
+        if not near_frame or w * h > 0.5 * small_h * small_w:
+            continue
+        corner_distance = (frame[2] - (x + w)) + (frame[3] - (y + h))
+        if cell_counts[group] < MIN_TABLE_CELLS and corner_distance > 2 * band:
+            continue
+        tables.append((corner_distance, x, y, w, h))
+    if not tables:
+        return []
+
+    tables.sort()
+    regions = []
+    for index, (_, x, y, w, h) in enumerate(tables):
+        regions.append(_region(
+            "title_block" if index == 0 else "table",
+            "detected",
+            max(0, int(x / scale) - REGION_PADDING),
+            max(0, int(y / scale) - REGION_PADDING),
+            min(width, int((x + w) / scale) + REGION_PADDING),
+            min(height, int((y + h) / scale) + REGION_PADDING),
+        ))
+    return regions
+
+
+def regions_from_layout(boxes: Sequence[Dict[str, Any]], width: int, height: int,
+                        labels: Optional[Sequence[str]] = ("table",)) -> List[Region]:
+    """
+    Turn layout detection boxes into regions, keeping only the given labels.
+
+    The region closest to the bottom-right corner is labelled ``title_block``.
+
+    Args:
+        boxes: Layout boxes with ``label``, ``score`` and ``coordinate`` ``[x0, y0, x1, y1]``
+        width: Image width in pixels
+        height: Image height in pixels
+        labels: Layout labels to keep (None keeps all)
+
+    Returns:
+        Regions in pixel coordinates
+    """
+    candidates = []
+    for box in boxes:
+        if labels is not None and box.get("label") not in labels:
+            continue
+        x0, y0, x1, y1 = (float(value) for value in box.get("coordinate", [0, 0, 0, 0]))
+        # Degenerate detections would otherwise survive as a padding-sized crop
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            continue
+        x_min, y_min = max(0, int(x0) - REGION_PADDING), max(0, int(y0) - REGION_PADDING)
+        x_max, y_max = min(width, int(x1) + REGION_PADDING), min(height, int(y1) + REGION_PADDING)
+        if x_max - x_min < 2 or y_max - y_min < 2:
+            continue
+        candidates.append(((width - x_max) + (height - y_max), x_min, y_min, x_max, y_max))
+
+    candidates.sort()
+    return [
+        _region("title_block" if index == 0 else "table", "layout", x_min, y_min, x_max, y_max)
+        for index, (_, x_min, y_min, x_max, y_max) in enumerate(candidates)
+    ]
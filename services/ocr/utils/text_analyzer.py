@@ -1,10 +1,27 @@
+import bisect
+import os
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass
 
+from utils.catalog_index import CatalogStore
+from utils.keyword_matcher import KeywordMatch, KeywordMatcher, load_vocabulary
+from utils.line_clusters import cluster_lines
+from utils.text_normalizer import normalize_text
+from utils.pattern_scanner import PatternScanner
+
 logger = logging.getLogger(__name__)
 
+# "text" analyzes the page as one string, "layout" analyzes clusters of
+# neighbouring OCR lines and reports the lines each entry came from
+SPEC_MODES = ("text", "layout")
+
+# Materials, head types and drive types, with their synonyms and trade names
+DEFAULT_VOCABULARY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vocabularies", "fasteners.json"
+)
+
 @dataclass
 class TechnicalSpec:
     """Data class for technical specifications."""
@@ -14,14 +31,31 @@ class TechnicalSpec:
     confidence: float = 0.0
 
 class TechnicalTextAnalyzer:
-    """Analyzer for extracting technical specifications from OCR text."""
+    """
+    Analyzer for extracting technical specifications from OCR text.
     
-    def __init__(self):
+    Args:
+        vocabulary_path: JSON vocabulary of materials, head types and drive
+            types (see :func:`utils.keyword_matcher.load_vocabulary`);
+            defaults to the bundled fastener vocabulary
+        catalog: Catalog snapshot to resolve part numbers and standards
+            against; results then include ``catalog``
+    """
+    
+    def __init__(self, vocabulary_path: Optional[str] = None, catalog: Optional[CatalogStore] = None):
         self.logger = logger
+        self.vocabulary_path = vocabulary_path or DEFAULT_VOCABULARY
+        self.catalog = catalog
         self._init_patterns()
+        self._keywords = KeywordMatcher(load_vocabulary(self.vocabulary_path))
     
     def _init_patterns(self):
-        """Initialize regex patterns for technical specification extraction."""
+        """
+        Initialize regex patterns for technical specification extraction.
+        
+        Materials, head types and drive types are plain vocabulary terms and
+        are matched by the keyword matcher instead.
+        """
         
         # Fastener thread patterns
         self.thread_patterns = [
@@ -32,20 +66,6 @@ class TechnicalTextAnalyzer:
             r'(\d+(?:\.\d+)?)\s*mm\s*[xX×]\s*(\d+(?:\.\d+)?)', # 8mm x 25
         ]
         
-        # Material patterns
-        self.material_patterns = [
-            r'stainless\s+steel\s*(\d+)?',
-            r'carbon\s+steel',
-            r'alloy\s+steel',
-            r'brass',
-            r'aluminum',
-            r'zinc\s+plated?',
-            r'galvanized',
-            r'titanium',
-            r'inconel',
-            r'hastelloy',
-        ]
-        
         # Dimension patterns
         self.dimension_patterns = [
             r'(\d+(?:\.\d+)?)\s*mm',           # 25mm
@@ -69,30 +89,6 @@ class TechnicalTextAnalyzer:
             r'EN\s*(\d+)',
         ]
         
-        # Head type patterns
-        self.head_type_patterns = [
-            r'hex\s+head',
-            r'socket\s+head',
-            r'cap\s+head',
-            r'button\s+head',
-            r'flat\s+head',
-            r'pan\s+head',
-            r'round\s+head',
-            r'countersunk',
-            r'fillister',
-        ]
-        
-        # Drive type patterns
-        self.drive_patterns = [
-            r'phillips',
-            r'slotted',
-            r'torx',
-            r'hex\s+socket',
-            r'allen',
-            r'robertson',
-            r'pozidriv',
-        ]
-        
         # Strength/grade patterns
         self.strength_patterns = [
             r'grade\s*(\d+(?:\.\d+)?)',
@@ -101,13 +97,58 @@ class TechnicalTextAnalyzer:
             r'(\d+(?:\.\d+)?)\s*ksi',
             r'proof\s+load\s*[:\-]?\s*(\d+(?:\.\d+)?)',
         ]
+        
+        # Part number patterns (case-sensitive, matched on the text with its
+        # original case)
+        self.part_number_patterns = [
+            r'\b[A-Z]{2,}\d+[A-Z]*\d*\b',  # ABC123, ABC123D4
+            r'\b\d{3,}-\d{3,}\b',          # 123-456
+            r'\b[A-Z]\d{4,}\b',            # A1234
+        ]
+        
+        # Quantity patterns
+        self.quantity_patterns = [
+            r'qty\s*[:\-]?\s*(\d+)',
+            r'quantity\s*[:\-]?\s*(\d+)',
+            r'(\d+)\s*pcs?',
+            r'(\d+)\s*pieces?',
+            r'pack\s+of\s+(\d+)',
+        ]
+        
+        self._scanner = self._build_scanner()
+        self._part_scanner = PatternScanner(
+            [('part_numbers', pattern, 0) for pattern in self.part_number_patterns]
+        )
     
-    def extract_technical_specifications(self, text: str) -> Dict[str, Any]:
+    def _build_scanner(self) -> PatternScanner:
+        """Compile every case-insensitive pattern into one single-pass scanner, keyed by category."""
+        patterns = []
+        for pattern in self.thread_patterns:
+            # Only metric and UNC/UNF patterns produce thread entries
+            if 'M' in pattern:
+                patterns.append((('threads', 'metric'), pattern, re.IGNORECASE))
+            elif 'UNC' in pattern or 'UNF' in pattern:
+                patterns.append((('threads', 'imperial'), pattern, re.IGNORECASE))
+        
+        categories = [
+            ('dimensions', self.dimension_patterns, re.IGNORECASE),
+            ('standards', self.standard_patterns, re.IGNORECASE),
+            ('strength_grades', self.strength_patterns, re.IGNORECASE),
+            ('quantities', self.quantity_patterns, re.IGNORECASE),
+        ]
+        for category, category_patterns, flags in categories:
+            patterns.extend((category, pattern, flags) for pattern in category_patterns)
+        
+        return PatternScanner(patterns)
+    
+    def extract_technical_specifications(self, text: str, include_spans: bool = False) -> Dict[str, Any]:
         """
         Extract technical specifications from OCR text.
         
         Args:
             text: Input text from OCR
+            include_spans: Add ``spans``: per category, one list per entry of
+                the ``[start, end]`` character spans of ``text`` it was read from
             
         Returns:
             Dictionary containing extracted specifications
@@ -116,207 +157,296 @@ class TechnicalTextAnalyzer:
             return {}
         
         # Normalize text
-        normalized_text = self._normalize_text(text)
+        normalized = normalize_text(text)
         
-        specs = {
-            'threads': self._extract_threads(normalized_text),
-            'materials': self._extract_materials(normalized_text),
-            'dimensions': self._extract_dimensions(normalized_text),
-            'standards': self._extract_standards(normalized_text),
-            'head_types': self._extract_head_types(normalized_text),
-            'drive_types': self._extract_drive_types(normalized_text),
-            'strength_grades': self._extract_strength_grades(normalized_text),
-            'part_numbers': self._extract_part_numbers(normalized_text),
-            'quantities': self._extract_quantities(normalized_text),
-        }
+        specs, spans = self._extract(normalized.text, normalized.cased)
         
         # Remove empty categories
         specs = {k: v for k, v in specs.items() if v}
         
         # Add confidence score
         specs['confidence'] = self._calculate_confidence(specs)
+        self._add_catalog_matches(specs)
+        
+        if include_spans:
+            # The offset map points matches back at the original text without re-scanning it
+            specs['spans'] = {
+                category: [
+                    [list(normalized.original_span(start, end)) for start, end in entry_spans]
+                    for entry_spans in spans[category]
+                ]
+                for category in specs if category in spans
+            }
         
         return specs
     
-    def _normalize_text(self, text: str) -> str:
-        """Normalize text for better pattern matching."""
-        # Convert to lowercase for case-insensitive matching
-        normalized = text.lower()
-        
-        # Replace common OCR errors
-        replacements = {
-            '0': 'o',  # Sometimes O is read as 0
-            'l': '1',  # Sometimes 1 is read as l
-            '×': 'x',  # Normalize multiplication symbols
-            '–': '-',  # Normalize dashes
-            '—': '-',
+    def extract_from_lines(self, lines: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Extract technical specifications from positioned OCR lines.
+        
+        Instead of one page-wide string, lines are grouped into clusters of
+        neighbouring lines (see :func:`utils.line_clusters.cluster_lines`)
+        and each cluster is analyzed on its own, so patterns cannot match
+        across unrelated callouts. Text values found in several clusters are
+        listed once.
+        
+        Args:
+            lines: OCR lines with ``text`` and ``coordinates``, as in the
+                OCR result's ``bounding_boxes``
+            
+        Returns:
+            The same categories as :meth:`extract_technical_specifications`,
+            plus ``sources``: per category, one list per entry of the indices
+            into ``lines`` the entry was read from
+        """
+        specs: Dict[str, List[Any]] = {}
+        sources: Dict[str, List[Set[int]]] = {}
+        # Position of each text value already listed, per category
+        positions: Dict[str, Dict[str, int]] = {}
+        
+        for cluster in cluster_lines([line['coordinates'] for line in lines]):
+            normalized = [normalize_text(lines[index]['text']) for index in cluster]
+            cluster = [index for index, part in zip(cluster, normalized) if part.text]
+            normalized = [part for part in normalized if part.text]
+            if not normalized:
+                continue
+            parts = [part.text for part in normalized]
+            
+            # Offset of each line in the joined cluster text
+            line_starts = []
+            offset = 0
+            for part in parts:
+                line_starts.append(offset)
+                offset += len(part) + 1
+            
+            cluster_specs, cluster_spans = self._extract(
+                ' '.join(parts), ' '.join(part.cased for part in normalized)
+            )
+            for category, items in cluster_specs.items():
+                category_specs = specs.setdefault(category, [])
+                category_sources = sources.setdefault(category, [])
+                category_positions = positions.setdefault(category, {})
+                for item, spans in zip(items, cluster_spans[category]):
+                    boxes = set()
+                    for start, end in spans:
+                        first = bisect.bisect_right(line_starts, start) - 1
+                        last = bisect.bisect_right(line_starts, end - 1) - 1
+                        boxes.update(cluster[first:last + 1])
+                    if isinstance(item, str) and item in category_positions:
+                        category_sources[category_positions[item]].update(boxes)
+                        continue
+                    if isinstance(item, str):
+                        category_positions[item] = len(category_specs)
+                    category_specs.append(item)
+                    category_sources.append(boxes)
+        
+        specs = {k: v for k, v in specs.items() if v}
+        specs['confidence'] = self._calculate_confidence(specs)
+        self._add_catalog_matches(specs)
+        specs['sources'] = {
+            category: [sorted(boxes) for boxes in sources[category]]
+            for category in specs if category in sources
         }
+        return specs
+    
+    def _extract(
+        self,
+        normalized_text: str,
+        cased_text: str
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, List[List[Tuple[int, int]]]]]:
+        """
+        Extract every category from normalized text.
         
-        for old, new in replacements.items():
-            normalized = normalized.replace(old, new)
+        Args:
+            normalized_text: Normalized text
+            cased_text: The same text in its original case (see
+                :attr:`utils.text_normalizer.NormalizedText.cased`)
+        
+        Returns:
+            ``(specs, spans)``: entries per category, and for each entry the
+            ``(start, end)`` offsets of the matches it came from
+        """
+        # One pass over the text finds the matches of every pattern (part
+        # numbers in the original case), and one walk of the vocabulary trie
+        # finds every keyword
+        matches = self._scanner.scan(normalized_text)
+        matches.update(self._part_scanner.scan(cased_text))
+        keywords = self._keywords.find(normalized_text)
+        
+        specs = {
+            'threads': self._extract_threads(matches),
+            'materials': self._unique_keywords(keywords.get('materials', [])),
+            'dimensions': self._extract_dimensions(matches['dimensions']),
+            'standards': self._unique_matches(matches['standards']),
+            'head_types': self._unique_keywords(keywords.get('head_types', [])),
+            'drive_types': self._unique_keywords(keywords.get('drive_types', [])),
+            'strength_grades': self._extract_strength_grades(matches['strength_grades']),
+            'part_numbers': self._extract_part_numbers(matches['part_numbers']),
+            'quantities': self._extract_quantities(matches['quantities']),
+        }
+        
+        threads = matches[('threads', 'metric')] + matches[('threads', 'imperial')]
+        spans = {
+            'threads': [[match.span()] for match in threads],
+            'materials': self._keyword_spans(keywords.get('materials', [])),
+            'dimensions': [[match.span()] for match in matches['dimensions']],
+            'standards': self._match_spans(matches['standards']),
+            'head_types': self._keyword_spans(keywords.get('head_types', [])),
+            'drive_types': self._keyword_spans(keywords.get('drive_types', [])),
+            'strength_grades': [[match.span()] for match in matches['strength_grades'] if match.lastindex >= 1],
+            'part_numbers': [
+                part_spans for part_num, part_spans in self._group_spans(
+                    (match.group(0).strip(), match.span()) for match in matches['part_numbers']
+                ).items() if len(part_num) >= 4
+            ],
+            'quantities': [[match.span()] for match in matches['quantities']],
+        }
+        
+        return specs, spans
+    
+    def iter_specifications(self, texts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract technical specifications from many texts, one result per text.
+        
+        Texts are read and analyzed lazily, so this works on streams of any
+        length. See :func:`utils.batch_analysis.analyze_texts` for running
+        over a process pool.
         
-        # Clean up whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        Args:
+            texts: OCR texts
         
-        return normalized
+        Yields:
+            Specifications for each text, in input order
+        """
+        for text in texts:
+            yield self.extract_technical_specifications(text)
+    
+    def _normalize_text(self, text: str) -> str:
+        """Normalize text for better pattern matching (see :func:`utils.text_normalizer.normalize_text`)."""
+        return normalize_text(text).text
     
-    def _extract_threads(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_threads(self, matches: Dict[Any, List["re.Match"]]) -> List[Dict[str, Any]]:
         """Extract thread specifications."""
         threads = []
         
-        for pattern in self.thread_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if 'M' in pattern:  # Metric thread
-                    diameter = match.group(1)
-                    pitch_or_length = match.group(2)
-                    threads.append({
-                        'type': 'metric',
-                        'diameter': f"M{diameter}",
-                        'pitch_or_length': pitch_or_length,
-                        'full_spec': match.group(0)
-                    })
-                elif 'UNC' in pattern or 'UNF' in pattern:  # Imperial thread
-                    diameter = match.group(1)
-                    pitch = match.group(2)
-                    thread_type = 'UNC' if 'UNC' in match.group(0) else 'UNF'
-                    threads.append({
-                        'type': 'imperial',
-                        'diameter': diameter,
-                        'pitch': pitch,
-                        'thread_class': thread_type,
-                        'full_spec': match.group(0)
-                    })
+        for match in matches[('threads', 'metric')]:
+            threads.append({
+                'type': 'metric',
+                'diameter': f"M{match.group(1)}",
+                'pitch_or_length': match.group(2),
+                'full_spec': match.group(0)
+            })
+        
+        for match in matches[('threads', 'imperial')]:
+            thread_type = 'UNC' if 'unc' in match.group(0).lower() else 'UNF'
+            threads.append({
+                'type': 'imperial',
+                'diameter': match.group(1),
+                'pitch': match.group(2),
+                'thread_class': thread_type,
+                'full_spec': match.group(0)
+            })
         
         return threads
     
-    def _extract_materials(self, text: str) -> List[str]:
-        """Extract material specifications."""
-        materials = []
-        
-        for pattern in self.material_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                material = match.group(0).strip()
-                if material not in materials:
-                    materials.append(material)
-        
-        return materials
+    def _unique_matches(self, matches: List["re.Match"]) -> List[str]:
+        """Matched texts without duplicates, in first-seen order."""
+        return list(dict.fromkeys(match.group(0).strip() for match in matches))
+    
+    def _unique_keywords(self, matches: List[KeywordMatch]) -> List[str]:
+        """Canonical vocabulary terms without duplicates, in first-seen order."""
+        return list(dict.fromkeys(match.value for match in matches))
+    
+    def _group_spans(self, values: Iterable[Tuple[str, Tuple[int, int]]]) -> Dict[str, List[Tuple[int, int]]]:
+        """Spans of each distinct value, in first-seen order."""
+        groups: Dict[str, List[Tuple[int, int]]] = {}
+        for value, span in values:
+            groups.setdefault(value, []).append(span)
+        return groups
+    
+    def _match_spans(self, matches: List["re.Match"]) -> List[List[Tuple[int, int]]]:
+        """Spans per entry of :meth:`_unique_matches`."""
+        return list(self._group_spans((match.group(0).strip(), match.span()) for match in matches).values())
+    
+    def _keyword_spans(self, matches: List[KeywordMatch]) -> List[List[Tuple[int, int]]]:
+        """Spans per entry of :meth:`_unique_keywords`."""
+        return list(self._group_spans((match.value, (match.start, match.end)) for match in matches).values())
     
-    def _extract_dimensions(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_dimensions(self, matches: List["re.Match"]) -> List[Dict[str, Any]]:
         """Extract dimensional specifications."""
         dimensions = []
         
-        for pattern in self.dimension_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                value = match.group(1) if match.lastindex >= 1 else match.group(0)
-                unit = self._extract_unit_from_match(match.group(0))
-                
-                dimensions.append({
-                    'value': float(value) if value.replace('.', '').isdigit() else value,
-                    'unit': unit,
-                    'full_spec': match.group(0)
-                })
+        for match in matches:
+            value = match.group(1) if match.lastindex >= 1 else match.group(0)
+            unit = self._extract_unit_from_match(match.group(0))
+            
+            dimensions.append({
+                'value': float(value) if value.replace('.', '').isdigit() else value,
+                'unit': unit,
+                'full_spec': match.group(0)
+            })
         
         return dimensions
     
-    def _extract_standards(self, text: str) -> List[str]:
-        """Extract standard specifications."""
-        standards = []
-        
-        for pattern in self.standard_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                standard = match.group(0).strip()
-                if standard not in standards:
-                    standards.append(standard)
-        
-        return standards
-    
-    def _extract_head_types(self, text: str) -> List[str]:
-        """Extract head type specifications."""
-        head_types = []
-        
-        for pattern in self.head_type_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                head_type = match.group(0).strip()
-                if head_type not in head_types:
-                    head_types.append(head_type)
-        
-        return head_types
-    
-    def _extract_drive_types(self, text: str) -> List[str]:
-        """Extract drive type specifications."""
-        drive_types = []
-        
-        for pattern in self.drive_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                drive_type = match.group(0).strip()
-                if drive_type not in drive_types:
-                    drive_types.append(drive_type)
-        
-        return drive_types
-    
-    def _extract_strength_grades(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_strength_grades(self, matches: List["re.Match"]) -> List[Dict[str, Any]]:
         """Extract strength/grade specifications."""
         grades = []
         
-        for pattern in self.strength_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if match.lastindex >= 1:
-                    value = match.group(1)
-                    grade_type = self._determine_grade_type(match.group(0))
-                    grades.append({
-                        'value': value,
-                        'type': grade_type,
-                        'full_spec': match.group(0)
-                    })
+        for match in matches:
+            if match.lastindex >= 1:
+                value = match.group(1)
+                grade_type = self._determine_grade_type(match.group(0))
+                grades.append({
+                    'value': value,
+                    'type': grade_type,
+                    'full_spec': match.group(0)
+                })
         
         return grades
     
-    def _extract_part_numbers(self, text: str) -> List[str]:
+    def _extract_part_numbers(self, matches: List["re.Match"]) -> List[str]:
         """Extract part numbers."""
-        # Pattern for common part number formats
-        part_patterns = [
-            r'[A-Z]{2,}\d+[A-Z]*\d*',  # ABC123, ABC123D4
-            r'\d{3,}-\d{3,}',          # 123-456
-            r'[A-Z]\d{4,}',            # A1234
-        ]
-        
-        part_numbers = []
-        for pattern in part_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                part_num = match.group(0).strip()
-                if len(part_num) >= 4 and part_num not in part_numbers:
-                    part_numbers.append(part_num)
+        return [part_num for part_num in self._unique_matches(matches) if len(part_num) >= 4]
+    
+    def _add_catalog_matches(self, specs: Dict[str, Any]) -> None:
+        """
+        Resolve part numbers and standards against the catalog snapshot.
         
-        return part_numbers
+        Adds ``catalog`` with, per category, the entries found in the catalog:
+        the extracted ``candidate``, the catalog ``value``, the edit
+        ``distance`` between them and, for part numbers, the matching
+        ``components``. Nothing is added without a catalog or a match.
+        """
+        catalog = self.catalog.get() if self.catalog else None
+        if catalog is None:
+            return
+        
+        max_distance = self.catalog.max_distance
+        resolved: Dict[str, List[Dict[str, Any]]] = {}
+        for category, resolve in (
+            ('part_numbers', catalog.resolve_part_number),
+            ('standards', catalog.resolve_standard),
+        ):
+            for candidate in specs.get(category, []):
+                match = resolve(candidate, max_distance)
+                if match is None:
+                    continue
+                entry = {'candidate': candidate, 'value': match.value, 'distance': match.distance}
+                if category == 'part_numbers':
+                    entry['components'] = match.entries
+                resolved.setdefault(category, []).append(entry)
+        if resolved:
+            specs['catalog'] = resolved
     
-    def _extract_quantities(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_quantities(self, matches: List["re.Match"]) -> List[Dict[str, Any]]:
         """Extract quantity specifications."""
-        quantity_patterns = [
-            r'qty\s*[:\-]?\s*(\d+)',
-            r'quantity\s*[:\-]?\s*(\d+)',
-            r'(\d+)\s*pcs?',
-            r'(\d+)\s*pieces?',
-            r'pack\s+of\s+(\d+)',
-        ]
-        
         quantities = []
-        for pattern in quantity_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                qty = match.group(1)
-                quantities.append({
-                    'value': int(qty),
-                    'unit': 'pieces',
-                    'full_spec': match.group(0)
-                })
+        for match in matches:
+            quantities.append({
+                'value': int(match.group(1)),
+                'unit': 'pieces',
+                'full_spec': match.group(0)
+            })
         
         return quantities
     
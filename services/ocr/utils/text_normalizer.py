@@ -0,0 +1,211 @@
+import bisect
+import re
+from typing import Dict, List, Tuple
+
+
+def _build_translation() -> Dict[int, str]:
+    """
+    One table for every character mapping, each to exactly one character.
+
+    Lower-cases (İ, which lower-cases to two characters, becomes "i"), folds
+    full-width ASCII to ASCII, turns every whitespace character into a
+    space and unifies the dash, multiplication, quote and diameter signs
+    OCR engines emit. Keeping the mapping one-to-one keeps offsets intact.
+    """
+    table: Dict[int, str] = {}
+    for code in range(0x10000):
+        char = chr(code)
+        if char.isspace():
+            table[code] = " "
+            continue
+        lowered = char.lower()
+        if lowered != char:
+            table[code] = lowered if len(lowered) == 1 else lowered[0]
+    # Full-width forms (common in OCR of CJK title blocks)
+    for code in range(0xFF01, 0xFF5F):
+        table[code] = chr(code - 0xFEE0).lower()
+    table.update({ord(char): "x" for char in "×✕✖"})
+    table.update({ord(char): "-" for char in "‐‑‒–—―−"})
+    table.update({ord(char): '"' for char in "″“”„"})
+    table.update({ord(char): "'" for char in "′‘’"})
+    table.update({ord(char): "ø" for char in "⌀∅"})
+    return table
+
+
+_TRANSLATION = _build_translation()
+# Mapped characters that str.lower() alone does not take care of
+_SYMBOLS = re.compile(
+    "[" + "".join(re.escape(chr(code)) for code, char in _TRANSLATION.items() if chr(code).lower() != char) + "]"
+)
+
+# Letters OCR confuses with digits, and the digit each one stands for
+_DIGIT_CONFUSIONS = str.maketrans({"o": "0", "l": "1", "i": "1", "|": "1"})
+_CONFUSABLE = frozenset("oli|")
+
+# A number as OCR may have garbled it: digits and confusable letters, starting a word (or right after a lone "m" or a
+# digit and "x", as in "m1o" and "8x3o") and ending before a non-letter or a unit
+_NUMBER_TOKEN = re.compile(
+    r"(?:(?<=\bm)|(?<=\dx)|(?<![^\W_]))"
+    r"[0-9oil|]+(?:\.[0-9oil|]+)?"
+    r"(?:(?![^\W\d_])|(?=mm|cm|in|x|ksi|mpa|pc))"
+)
+# Characters after which a number is certainly a number: operators and
+# prefixes of thread and dimension callouts
+_NUMERIC_CONTEXT = frozenset("mx*-#ø/:=")
+
+# A digit next to a confusable letter (also across a decimal point, as in "lo.9")
+_CONFUSION_SITE = re.compile(r"\d(?:[oil|]|(?<=[oil|]\d)|(?<=[oil|]\.\d))")
+_NUMBER_CHARS = frozenset("0123456789oil|.")
+
+_SPACE_RUN = re.compile(r"  +")
+
+
+def _translate(text: str) -> str:
+    """Apply the translation table; the result has the same length as ``text``."""
+    if text.isascii():
+        return text.translate(_TRANSLATION)
+    # İ is the only character that lower-cases to two
+    lowered = text.replace("\u0130", "i").lower()
+    # str.translate is only fast on ASCII text (it caches lookups per
+    # character there); elsewhere replacing the few symbols that actually
+    # occur is several times quicker
+    for symbol in set(_SYMBOLS.findall(lowered)):
+        lowered = lowered.replace(symbol, _TRANSLATION[ord(symbol)])
+    return lowered
+
+
+def _fix_confusions(match: "re.Match") -> str:
+    """
+    Read confusable letters in a number token as digits.
+
+    Letters between or before digits are always converted ("3o4", "l0").
+    Trailing ones are only converted when the surroundings say the token is
+    a plain number: after a callout operator or prefix ("m1o", "x 3o"), or
+    before a unit ("1omm"). Otherwise they are kept, as in "316l".
+    """
+    token = match.group()
+    if _CONFUSABLE.isdisjoint(token):
+        return token
+
+    text, start, end = match.string, match.start(), match.end()
+    before = start - 1
+    while before >= 0 and text[before] == " ":
+        before -= 1
+    numeric = (before >= 0 and text[before] in _NUMERIC_CONTEXT) or (end < len(text) and text[end].isalpha())
+    if numeric:
+        return token.translate(_DIGIT_CONFUSIONS)
+
+    body = token.rstrip("oil|")
+    return body.translate(_DIGIT_CONFUSIONS) + token[len(body):]
+
+
+def _fix_numbers(text: str) -> str:
+    """
+    Apply :func:`_fix_confusions` to every number token with a confusable letter.
+
+    Only tokens around a digit next to a confusable letter are looked at,
+    which in ordinary text is a small fraction of it.
+    """
+    pieces = []
+    done = 0
+    for site in _CONFUSION_SITE.finditer(text):
+        if site.start() < done:
+            continue
+        start = site.start()
+        while start > 0 and text[start - 1] in _NUMBER_CHARS:
+            start -= 1
+        while text[start] == ".":
+            start += 1
+        token = _NUMBER_TOKEN.match(text, start)
+        if token is None or token.end() <= site.start():
+            continue
+        pieces.append(text[done:start])
+        pieces.append(_fix_confusions(token))
+        done = token.end()
+    if not pieces:
+        return text
+    pieces.append(text[done:])
+    return "".join(pieces)
+
+
+class NormalizedText:
+    """
+    Normalized text with a map back to offsets in the original text.
+
+    Normalization changes single characters in place and only collapses
+    whitespace, so the map is a short list of the points where the two
+    texts' offsets shift.
+
+    Args:
+        text: The normalized text
+        original: The text it was normalized from
+        breakpoints: ``(normalized_offset, original_offset)`` pairs where a
+            run of copied text starts, in increasing order
+    """
+
+    def __init__(self, text: str, original: str, breakpoints: List[Tuple[int, int]]):
+        self.text = text
+        self.original = original
+        self._normalized_starts = [normalized for normalized, _ in breakpoints]
+        self._original_starts = [original_offset for _, original_offset in breakpoints]
+
+    @property
+    def cased(self) -> str:
+        """
+        The normalized text with every character taken from the original instead.
+
+        It has the same offsets as ``text`` but keeps the original letter
+        case, for patterns that tell upper case apart (part numbers).
+        """
+        ends = self._normalized_starts[1:] + [len(self.text)]
+        return "".join(
+            self.original[original:original + end - start]
+            for start, end, original in zip(self._normalized_starts, ends, self._original_starts)
+        )
+
+    def to_original(self, offset: int) -> int:
+        """Offset in the original text of the character at ``offset`` in the normalized text."""
+        run = max(0, bisect.bisect_right(self._normalized_starts, offset) - 1)
+        return self._original_starts[run] + offset - self._normalized_starts[run]
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """The ``[start, end)`` span of the original text a normalized span was made from."""
+        if end <= start:
+            position = self.to_original(start)
+            return position, position
+        return self.to_original(start), self.to_original(end - 1) + 1
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Normalize OCR text for pattern matching.
+
+    One translation-table pass lower-cases the text and unifies whitespace,
+    dashes, multiplication signs, quotes and diameter signs. Letters OCR
+    confuses with digits (o/0, l/1, i/1) are then corrected only inside
+    number tokens, so "M1O X 3O" becomes "m10 x 30" while words such as
+    "steel" and grades such as "316L" are left alone. Finally whitespace is
+    collapsed and trimmed.
+
+    Args:
+        text: Raw OCR text
+
+    Returns:
+        The normalized text and its offset map back to ``text``
+    """
+    translated = _fix_numbers(_translate(text))
+
+    pieces: List[str] = []
+    breakpoints: List[Tuple[int, int]] = []
+    length = 0
+    position = len(translated) - len(translated.lstrip(" "))
+    stop = len(translated.rstrip(" "))
+    for run in _SPACE_RUN.finditer(translated, position, stop):
+        breakpoints.append((length, position))
+        pieces.append(translated[position:run.start() + 1])
+        length += run.start() + 1 - position
+        position = run.end()
+    if position < stop or not breakpoints:
+        breakpoints.append((length, position))
+        pieces.append(translated[position:stop])
+    return NormalizedText("".join(pieces), text, breakpoints)
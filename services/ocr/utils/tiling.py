@@ -0,0 +1,145 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Tile = Tuple[int, int, int, int]  # x0, y0, x1, y1
+
+
+def compute_tiles(height: int, width: int, tile_size: int, overlap: int) -> List[Tile]:
+    """
+    Split an image into overlapping tiles that cover it completely.
+
+    Args:
+        height: Image height in pixels
+        width: Image width in pixels
+        tile_size: Tile edge length in pixels
+        overlap: Overlap between neighbouring tiles in pixels
+
+    Returns:
+        Tiles as ``(x0, y0, x1, y1)`` in row-major order
+    """
+    overlap = min(overlap, tile_size // 2)
+    stride = tile_size - overlap
+
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        # Last tile is aligned with the far edge so it stays full size
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def offset_boxes(bounding_boxes: List[Dict[str, Any]], dx: int, dy: int) -> List[Dict[str, Any]]:
+    """Shift tile-local bounding boxes into page coordinates (in place)."""
+    for box in bounding_boxes:
+        coords = box["coordinates"]
+        coords["x_min"] += dx
+        coords["x_max"] += dx
+        coords["y_min"] += dy
+        coords["y_max"] += dy
+        box["polygon"] = [[x + dx, y + dy] for x, y in box["polygon"]]
+    return bounding_boxes
+
+
+def _area(coords: Dict[str, int]) -> int:
+    return max(0, coords["x_max"] - coords["x_min"]) * max(0, coords["y_max"] - coords["y_min"])
+
+
+def _overlap_ratio(a: Dict[str, int], b: Dict[str, int]) -> float:
+    """Intersection over the smaller box, so a line cut at a tile edge matches the full line."""
+    width = min(a["x_max"], b["x_max"]) - max(a["x_min"], b["x_min"])
+    height = min(a["y_max"], b["y_max"]) - max(a["y_min"], b["y_min"])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min(_area(a), _area(b))
+    return (width * height) / smaller if smaller else 0.0
+
+
+def _tile_overlap(a: Tile, b: Tile) -> Optional[Tile]:
+    """The strip two tiles share, or None for tiles that do not touch."""
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
+def _is_seam_duplicate(a: Dict[str, int], b: Dict[str, int], strip: Optional[Tile], overlap_threshold: float) -> bool:
+    """Whether two boxes from different tiles are one detection seen twice in the strip those tiles share."""
+    if strip is None or _overlap_ratio(a, b) <= overlap_threshold:
+        return False
+    return (
+        strip[0] <= max(a["x_min"], b["x_min"]) and min(a["x_max"], b["x_max"]) <= strip[2]
+        and strip[1] <= max(a["y_min"], b["y_min"]) and min(a["y_max"], b["y_max"]) <= strip[3]
+    )
+
+
+def merge_tile_boxes(
+    bounding_boxes: List[Dict[str, Any]],
+    box_tiles: Sequence[int],
+    tiles: Sequence[Tile],
+    overlap_threshold: float = 0.6,
+    cell_size: int = 256
+) -> List[Dict[str, Any]]:
+    """
+    Remove duplicate detections from tile overlap regions.
+
+    Two boxes are duplicates when they come from different tiles, overlap by
+    more than ``overlap_threshold`` of the smaller one, and their
+    intersection lies inside the strip the two tiles share. The larger box
+    (the complete text line) is kept, with confidence as the tie-breaker.
+    Boxes from the same tile are never merged, so nested or crossing text
+    comes out as it does without tiling. Candidates are found through a
+    uniform grid so merging stays close to linear in the number of boxes.
+
+    Args:
+        bounding_boxes: Boxes in page coordinates from all tiles
+        box_tiles: Index into ``tiles`` of the tile each box was detected in
+        tiles: The tiles, as from :func:`compute_tiles`
+        overlap_threshold: Minimum intersection over the smaller area to count as a duplicate
+        cell_size: Grid cell size in pixels for candidate lookup
+
+    Returns:
+        De-duplicated boxes in reading order (top to bottom, left to right)
+    """
+    ranked = sorted(
+        range(len(bounding_boxes)),
+        key=lambda i: (_area(bounding_boxes[i]["coordinates"]), bounding_boxes[i]["confidence"]),
+        reverse=True
+    )
+
+    grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    kept: List[int] = []
+
+    for index in ranked:
+        coords = bounding_boxes[index]["coordinates"]
+        tile = box_tiles[index]
+        cells = [
+            (cx, cy)
+            for cx in range(coords["x_min"] // cell_size, coords["x_max"] // cell_size + 1)
+            for cy in range(coords["y_min"] // cell_size, coords["y_max"] // cell_size + 1)
+        ]
+
+        candidates = {kept[i] for cell in cells for i in grid.get(cell, ())}
+        if any(
+            box_tiles[other] != tile and _is_seam_duplicate(
+                coords, bounding_boxes[other]["coordinates"],
+                _tile_overlap(tiles[tile], tiles[box_tiles[other]]), overlap_threshold
+            )
+            for other in candidates
+        ):
+            continue
+
+        for cell in cells:
+            grid[cell].append(len(kept))
+        kept.append(index)
+
+    merged = [bounding_boxes[index] for index in kept]
+    merged.sort(key=lambda box: (box["coordinates"]["y_min"], box["coordinates"]["x_min"]))
+    return merged
@@ -0,0 +1,98 @@
+import io
+import mmap
+import os
+import logging
+from typing import BinaryIO, Union
+
+logger = logging.getLogger(__name__)
+
+# Raw upload bytes: small uploads are plain bytes, larger ones a read-only memory map
+ImageData = Union[bytes, mmap.mmap]
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload or a whole request exceeds its size cap."""
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable file object over any buffer that reads without copying the buffer.
+
+    Unlike ``io.BytesIO``, wrapping a memory map or memoryview does not copy
+    it, and each reader has its own position, so several readers can share
+    one mapped upload.
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_stream(data: ImageData) -> BinaryIO:
+    """Return a file object reading ``data`` in place (``bytes`` are shared by ``BytesIO`` already)."""
+    if isinstance(data, bytes):
+        return io.BytesIO(data)
+    return BufferReader(data)
+
+
+def map_upload(fileobj: BinaryIO, max_bytes: int = 0, spool_bytes: int = 1024 * 1024) -> ImageData:
+    """
+    Give access to an uploaded file without reading it into memory.
+
+    Starlette spools each uploaded file to a temporary file once it grows
+    past its spool threshold. Files at or below ``spool_bytes`` are returned
+    as bytes; larger ones are memory-mapped read-only, so decoding reads
+    them from the page cache rather than from a private copy.
+
+    Args:
+        fileobj: The upload's underlying file (``UploadFile.file``)
+        max_bytes: Size cap for this file (0 disables)
+        spool_bytes: Size up to which the upload is read into memory
+
+    Raises:
+        UploadTooLargeError: The file is larger than ``max_bytes``
+
+    Returns:
+        ``bytes`` or a read-only ``mmap.mmap``; pass it to :func:`release` when done
+    """
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+    if max_bytes and size > max_bytes:
+        raise UploadTooLargeError(f"Upload is {size} bytes, above the {max_bytes} byte limit per file")
+    if size <= spool_bytes:
+        return fileobj.read()
+    # fileno() moves a spooled file that is still in memory onto disk first
+    return mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def release(data: ImageData) -> None:
+    """Unmap a mapped upload; a map still referenced elsewhere is left for garbage collection."""
+    if isinstance(data, mmap.mmap):
+        try:
+            data.close()
+        except BufferError:
+            pass
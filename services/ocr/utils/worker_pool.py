@@ -0,0 +1,341 @@
+import importlib
+import itertools
+import logging
+import multiprocessing as mp
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised for tasks that were running on a worker process that died."""
+
+
+def _worker_main(
+    worker_id: int,
+    task_module: str,
+    initializer: Optional[str],
+    initargs: Tuple,
+    stats_function: Optional[str],
+    task_queue: mp.Queue,
+    result_conn: Connection
+) -> None:
+    """Entry point of an OCR worker process.
+
+    Loads its models once through ``initializer`` and then serves tasks until
+    it receives ``None``. Images arrive as shared memory blocks and are viewed
+    in place rather than copied; a task receives a list of images when it was
+    submitted with one. The output of ``stats_function`` is sent along with
+    every result, so the parent can report the worker's state. Results go
+    back on a pipe of this worker's own, so a worker killed while sending
+    cannot leave a lock held that other workers need.
+    """
+    module = importlib.import_module(task_module)
+    tasks = module.WORKER_TASKS
+
+    def report() -> Any:
+        if not stats_function:
+            return None
+        try:
+            return getattr(module, stats_function)()
+        except Exception as e:
+            logger.error(f"Worker {worker_id} stats failed: {e}")
+            return None
+
+    preloaded = None
+    if initializer:
+        try:
+            preloaded = getattr(module, initializer)(*initargs)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} model preload failed: {e}")
+    result_conn.send((None, worker_id, True, preloaded, report()))
+
+    while True:
+        message = task_queue.get()
+        if message is None:
+            break
+
+        task_id, task_name, blocks, is_list, kwargs = message
+        segments = [shared_memory.SharedMemory(name=name) for name, _, _ in blocks]
+        try:
+            images = [
+                np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                for shm, (_, shape, dtype) in zip(segments, blocks)
+            ]
+            result = tasks[task_name](images if is_list else images[0], **kwargs)
+            result_conn.send((task_id, worker_id, True, result, report()))
+        except Exception as e:
+            result_conn.send((task_id, worker_id, False, f"{type(e).__name__}: {e}", report()))
+        finally:
+            images = None
+            for shm in segments:
+                try:
+                    shm.close()
+                except BufferError:
+                    # A library still holds a view; the block is released on unlink
+                    pass
+
+
+class OCRWorkerPool:
+    """Pool of OCR worker processes, each with its own resident models.
+
+    Decoded images are handed to workers through shared memory, so the only
+    copy is the one into the shared block. Each task goes to the worker with
+    the fewest outstanding tasks.
+
+    Args:
+        num_workers: Worker processes to run
+        task_module: Module defining ``WORKER_TASKS``, imported by each worker
+        initializer: Function of the task module run once per worker, e.g. to load models
+        initargs: Arguments for ``initializer``
+        stats_function: Function of the task module whose result each worker
+            reports with every task, as ``stats`` in :meth:`stats`
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        task_module: str = "inference",
+        initializer: Optional[str] = None,
+        initargs: Tuple = (),
+        stats_function: Optional[str] = None
+    ):
+        self.logger = logger
+        self.num_workers = num_workers
+        self.task_module = task_module
+        self.initializer = initializer
+        self.initargs = initargs
+        self.stats_function = stats_function
+
+        self._ctx = mp.get_context("spawn")
+        self._processes: List[Optional[mp.Process]] = [None] * num_workers
+        self._task_queues: List[Optional[mp.Queue]] = [None] * num_workers
+        self._result_conns: List[Optional[Connection]] = [None] * num_workers
+        self._pending: List[int] = [0] * num_workers
+        self._ready: List[bool] = [False] * num_workers
+        self._completed: List[int] = [0] * num_workers
+        self._preloaded: List[Any] = [None] * num_workers
+        self._reported: List[Any] = [None] * num_workers
+        self._crashes = 0
+
+        self._futures: Dict[int, Tuple[int, Future, List[shared_memory.SharedMemory]]] = {}
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        """Spawn the worker processes and the result listener thread."""
+        self._running = True
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        self._listener = threading.Thread(target=self._listen, name="ocr-worker-results", daemon=True)
+        self._listener.start()
+        self.logger.info(f"Started {self.num_workers} OCR worker processes")
+
+    def _spawn(self, worker_id: int) -> None:
+        task_queue = self._ctx.Queue()
+        result_reader, result_writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id, self.task_module, self.initializer, self.initargs, self.stats_function,
+                task_queue, result_writer
+            ),
+            name=f"ocr-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        # Only the worker writes, so the reader sees EOF once it exits; a
+        # replaced worker's reader is closed by the listener at that EOF
+        result_writer.close()
+        self._task_queues[worker_id] = task_queue
+        self._result_conns[worker_id] = result_reader
+        self._processes[worker_id] = process
+        self._ready[worker_id] = False
+        self._reported[worker_id] = None
+
+    def submit(self, task_name: str, image: Union[np.ndarray, List[np.ndarray]], **kwargs: Any) -> Future:
+        """
+        Queue a task on the least-loaded worker.
+
+        Args:
+            task_name: Name of a task in the task module's ``WORKER_TASKS``
+            image: Decoded image, or list of images, copied once into shared memory
+            **kwargs: Keyword arguments for the task
+
+        Returns:
+            Future resolving to the task's return value
+        """
+        if not self._running:
+            raise RuntimeError("OCR worker pool is not running")
+        # Replace crashed workers now rather than at the listener's next idle check
+        self._check_workers()
+
+        is_list = isinstance(image, list)
+        segments = []
+        blocks = []
+        for array in (image if is_list else [image]):
+            array = np.ascontiguousarray(array)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            segments.append(shm)
+            blocks.append((shm.name, array.shape, array.dtype.str))
+
+        future: Future = Future()
+        with self._lock:
+            task_id = next(self._task_ids)
+            # Least-loaded dispatch: fewest outstanding tasks, ready workers first
+            worker_id = min(
+                range(self.num_workers),
+                key=lambda i: (self._pending[i], not self._ready[i], i)
+            )
+            self._pending[worker_id] += 1
+            self._futures[task_id] = (worker_id, future, segments)
+            self._task_queues[worker_id].put((task_id, task_name, blocks, is_list, kwargs))
+        return future
+
+    def run(self, task_name: str, image: Union[np.ndarray, List[np.ndarray]], **kwargs: Any) -> Any:
+        """Run a task on a worker process and block until it finishes."""
+        return self.submit(task_name, image, **kwargs).result()
+
+    def _listen(self) -> None:
+        while self._running:
+            with self._lock:
+                conns = [conn for conn in self._result_conns if conn is not None]
+            try:
+                ready = wait(conns, timeout=1.0)
+            except (OSError, ValueError):
+                # Pipes closed by shutdown() while waiting
+                continue
+            if not ready:
+                self._check_workers()
+                continue
+            for conn in ready:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    # The worker is gone (or was replaced while we waited)
+                    self._drop_connection(conn)
+                    continue
+                self._handle(*message)
+
+    def _drop_connection(self, conn: Connection) -> None:
+        """Stop listening to a worker's closed result pipe and replace the worker."""
+        exited = None
+        with self._lock:
+            for worker_id, current in enumerate(self._result_conns):
+                if current is conn:
+                    self._result_conns[worker_id] = None
+                    exited = self._processes[worker_id]
+        conn.close()
+        if exited is not None:
+            # The pipe closes as the process exits; wait until it can be seen as dead
+            exited.join(timeout=1.0)
+        self._check_workers()
+
+    def _handle(self, task_id: Optional[int], worker_id: int, ok: bool, payload: Any, reported: Any) -> None:
+        """Record one message from a worker: its start-up report or a task's outcome."""
+        self._reported[worker_id] = reported
+        if task_id is None:
+            self._ready[worker_id] = True
+            self._preloaded[worker_id] = payload
+            self.logger.info(f"OCR worker {worker_id} ready")
+            return
+
+        with self._lock:
+            entry = self._futures.pop(task_id, None)
+            if entry is None:
+                return
+            self._pending[worker_id] -= 1
+            self._completed[worker_id] += 1
+        _, future, segments = entry
+        self._release(segments)
+        if ok:
+            future.set_result(payload)
+        else:
+            future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self) -> None:
+        """Fail the tasks of crashed workers and replace the processes."""
+        for worker_id in range(self.num_workers):
+            with self._lock:
+                process = self._processes[worker_id]
+                if not self._running or process is None or process.is_alive():
+                    continue
+                self.logger.error(f"OCR worker {worker_id} exited with code {process.exitcode}, restarting")
+                lost = [task_id for task_id, entry in self._futures.items() if entry[0] == worker_id]
+                entries = [self._futures.pop(task_id) for task_id in lost]
+                self._pending[worker_id] = 0
+                self._crashes += 1
+                self._spawn(worker_id)
+            for _, future, segments in entries:
+                self._release(segments)
+                future.set_exception(WorkerCrashedError(f"OCR worker {worker_id} crashed"))
+
+    @staticmethod
+    def _release(segments: List[shared_memory.SharedMemory]) -> None:
+        for shm in segments:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    @property
+    def ready(self) -> bool:
+        """Whether every worker has finished loading its models."""
+        return self._running and all(self._ready)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-worker load and liveness."""
+        with self._lock:
+            workers = [
+                {
+                    "worker_id": worker_id,
+                    "pid": process.pid if process else None,
+                    "alive": bool(process and process.is_alive()),
+                    "ready": self._ready[worker_id],
+                    "pending": self._pending[worker_id],
+                    "completed": self._completed[worker_id],
+                    "preloaded": self._preloaded[worker_id],
+                    "stats": self._reported[worker_id],
+                }
+                for worker_id, process in enumerate(self._processes)
+            ]
+            return {
+                "ready": all(self._ready),
+                "num_workers": self.num_workers,
+                "crashes": self._crashes,
+                "workers": workers,
+            }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Ask workers to exit, terminating any that do not stop in time."""
+        self._running = False
+        for task_queue in self._task_queues:
+            if task_queue is not None:
+                task_queue.put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._result_conns:
+            if conn is not None:
+                conn.close()
+
+        with self._lock:
+            entries = list(self._futures.values())
+            self._futures.clear()
+        for _, future, segments in entries:
+            self._release(segments)
+            future.set_exception(RuntimeError("OCR worker pool shut down"))